@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alocador de apelidos únicos compartilhado entre processos.
+
+Cada palavra única do gerador é identificada pelo seu índice (veja
+`GeradorEgera.palavra_por_indice`). O alocador guarda, em um arquivo
+mapeado em memória, um mapa de bits com as palavras já emitidas e uma
+árvore com a quantidade de palavras livres em cada trecho do mapa.
+Vários processos abrem o mesmo arquivo e se coordenam por uma trava no
+próprio arquivo, sem serviço central; como o estado fica no arquivo,
+ele sobrevive a reinícios. Dentro de um processo, as threads que usam a
+mesma instância são serializadas por uma trava comum.
+
+Sortear uma palavra livre desce a árvore de contagens escolhendo o ramo
+pela quantidade de livres, então cada alocação é uniforme entre as
+palavras ainda livres e custa O(log n), mesmo com 99% do espaço usado.
+
+Layout (alinhado em 8 bytes; o cabeçalho é little-endian, e as contagens e
+o mapa usam a ordem de bytes nativa, pois são lidos direto da memória):
+
+    cabeçalho    magic (8 bytes), versão (u16), 6 bytes de preenchimento,
+                 resumo SHA-256 das tabelas de sílabas (32 bytes),
+                 total de palavras (u64), folhas da árvore (u64)
+    contagens    2 × folhas contadores u64: a árvore de palavras livres,
+                 com a raiz na posição 1 e os filhos de i em 2i e 2i+1
+    mapa         folhas palavras de 64 bits; o bit j da palavra w indica
+                 que o índice 64w + j já foi emitido
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+from typing import List, Optional
+
+from gerador import GeradorEgera, InventarioCompilado
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MAGIC = b'EGERAALO'
+VERSAO = 1
+_CABECALHO = struct.Struct('<8sH6x32sQQ')
+_BITS = 64
+
+
+def _resumo(inventario: InventarioCompilado) -> bytes:
+    # A ordem das sílabas define os índices, então faz parte do resumo
+    tabelas = json.dumps([list(tabela) for tabela in inventario.tabelas], ensure_ascii=False)
+    return hashlib.sha256(tabelas.encode('utf-8')).digest()
+
+
+class AlocadorApelidos:
+    """
+    Distribui palavras únicas entre processos, sem nunca repetir uma palavra.
+
+    Use uma instância por processo, todas com o mesmo arquivo e com
+    geradores de mesmas sílabas. As operações são atômicas entre processos
+    e entre as threads que compartilham a instância.
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        gerador: Optional[GeradorEgera] = None,
+        semente: Optional[int] = None,
+    ):
+        """
+        Args:
+            caminho: Arquivo de estado; é criado se não existir
+            gerador: Gerador cujas palavras serão distribuídas (padrão: GeradorEgera())
+            semente: Semente do sorteio das palavras deste processo (padrão:
+                derivada do gerador aleatório de `gerador`)
+
+        Raises:
+            ValueError: Se o arquivo existir e tiver sido criado para outras
+                sílabas, ou não for um arquivo de alocador
+        """
+        self.gerador = gerador if gerador is not None else GeradorEgera()
+        self._inventario = self.gerador.inventario
+        if semente is None:
+            semente = self.gerador._rng.getrandbits(64)
+        self._rng = random.Random(semente)
+        # flock não separa threads do mesmo processo: esta trava serializa
+        # as operações da instância antes da trava do arquivo
+        self._trava_local = threading.Lock()
+
+        total = len(self._inventario)
+        folhas = 1
+        while folhas * _BITS < total:
+            folhas *= 2
+        self.total = total
+        self._folhas = folhas
+        self._inicio_contagens = _CABECALHO.size
+        self._inicio_mapa = self._inicio_contagens + 2 * folhas * 8
+        tamanho = self._inicio_mapa + folhas * 8
+
+        self._descritor = os.open(caminho, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._travar()
+            try:
+                if os.fstat(self._descritor).st_size == 0:
+                    self._criar(tamanho)
+                self._mapa = mmap.mmap(self._descritor, 0)
+            finally:
+                self._destravar()
+            self._verificar(tamanho)
+        except Exception:
+            if getattr(self, '_mapa', None) is not None:
+                self._mapa.close()
+            os.close(self._descritor)
+            raise
+        visao = memoryview(self._mapa)
+        self._contagens = visao[self._inicio_contagens:self._inicio_mapa].cast('Q')
+        self._bits = visao[self._inicio_mapa:].cast('Q')
+        visao.release()
+        self._travar()
+        try:
+            self._reconstruir_contagens()
+        finally:
+            self._destravar()
+
+    def _travar(self) -> None:
+        self._trava_local.acquire()
+        try:
+            self._travar_arquivo()
+        except BaseException:
+            self._trava_local.release()
+            raise
+
+    def _destravar(self) -> None:
+        try:
+            self._destravar_arquivo()
+        finally:
+            self._trava_local.release()
+
+    def _travar_arquivo(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._descritor, fcntl.LOCK_EX)
+        else:
+            os.lseek(self._descritor, 0, os.SEEK_SET)
+            msvcrt.locking(self._descritor, msvcrt.LK_LOCK, 1)
+
+    def _destravar_arquivo(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._descritor, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._descritor, 0, os.SEEK_SET)
+            msvcrt.locking(self._descritor, msvcrt.LK_UNLCK, 1)
+
+    def _criar(self, tamanho: int) -> None:
+        """Grava o estado inicial: nenhuma palavra emitida."""
+        folhas = self._folhas
+        contagens = [0] * (2 * folhas)
+        for folha in range(folhas):
+            contagens[folhas + folha] = max(0, min(_BITS, self.total - folha * _BITS))
+        for no in range(folhas - 1, 0, -1):
+            contagens[no] = contagens[2 * no] + contagens[2 * no + 1]
+        cabecalho = _CABECALHO.pack(MAGIC, VERSAO, _resumo(self._inventario), self.total, folhas)
+        dados = cabecalho + struct.pack(f'={2 * folhas}Q', *contagens) + bytes(folhas * 8)
+        os.lseek(self._descritor, 0, os.SEEK_SET)
+        os.write(self._descritor, dados)
+        os.fsync(self._descritor)
+
+    def _verificar(self, tamanho: int) -> None:
+        if len(self._mapa) != tamanho:
+            raise ValueError("Arquivo de alocador incompatível com as sílabas do gerador")
+        magic, versao, resumo, total, folhas = _CABECALHO.unpack_from(self._mapa, 0)
+        if magic != MAGIC or versao != VERSAO:
+            raise ValueError("Arquivo não é um alocador de apelidos compatível")
+        if resumo != _resumo(self._inventario) or total != self.total or folhas != self._folhas:
+            raise ValueError("Arquivo de alocador criado para outras sílabas")
+
+    def _reconstruir_contagens(self) -> None:
+        """
+        Recalcula a árvore de contagens a partir do mapa de bits.
+
+        O mapa é a fonte da verdade: se um processo morreu no meio de uma
+        marcação, as contagens podem ter ficado para trás. Bits além do
+        total de palavras são descartados.
+        """
+        folhas = self._folhas
+        contagens = self._contagens
+        bits = self._bits
+        for folha in range(folhas):
+            validas = max(0, min(_BITS, self.total - folha * _BITS))
+            mascara = (1 << validas) - 1
+            if bits[folha] & ~mascara:
+                bits[folha] &= mascara
+            livres = validas - bin(bits[folha]).count('1')
+            if contagens[folhas + folha] != livres:
+                contagens[folhas + folha] = livres
+        for no in range(folhas - 1, 0, -1):
+            soma = contagens[2 * no] + contagens[2 * no + 1]
+            if contagens[no] != soma:
+                contagens[no] = soma
+
+    def _ajustar_contagens(self, palavra: int, variacao: int) -> None:
+        no = self._folhas + palavra
+        contagens = self._contagens
+        while no:
+            contagens[no] += variacao
+            no //= 2
+
+    def _marcar(self, indice: int, emitida: bool) -> bool:
+        """Marca ou desmarca um índice; retorna False se ele já estava no estado pedido."""
+        palavra, bit = divmod(indice, _BITS)
+        mascara = 1 << bit
+        valor = self._bits[palavra]
+        if bool(valor & mascara) == emitida:
+            return False
+        # As contagens nunca passam do número real de livres, mesmo que o
+        # processo morra entre os dois passos: ao emitir, elas diminuem
+        # antes do bit ser marcado; ao liberar, aumentam depois
+        if emitida:
+            self._ajustar_contagens(palavra, -1)
+            self._bits[palavra] = valor | mascara
+        else:
+            self._bits[palavra] = valor & ~mascara
+            self._ajustar_contagens(palavra, 1)
+        return True
+
+    def _sortear_livre(self) -> int:
+        """Sorteia um índice livre, uniformemente, descendo a árvore de contagens."""
+        contagens = self._contagens
+        livres = contagens[1]
+        if not livres:
+            raise RuntimeError(f"Todas as {self.total:,} palavras já foram emitidas")
+        posicao = self._rng.randrange(livres)
+        no = 1
+        while no < self._folhas:
+            no *= 2
+            if posicao >= contagens[no]:
+                posicao -= contagens[no]
+                no += 1
+        palavra = no - self._folhas
+        # Bits livres da palavra, descartando os `posicao` primeiros
+        validas = min(_BITS, self.total - palavra * _BITS)
+        livres_na_palavra = ~self._bits[palavra] & ((1 << validas) - 1 if validas > 0 else 0)
+        for _ in range(posicao):
+            livres_na_palavra &= livres_na_palavra - 1
+        if not livres_na_palavra:
+            raise RuntimeError("Contagens do alocador inconsistentes com o mapa de bits")
+        bit = (livres_na_palavra & -livres_na_palavra).bit_length() - 1
+        return palavra * _BITS + bit
+
+    def alocar(self) -> str:
+        """
+        Emite uma palavra ainda não emitida por nenhum processo.
+
+        Returns:
+            Palavra sorteada uniformemente entre as livres
+
+        Raises:
+            RuntimeError: Se todas as palavras já tiverem sido emitidas
+        """
+        return self.alocar_varias(1)[0]
+
+    def alocar_varias(self, quantidade: int) -> List[str]:
+        """
+        Emite várias palavras com uma única aquisição da trava.
+
+        Args:
+            quantidade: Número de palavras
+
+        Returns:
+            Palavras emitidas, todas diferentes
+
+        Raises:
+            RuntimeError: Se não houver palavras livres suficientes (nesse
+                caso nenhuma palavra é emitida)
+        """
+        self._travar()
+        try:
+            if quantidade > self._contagens[1]:
+                raise RuntimeError(
+                    f"Não há {quantidade:,} palavras livres; restam {self._contagens[1]:,}"
+                )
+            indices = []
+            try:
+                for _ in range(quantidade):
+                    indice = self._sortear_livre()
+                    if not self._marcar(indice, True):
+                        raise RuntimeError(f"Índice {indice:,} sorteado, mas já emitido")
+                    indices.append(indice)
+            except Exception:
+                # Nenhuma palavra é emitida se o lote não puder ser completado
+                for indice in indices:
+                    self._marcar(indice, False)
+                raise
+        finally:
+            self._destravar()
+        return [self._inventario.palavra(indice) for indice in indices]
+
+    def reservar(self, palavra: str) -> bool:
+        """
+        Emite uma palavra específica, se ela ainda estiver livre.
+
+        Args:
+            palavra: Palavra que pode ser gerada pelo gerador
+
+        Returns:
+            True se a palavra foi emitida agora, False se já tinha sido
+
+        Raises:
+            ValueError: Se a palavra não puder ser gerada
+        """
+        indice = self._inventario.indice(palavra)
+        self._travar()
+        try:
+            return self._marcar(indice, True)
+        finally:
+            self._destravar()
+
+    def liberar(self, palavra: str) -> bool:
+        """
+        Devolve uma palavra emitida, que poderá ser emitida de novo.
+
+        Args:
+            palavra: Palavra emitida anteriormente
+
+        Returns:
+            True se a palavra foi liberada, False se ela não estava emitida
+
+        Raises:
+            ValueError: Se a palavra não puder ser gerada
+        """
+        indice = self._inventario.indice(palavra)
+        self._travar()
+        try:
+            return self._marcar(indice, False)
+        finally:
+            self._destravar()
+
+    def emitida(self, palavra: str) -> bool:
+        """Verifica se a palavra já foi emitida (False para palavras que não podem ser geradas)."""
+        try:
+            indice = self._inventario.indice(palavra)
+        except ValueError:
+            return False
+        palavra_bits, bit = divmod(indice, _BITS)
+        return bool(self._bits[palavra_bits] >> bit & 1)
+
+    def __contains__(self, palavra: object) -> bool:
+        return isinstance(palavra, str) and self.emitida(palavra)
+
+    @property
+    def emitidas(self) -> int:
+        """Quantidade de palavras emitidas por todos os processos."""
+        return self.total - self._contagens[1]
+
+    @property
+    def livres(self) -> int:
+        """Quantidade de palavras que ainda podem ser emitidas."""
+        return self._contagens[1]
+
+    def sincronizar(self) -> None:
+        """Grava no disco as alterações ainda em memória."""
+        self._mapa.flush()
+
+    def close(self) -> None:
+        """Grava o estado e libera o arquivo."""
+        with self._trava_local:
+            if self._mapa.closed:
+                return
+            self._contagens.release()
+            self._bits.release()
+            self._mapa.flush()
+            self._mapa.close()
+            os.close(self._descritor)
+
+    def __enter__(self) -> 'AlocadorApelidos':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.close()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks dos métodos mais usados do gerador.
+
+Para cada método de `FUNCOES` e cada inventário de `TAMANHOS`, mede a
+vazão (itens por segundo), os percentis de latência por chamada e o pico
+de memória alocada (tracemalloc) em uma chamada. O resultado pode ser
+gravado como referência em JSON e comparado com uma referência anterior:
+uma piora além dos limites conta como regressão e o programa termina com
+código 1.
+
+    python benchmark.py --salvar             # grava a referência
+    python benchmark.py                      # mede e compara com a referência
+    python benchmark.py --tamanhos pequeno --funcoes gerar_palavra
+
+Os tempos dependem da máquina: grave a referência na mesma máquina (e com
+a mesma versão do Python) em que os benchmarks serão comparados.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from gerador import GeradorEgera
+
+ARQUIVO_REFERENCIA = 'benchmark_baseline.json'
+VERSAO = 2
+
+# Máximo de chamadas cronometradas uma a uma para os percentis de latência
+MAX_CHAMADAS_LATENCIA = 10_000
+
+# Inventários medidos: argumentos de GeradorEgera
+TAMANHOS: Dict[str, dict] = {
+    'pequeno': {
+        'silabas_tonicas': GeradorEgera.SILABAS_TONICAS[:9],
+        'silabas_medias': GeradorEgera.SILABAS_MEDIAS[:8],
+        'silabas_finais': GeradorEgera.SILABAS_FINAIS[:6],
+    },
+    'padrao': {},
+    'grande': {'num_silabas': 4},
+}
+
+FUNCOES = (
+    'gerar_palavra',
+    'gerar_multiplas',
+    'gerar_todas_palavras_possiveis',
+    'adicionar_acento',
+    'validar_proparoxitona',
+)
+
+# Piora máxima tolerada, como fração da referência
+LIMITES_PADRAO = {
+    'itens_por_segundo': 0.30,
+    'latencia_p50_us': 0.30,
+    'memoria_pico_bytes': 0.20,
+}
+# Métricas em que um valor menor é pior
+_MAIOR_E_MELHOR = {'itens_por_segundo'}
+
+_SEM_ACENTO = str.maketrans('áéíóúâêô', 'aeiouaeo')
+
+
+class Medicao(NamedTuple):
+    """Resultado do benchmark de um método em um inventário."""
+    funcao: str
+    tamanho: str
+    palavras_unicas: int
+    itens_por_segundo: float
+    latencia_p50_us: float
+    latencia_p90_us: float
+    latencia_p99_us: float
+    memoria_pico_bytes: int
+    amostras: int
+
+    @property
+    def chave(self) -> str:
+        return f'{self.tamanho}/{self.funcao}'
+
+
+class Regressao(NamedTuple):
+    """Métrica que piorou além do limite em relação à referência."""
+    chave: str
+    metrica: str
+    referencia: float
+    atual: float
+    variacao: float
+
+
+def _operacao(gerador: GeradorEgera, funcao: str) -> Tuple[Callable[[], object], int]:
+    """Monta uma chamada representativa do método e o número de itens que ela processa."""
+    if funcao == 'gerar_palavra':
+        return gerador.gerar_palavra, 1
+    if funcao == 'gerar_multiplas':
+        return lambda: gerador.gerar_multiplas(1000), 1000
+    if funcao == 'gerar_todas_palavras_possiveis':
+        return gerador.gerar_todas_palavras_possiveis, gerador.calcular_palavras_unicas()
+    if funcao == 'adicionar_acento':
+        silabas = gerador.silabas_medias + gerador.silabas_finais
+        adicionar_acento = gerador.adicionar_acento
+        return lambda: [adicionar_acento(silaba) for silaba in silabas], len(silabas)
+    if funcao == 'validar_proparoxitona':
+        # Metade geradas (válidas), metade sem o acento (inválidas)
+        palavras = gerador.gerar_multiplas(50)
+        palavras += [palavra.translate(_SEM_ACENTO) for palavra in palavras]
+        validar = gerador.validar_proparoxitona
+        return lambda: [validar(palavra) for palavra in palavras], len(palavras)
+    raise ValueError(f"Função desconhecida: '{funcao}' (use {', '.join(FUNCOES)})")
+
+
+def _percentil(valores: Sequence[float], fracao: float) -> float:
+    """Percentil por interpolação linear entre os valores ordenados."""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * fracao
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def medir(
+    operacao: Callable[[], object],
+    itens: int,
+    amostras: int = 30,
+    duracao_amostra: float = 0.01,
+) -> Tuple[float, List[float], int]:
+    """
+    Mede uma operação.
+
+    A vazão vem de `amostras` lotes cronometrados de uma vez: cada lote
+    repete a operação até durar pelo menos `duracao_amostra`, para que
+    operações curtas não fiquem abaixo da resolução do relógio. As
+    latências vêm de uma passagem à parte em que cada chamada é
+    cronometrada isoladamente (tantas quantas couberam nos lotes, até
+    `MAX_CHAMADAS_LATENCIA`), então os percentis refletem as chamadas
+    lentas em vez de médias de lotes.
+
+    Args:
+        operacao: Chamada a medir
+        itens: Itens processados por chamada
+        amostras: Número de lotes usados na vazão
+        duracao_amostra: Duração mínima de cada lote, em segundos
+
+    Returns:
+        Tupla (itens por segundo, latência de cada chamada em microssegundos,
+        pico de memória em bytes)
+    """
+    # Aquecimento e calibração do número de repetições por amostra
+    repeticoes = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            operacao()
+        if time.perf_counter() - inicio >= duracao_amostra or repeticoes >= 1 << 20:
+            break
+        repeticoes *= 2
+
+    total = 0.0
+    for _ in range(amostras):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            operacao()
+        total += time.perf_counter() - inicio
+
+    latencias = []
+    relogio = time.perf_counter_ns
+    for _ in range(min(repeticoes * amostras, MAX_CHAMADAS_LATENCIA)):
+        inicio = relogio()
+        operacao()
+        latencias.append((relogio() - inicio) / 1000)
+
+    # A memória é medida à parte: o tracemalloc deixa as chamadas mais lentas
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = operacao()
+    pico = tracemalloc.get_traced_memory()[1] - antes
+    del resultado
+    if not ja_rastreando:
+        tracemalloc.stop()
+
+    return itens * repeticoes * amostras / total, latencias, pico
+
+
+def executar(
+    tamanhos: Sequence[str] = tuple(TAMANHOS),
+    funcoes: Sequence[str] = FUNCOES,
+    amostras: int = 30,
+    duracao_amostra: float = 0.01,
+    semente: int = 0,
+) -> List[Medicao]:
+    """
+    Executa os benchmarks.
+
+    Args:
+        tamanhos: Inventários de `TAMANHOS` a medir
+        funcoes: Métodos de `FUNCOES` a medir
+        amostras: Número de lotes cronometrados na vazão de cada medição
+        duracao_amostra: Duração mínima de cada amostra, em segundos
+        semente: Semente dos geradores
+
+    Returns:
+        Uma medição por combinação de inventário e método
+
+    Raises:
+        ValueError: Se algum tamanho ou método for desconhecido
+    """
+    for tamanho in tamanhos:
+        if tamanho not in TAMANHOS:
+            raise ValueError(f"Tamanho desconhecido: '{tamanho}' (use {', '.join(TAMANHOS)})")
+    medicoes = []
+    for tamanho in tamanhos:
+        gerador = GeradorEgera(semente=semente, **TAMANHOS[tamanho])
+        palavras_unicas = gerador.calcular_palavras_unicas()
+        for funcao in funcoes:
+            operacao, itens = _operacao(gerador, funcao)
+            vazao, latencias, pico = medir(operacao, itens, amostras, duracao_amostra)
+            medicoes.append(Medicao(
+                funcao=funcao,
+                tamanho=tamanho,
+                palavras_unicas=palavras_unicas,
+                itens_por_segundo=vazao,
+                latencia_p50_us=_percentil(latencias, 0.50),
+                latencia_p90_us=_percentil(latencias, 0.90),
+                latencia_p99_us=_percentil(latencias, 0.99),
+                memoria_pico_bytes=pico,
+                amostras=amostras,
+            ))
+    return medicoes
+
+
+def salvar_referencia(caminho: str, medicoes: Sequence[Medicao]) -> None:
+    """
+    Grava as medições como referência em JSON.
+
+    Args:
+        caminho: Arquivo de saída
+        medicoes: Medições de `executar`
+    """
+    dados = {
+        'versao': VERSAO,
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'medicoes': {medicao.chave: medicao._asdict() for medicao in medicoes},
+    }
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+
+def carregar_referencia(caminho: str) -> Dict[str, Medicao]:
+    """
+    Lê uma referência gravada por `salvar_referencia`.
+
+    Args:
+        caminho: Arquivo da referência
+
+    Returns:
+        Medições indexadas por '<tamanho>/<funcao>'
+
+    Raises:
+        ValueError: Se o arquivo não for uma referência compatível
+    """
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    if not isinstance(dados, dict) or dados.get('versao') != VERSAO:
+        raise ValueError(f"'{caminho}' não é uma referência de benchmark compatível")
+    return {chave: Medicao(**valores) for chave, valores in dados['medicoes'].items()}
+
+
+def comparar(
+    medicoes: Sequence[Medicao],
+    referencia: Dict[str, Medicao],
+    limites: Optional[Dict[str, float]] = None,
+) -> List[Regressao]:
+    """
+    Compara medições com a referência.
+
+    Medições sem correspondente na referência são ignoradas.
+
+    Args:
+        medicoes: Medições atuais
+        referencia: Medições de `carregar_referencia`
+        limites: Piora máxima tolerada por métrica, como fração do valor de
+            referência (padrão: LIMITES_PADRAO)
+
+    Returns:
+        Métricas que pioraram além do limite; a variação é positiva quando
+        a métrica piorou (0.5 = 50% pior)
+    """
+    limites = LIMITES_PADRAO if limites is None else limites
+    regressoes = []
+    for medicao in medicoes:
+        anterior = referencia.get(medicao.chave)
+        if anterior is None:
+            continue
+        for metrica, limite in limites.items():
+            valor_anterior = getattr(anterior, metrica)
+            valor = getattr(medicao, metrica)
+            if valor_anterior <= 0:
+                continue
+            variacao = (valor - valor_anterior) / valor_anterior
+            if metrica in _MAIOR_E_MELHOR:
+                variacao = -variacao
+            if variacao > limite:
+                regressoes.append(Regressao(medicao.chave, metrica, valor_anterior, valor, variacao))
+    return regressoes
+
+
+def formatar(medicoes: Sequence[Medicao]) -> str:
+    """Formata as medições como uma tabela legível."""
+    linhas = [
+        f"{'medição':<40} {'itens/s':>14} {'p50 (µs)':>12} {'p90 (µs)':>12} "
+        f"{'p99 (µs)':>12} {'memória (KiB)':>14}"
+    ]
+    for medicao in medicoes:
+        linhas.append(
+            f"{medicao.chave:<40} {medicao.itens_por_segundo:>14,.0f} "
+            f"{medicao.latencia_p50_us:>12,.2f} {medicao.latencia_p90_us:>12,.2f} "
+            f"{medicao.latencia_p99_us:>12,.2f} {medicao.memoria_pico_bytes / 1024:>14,.1f}"
+        )
+    return '\n'.join(linhas)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Função principal dos benchmarks.
+
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv[1:])
+
+    Returns:
+        0 sem regressões, 1 se alguma métrica piorou além do limite
+    """
+    parser = argparse.ArgumentParser(description='Mede o desempenho do gerador.')
+    parser.add_argument('--tamanhos', nargs='+', choices=list(TAMANHOS), default=list(TAMANHOS),
+                        help='inventários medidos (padrão: todos)')
+    parser.add_argument('--funcoes', nargs='+', choices=FUNCOES, default=list(FUNCOES),
+                        help='métodos medidos (padrão: todos)')
+    parser.add_argument('--amostras', type=int, default=30,
+                        help='lotes cronometrados na vazão de cada medição (padrão: 30)')
+    parser.add_argument('--referencia', default=ARQUIVO_REFERENCIA,
+                        help=f'arquivo JSON de referência (padrão: {ARQUIVO_REFERENCIA})')
+    parser.add_argument('--salvar', action='store_true',
+                        help='grava o resultado como nova referência, sem comparar')
+    parser.add_argument('--limite-tempo', type=float, default=LIMITES_PADRAO['itens_por_segundo'],
+                        help='piora tolerada na vazão e na latência p50, como fração (padrão: 0.30)')
+    parser.add_argument('--limite-memoria', type=float, default=LIMITES_PADRAO['memoria_pico_bytes'],
+                        help='piora tolerada no pico de memória, como fração (padrão: 0.20)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='grava também as medições neste arquivo JSON')
+    args = parser.parse_args(argv)
+    if args.amostras < 1:
+        parser.error("--amostras deve ser pelo menos 1")
+
+    medicoes = executar(args.tamanhos, args.funcoes, args.amostras)
+    print(formatar(medicoes))
+    if args.output is not None:
+        salvar_referencia(args.output, medicoes)
+
+    if args.salvar:
+        salvar_referencia(args.referencia, medicoes)
+        print(f"✓ Referência salva: {args.referencia}")
+        return 0
+    if not os.path.exists(args.referencia):
+        print(f"Sem referência em {args.referencia}; use --salvar para gravar uma.")
+        return 0
+
+    limites = {
+        'itens_por_segundo': args.limite_tempo,
+        'latencia_p50_us': args.limite_tempo,
+        'memoria_pico_bytes': args.limite_memoria,
+    }
+    regressoes = comparar(medicoes, carregar_referencia(args.referencia), limites)
+    if not regressoes:
+        print(f"✓ Nenhuma regressão em relação a {args.referencia}")
+        return 0
+    print(f"✗ {len(regressoes)} regressão(ões) em relação a {args.referencia}:")
+    for regressao in regressoes:
+        print(f"  {regressao.chave} {regressao.metrica}: {regressao.referencia:,.2f} -> "
+              f"{regressao.atual:,.2f} ({regressao.variacao:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
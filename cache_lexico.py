@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache em disco do léxico completo, com atualização incremental.
+
+O léxico (uma palavra por linha) fica acompanhado de um arquivo de
+metadados com a impressão digital do inventário de sílabas que o gerou.
+Na sincronização, um inventário com a mesma impressão digital é um acerto
+e nada é recalculado. Quando sílabas são acrescentadas ou retiradas,
+apenas as combinações que usam essas sílabas são enumeradas: as palavras
+novas são anexadas ao final do arquivo, em ordem aleatória, e as que
+deixaram de existir são removidas, sem reembaralhar o restante.
+"""
+
+import hashlib
+import json
+import os
+import random
+from itertools import islice, product
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from gerador import GeradorEgera, InventarioCompilado, compilar_inventario
+
+VERSAO = 1
+SUFIXO_METADADOS = '.cache.json'
+
+
+def impressao_digital(inventario: InventarioCompilado) -> str:
+    """
+    Calcula a impressão digital do conjunto de palavras de um inventário.
+
+    Depende apenas das sílabas de cada posição (já acentuadas e sem
+    repetições), e não da ordem delas nem dos pesos de sorteio, que não
+    mudam as palavras possíveis.
+
+    Args:
+        inventario: Inventário compilado
+
+    Returns:
+        Resumo SHA-256 em hexadecimal
+    """
+    chave = json.dumps([sorted(tabela) for tabela in inventario.tabelas], ensure_ascii=False)
+    return hashlib.sha256(chave.encode('utf-8')).hexdigest()
+
+
+class AtualizacaoLexico(NamedTuple):
+    """
+    Resultado de uma sincronização do cache.
+
+    `situacao` é 'acerto' (nada mudou), 'incremental' (apenas a diferença
+    foi aplicada) ou 'completa' (o léxico foi gerado do zero). As listas de
+    palavras adicionadas e removidas só são preenchidas na atualização
+    incremental.
+    """
+    situacao: str
+    adicionadas: List[str]
+    removidas: List[str]
+    total: int
+
+
+def _combinacoes_com(tabelas: Sequence[Sequence[str]], escolhidas: Sequence[Set[str]]) -> Iterator[str]:
+    """
+    Percorre as palavras das combinações que usam alguma sílaba escolhida.
+
+    Cada combinação é produzida uma única vez, pela primeira posição em
+    que aparece uma sílaba escolhida: as posições anteriores usam só as
+    demais sílabas, e as posteriores usam qualquer uma.
+    """
+    for posicao, silabas in enumerate(escolhidas):
+        if not silabas:
+            continue
+        antes = [
+            [silaba for silaba in tabela if silaba not in outras]
+            for tabela, outras in zip(tabelas[:posicao], escolhidas[:posicao])
+        ]
+        atual = [silaba for silaba in tabelas[posicao] if silaba in silabas]
+        for partes in product(*antes, atual, *tabelas[posicao + 1:]):
+            yield ''.join(partes)
+
+
+def calcular_diferenca(
+    anterior: InventarioCompilado,
+    atual: InventarioCompilado,
+) -> Tuple[List[str], List[str]]:
+    """
+    Calcula as palavras que entram e saem do léxico entre dois inventários.
+
+    Só são enumeradas as combinações que usam sílabas acrescentadas (para
+    as novas palavras) ou retiradas (para as removidas), e cada candidata
+    é conferida no outro inventário: uma palavra que continua podendo ser
+    formada de outra maneira não entra na diferença.
+
+    Args:
+        anterior: Inventário do léxico em cache
+        atual: Inventário desejado, com o mesmo número de posições
+
+    Returns:
+        Tupla (adicionadas, removidas), sem repetições, na ordem das combinações
+
+    Raises:
+        ValueError: Se os inventários tiverem números de posições diferentes
+    """
+    if len(anterior.tabelas) != len(atual.tabelas):
+        raise ValueError("Os inventários têm números de sílabas diferentes")
+    acrescentadas = [set(nova) - set(velha) for velha, nova in zip(anterior.tabelas, atual.tabelas)]
+    retiradas = [set(velha) - set(nova) for velha, nova in zip(anterior.tabelas, atual.tabelas)]
+
+    def filtrar(candidatas: Iterator[str], outro: InventarioCompilado) -> List[str]:
+        vistas: Set[str] = set()
+        resultado = []
+        for palavra in candidatas:
+            if palavra not in vistas:
+                vistas.add(palavra)
+                if not outro.contem(palavra):
+                    resultado.append(palavra)
+        return resultado
+
+    adicionadas = filtrar(_combinacoes_com(atual.tabelas, acrescentadas), anterior)
+    removidas = filtrar(_combinacoes_com(anterior.tabelas, retiradas), atual)
+    return adicionadas, removidas
+
+
+def _gravar(caminho: str, palavras: Iterable[str], tamanho_bloco: int = 10_000) -> int:
+    """Grava as palavras, uma por linha, em blocos; retorna a quantidade gravada."""
+    total = 0
+    iterador = iter(palavras)
+    with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+        while True:
+            bloco = list(islice(iterador, tamanho_bloco))
+            if not bloco:
+                break
+            arquivo.write(''.join(palavra + '\n' for palavra in bloco))
+            total += len(bloco)
+    return total
+
+
+class CacheLexico:
+    """
+    Léxico completo em disco, mantido em sincronia com um gerador.
+
+    O arquivo do léxico tem uma palavra por linha. Os metadados ficam ao
+    lado dele, em `<arquivo>.cache.json`, com a impressão digital e as
+    tabelas de sílabas do inventário, o total de palavras e o tamanho do
+    arquivo. Se o arquivo não tiver o tamanho registrado (por exemplo, após
+    uma interrupção no meio de uma escrita), o cache é descartado e o
+    léxico é gerado de novo.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho: Arquivo de texto do léxico
+        """
+        self.caminho = caminho
+        self.caminho_metadados = caminho + SUFIXO_METADADOS
+
+    def _ler_metadados(self) -> Optional[dict]:
+        try:
+            with open(self.caminho_metadados, 'r', encoding='utf-8') as arquivo:
+                metadados = json.load(arquivo)
+            tamanho = os.path.getsize(self.caminho)
+        except (OSError, ValueError):
+            return None
+        if metadados.get('versao') != VERSAO or metadados.get('tamanho_em_bytes') != tamanho:
+            return None
+        return metadados
+
+    def _gravar_metadados(self, inventario: InventarioCompilado, total: int) -> None:
+        metadados = {
+            'versao': VERSAO,
+            'impressao_digital': impressao_digital(inventario),
+            'tabelas': [list(tabela) for tabela in inventario.tabelas],
+            'total': total,
+            'tamanho_em_bytes': os.path.getsize(self.caminho),
+        }
+        temporario = self.caminho_metadados + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(metadados, arquivo, ensure_ascii=False)
+        os.replace(temporario, self.caminho_metadados)
+
+    def invalidar(self) -> None:
+        """Descarta os metadados, para quando o arquivo do léxico for gravado por outro meio."""
+        try:
+            os.remove(self.caminho_metadados)
+        except FileNotFoundError:
+            pass
+
+    def impressao_digital(self) -> Optional[str]:
+        """Retorna a impressão digital do léxico em cache, ou None se não houver cache válido."""
+        metadados = self._ler_metadados()
+        return metadados['impressao_digital'] if metadados else None
+
+    def palavras(self) -> Iterator[str]:
+        """
+        Percorre as palavras do léxico em cache, na ordem do arquivo.
+
+        Yields:
+            Palavras do léxico
+        """
+        with open(self.caminho, 'r', encoding='utf-8', newline='') as arquivo:
+            for linha in arquivo:
+                yield linha.rstrip('\r\n')
+
+    def sincronizar(
+        self,
+        gerador: GeradorEgera,
+        semente: Optional[int] = None,
+        completo: bool = False,
+    ) -> AtualizacaoLexico:
+        """
+        Atualiza o léxico em disco para as sílabas atuais do gerador.
+
+        Args:
+            gerador: Gerador cujas palavras o léxico deve conter
+            semente: Semente do embaralhamento das palavras gravadas (padrão:
+                derivada do gerador aleatório de `gerador`)
+            completo: Ignora o cache e gera o léxico do zero
+
+        Returns:
+            Situação da sincronização, diferença aplicada e total de palavras
+        """
+        inventario = gerador.inventario
+        if semente is None:
+            semente = gerador._rng.getrandbits(64)
+        metadados = None if completo else self._ler_metadados()
+
+        if metadados is not None and metadados['impressao_digital'] == impressao_digital(inventario):
+            return AtualizacaoLexico('acerto', [], [], metadados['total'])
+
+        if metadados is None or len(metadados['tabelas']) != len(inventario.tabelas):
+            palavras = gerador.iterar_palavras_unicas(embaralhar=True, semente=semente)
+            total = _gravar(self.caminho, palavras)
+            self._gravar_metadados(inventario, total)
+            return AtualizacaoLexico('completa', [], [], total)
+
+        # As tabelas gravadas já estão acentuadas e sem repetições: compilá-las
+        # de novo produz o mesmo conjunto de palavras do léxico em cache
+        anterior = compilar_inventario(*(tuple(tabela) for tabela in metadados['tabelas']))
+        adicionadas, removidas = calcular_diferenca(anterior, inventario)
+        random.Random(semente).shuffle(adicionadas)
+
+        if removidas:
+            # Remover linhas exige reescrever o arquivo, mas sem enumerar
+            # nem reembaralhar as palavras que continuam
+            retiradas = set(removidas)
+            temporario = self.caminho + '.tmp'
+            mantidas = (palavra for palavra in self.palavras() if palavra not in retiradas)
+            _gravar(temporario, mantidas)
+            os.replace(temporario, self.caminho)
+        if adicionadas:
+            with open(self.caminho, 'a', encoding='utf-8', newline='') as arquivo:
+                arquivo.write(''.join(palavra + '\n' for palavra in adicionadas))
+
+        total = metadados['total'] + len(adicionadas) - len(removidas)
+        self._gravar_metadados(inventario, total)
+        return AtualizacaoLexico('incremental', adicionadas, removidas, total)
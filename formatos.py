@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formatos de arquivo das listas de palavras.
+
+Cada formato tem uma função que grava um bloco de palavras em um arquivo
+de texto já aberto e, opcionalmente, um cabeçalho gravado uma única vez.
+É usado pela linha de comando do gerador e pela exportação do léxico.
+"""
+
+import csv
+import json
+from typing import Callable, Dict, List, TextIO
+
+
+def _escrever_txt(palavras: List[str], arquivo: TextIO) -> None:
+    arquivo.write(''.join(palavra + '\n' for palavra in palavras))
+
+
+def _escrever_csv(palavras: List[str], arquivo: TextIO) -> None:
+    escritor = csv.writer(arquivo, lineterminator='\n')
+    escritor.writerows((palavra,) for palavra in palavras)
+
+
+def _escrever_jsonl(palavras: List[str], arquivo: TextIO) -> None:
+    arquivo.write(''.join(
+        json.dumps({'palavra': palavra}, ensure_ascii=False) + '\n'
+        for palavra in palavras
+    ))
+
+
+# Função de escrita de cada formato, pela extensão do arquivo
+FORMATOS: Dict[str, Callable[[List[str], TextIO], None]] = {
+    'txt': _escrever_txt,
+    'csv': _escrever_csv,
+    'jsonl': _escrever_jsonl,
+}
+CABECALHOS = {'csv': 'palavra\n'}
+
+
+def formato_do_arquivo(caminho: str) -> str:
+    """
+    Identifica o formato de exportação pela extensão do arquivo.
+
+    Args:
+        caminho: Caminho do arquivo, opcionalmente terminado em '.gz'
+
+    Returns:
+        Nome do formato ('txt', 'csv' ou 'jsonl')
+
+    Raises:
+        ValueError: Se a extensão não corresponder a um formato conhecido
+    """
+    nome = caminho[:-3] if caminho.endswith('.gz') else caminho
+    extensao = nome.rsplit('.', 1)[-1].lower()
+    if extensao not in FORMATOS:
+        raise ValueError(
+            f"Formato não suportado: '{caminho}' (use {', '.join(sorted(FORMATOS))}, com ou sem .gz)"
+        )
+    return extensao
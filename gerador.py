@@ -1,18 +1,988 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Gerador de palavras proparoxítonas de três sílabas
+Gerador de palavras proparoxítonas de três (ou mais) sílabas
 para criar apelidos em potencial para "égera"
 """
 
+import argparse
+import copy
+import gzip
+import hashlib
+import heapq
+import os
 import random
 import re
-from typing import List
+import sys
+import threading
+from functools import lru_cache
+from itertools import islice, product
+from typing import (
+    Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Set, TextIO,
+    Tuple,
+)
+
+from formatos import CABECALHOS, FORMATOS, formato_do_arquivo
+
+
+# Pares (sílaba, peso) de uma posição, em forma imutável
+PesosPosicao = Tuple[Tuple[str, float], ...]
+
+_ACENTO_AGUDO = {'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú'}
+_VOGAIS_COM_ACENTO_AGUDO = frozenset(_ACENTO_AGUDO.values())
+
+# Estado do índice sem nenhum padrão sombreado em andamento
+_SEM_PADRAO: frozenset = frozenset()
+
+
+def _acentuar(silaba: str) -> str:
+    """Adiciona acento agudo na primeira vogal, se a sílaba ainda não tiver."""
+    # Se já tem acento, retorna como está
+    if not _VOGAIS_COM_ACENTO_AGUDO.isdisjoint(silaba):
+        return silaba
+    
+    # Encontra a primeira vogal e acentua
+    for i, char in enumerate(silaba):
+        vogal_acentuada = _ACENTO_AGUDO.get(char.lower())
+        if vogal_acentuada is not None:
+            if char.isupper():
+                vogal_acentuada = vogal_acentuada.upper()
+            return silaba[:i] + vogal_acentuada + silaba[i+1:]
+    
+    return silaba
+
+
+class InventarioCompilado:
+    """
+    Inventário de sílabas compilado e imutável.
+    
+    Reúne tudo o que pode ser calculado uma única vez a partir das sílabas
+    de cada posição: a tabela tônica já acentuada, tabelas sem repetições,
+    comprimentos das sílabas, tabelas de alias para o sorteio com pesos e
+    o índice combinatório das palavras únicas. Use `compilar_inventario`
+    para obter instâncias compartilhadas.
+    
+    Cada palavra é identificada pela tupla de índices das suas sílabas nas
+    tabelas deduplicadas; a tupla é convertida em um número (base mista),
+    o índice bruto. Quando duas tuplas diferentes formam a mesma palavra
+    (ambiguidade na fronteira entre sílabas), somente a de menor índice
+    bruto é considerada canônica e as demais ficam "sombreadas". Uma tupla
+    é sombreada quando contém um dos `padroes`, e um autômato sobre esses
+    padrões conta as tuplas canônicas de cada prefixo; o índice de uma
+    palavra é a posição da sua tupla entre as canônicas, calculado sem
+    montar a lista de palavras nem a de tuplas sombreadas.
+    """
+    
+    def __init__(
+        self,
+        posicoes: Sequence[Sequence[str]],
+        pesos: Optional[Sequence[Optional[PesosPosicao]]] = None,
+    ):
+        """
+        Args:
+            posicoes: Sílabas de cada posição; a primeira é a tônica
+            pesos: Para cada posição, pares (sílaba, peso) ou None; sílabas
+                sem peso valem 1, e cada repetição na lista soma o seu peso
+                
+        Raises:
+            ValueError: Se algum peso for negativo, se uma posição tiver
+                peso total zero ou se houver peso para sílaba inexistente
+        """
+        self.posicoes = tuple(tuple(silabas) for silabas in posicoes)
+        self.pesos_informados = tuple(pesos) if pesos is not None else (None,) * len(self.posicoes)
+        
+        # A tônica é acentuada uma única vez, aqui
+        acentuadas = (
+            tuple(_acentuar(silaba) for silaba in self.posicoes[0]),
+        ) + self.posicoes[1:]
+        
+        # Remove repetições preservando a ordem da primeira ocorrência
+        self.tabelas = tuple(tuple(dict.fromkeys(tabela)) for tabela in acentuadas)
+        self.mapas: Tuple[Dict[str, int], ...] = tuple(
+            {silaba: i for i, silaba in enumerate(tabela)} for tabela in self.tabelas
+        )
+        self.comprimentos = tuple(
+            sorted({len(silaba) for silaba in tabela}) for tabela in self.tabelas
+        )
+        
+        # Menor e maior número de caracteres que as posições p em diante formam
+        self.restante_min = [0] * (len(self.tabelas) + 1)
+        self.restante_max = [0] * (len(self.tabelas) + 1)
+        for p in range(len(self.tabelas) - 1, -1, -1):
+            self.restante_min[p] = self.restante_min[p + 1] + min(self.comprimentos[p], default=0)
+            self.restante_max[p] = self.restante_max[p + 1] + max(self.comprimentos[p], default=0)
+        
+        # Multiplicadores da base mista: o índice bruto é sum(i_p * multiplicadores[p])
+        multiplicadores = []
+        total = 1
+        for tabela in reversed(self.tabelas):
+            multiplicadores.append(total)
+            total *= len(tabela)
+        self.multiplicadores = tuple(reversed(multiplicadores))
+        self.total_bruto = total
+        
+        # Peso de cada sílaba das tabelas e tabelas de alias para o sorteio
+        self.pesos_silabas = tuple(
+            _pesos_da_tabela(tabela, originais, silabas, pesos_posicao)
+            for tabela, originais, silabas, pesos_posicao
+            in zip(self.tabelas, self.posicoes, acentuadas, self.pesos_informados)
+        )
+        self.sorteadores = tuple(
+            _TabelaAlias(tabela, pesos_tabela)
+            for tabela, pesos_tabela in zip(self.tabelas, self.pesos_silabas)
+        )
+        
+        # A contagem exata não depende das combinações ambíguas; elas só são
+        # levantadas quando o índice precisa delas
+        self.total = _contar_palavras_distintas(self.tabelas)
+        self._padroes: Optional[Dict[int, Set[Tuple[int, ...]]]] = None
+        self._seguintes: Dict[int, Dict[Tuple[int, ...], Set[int]]] = {}
+        self._memo_transicoes: Dict[Tuple[int, frozenset], Dict[int, Optional[frozenset]]] = {}
+        self._memo_livres: Dict[Tuple[int, frozenset], int] = {}
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    @property
+    def padroes(self) -> Dict[int, Set[Tuple[int, ...]]]:
+        """
+        Trechos que tornam uma combinação sombreada, por posição inicial.
+        
+        Uma combinação é sombreada exatamente quando contém, a partir da
+        posição k, um dos trechos de `padroes[k]`: cada trecho forma o mesmo
+        texto que outro trecho menor sobre as mesmas posições.
+        """
+        if self._padroes is None:
+            padroes: Dict[int, Set[Tuple[int, ...]]] = {}
+            if self.total < self.total_bruto:
+                padroes = _padroes_sombreados(self.tabelas)
+            seguintes: Dict[int, Dict[Tuple[int, ...], Set[int]]] = {}
+            for inicio, trechos in padroes.items():
+                por_prefixo = seguintes[inicio] = {}
+                for trecho in trechos:
+                    for k in range(len(trecho)):
+                        por_prefixo.setdefault(trecho[:k], set()).add(trecho[k])
+            self._seguintes = seguintes
+            self._padroes = padroes
+        return self._padroes
+    
+    def _transicoes(self, posicao: int, estado: frozenset) -> Dict[int, Optional[frozenset]]:
+        """
+        Próximos estados a partir de `estado` para os índices que o alteram.
+        
+        O estado é o conjunto de pares (início, trecho parcial) dos padrões
+        ainda em andamento. Índices ausentes do resultado levam ao estado
+        vazio; os mapeados para None completam um padrão (combinação sombreada).
+        """
+        chave = (posicao, estado)
+        transicoes = self._memo_transicoes.get(chave)
+        if transicoes is not None:
+            return transicoes
+        padroes = self.padroes
+        seguintes = self._seguintes
+        em_andamento = list(estado)
+        if posicao in seguintes:
+            em_andamento.append((posicao, ()))
+        especiais: Set[int] = set()
+        for inicio, parcial in em_andamento:
+            especiais.update(seguintes[inicio][parcial])
+        transicoes = {}
+        for i in sorted(especiais):
+            proximo: Optional[set] = set()
+            for inicio, parcial in em_andamento:
+                estendido = parcial + (i,)
+                if estendido in padroes[inicio]:
+                    proximo = None
+                    break
+                if estendido in seguintes[inicio]:
+                    proximo.add((inicio, estendido))
+            transicoes[i] = None if proximo is None else frozenset(proximo)
+        self._memo_transicoes[chave] = transicoes
+        return transicoes
+    
+    def _livres(self, posicao: int, estado: frozenset) -> int:
+        """Conta as continuações não sombreadas das posições `posicao` em diante."""
+        if posicao == len(self.tabelas):
+            return 1
+        chave = (posicao, estado)
+        livres = self._memo_livres.get(chave)
+        if livres is None:
+            transicoes = self._transicoes(posicao, estado)
+            livres = (len(self.tabelas[posicao]) - len(transicoes)) * self._livres(posicao + 1, _SEM_PADRAO)
+            livres += sum(
+                self._livres(posicao + 1, proximo)
+                for proximo in transicoes.values() if proximo is not None
+            )
+            self._memo_livres[chave] = livres
+        return livres
+    
+    def sombreada(self, tupla: Sequence[int]) -> bool:
+        """Verifica se a combinação repete uma palavra de combinação menor."""
+        if not self.padroes:
+            return False
+        estado = _SEM_PADRAO
+        for posicao, i in enumerate(tupla):
+            estado = self._transicoes(posicao, estado).get(i, _SEM_PADRAO)
+            if estado is None:
+                return True
+        return False
+    
+    def __iter__(self) -> Iterator[str]:
+        """Percorre as palavras únicas na ordem dos índices."""
+        return self.iterar()
+    
+    def iterar(self, inicio: int = 0) -> Iterator[str]:
+        """
+        Percorre as palavras únicas a partir do índice `inicio`.
+        
+        Funciona como um odômetro sobre os índices das sílabas: apenas o
+        prefixo formado pelas posições que mudaram é remontado, e nada além
+        da palavra atual é mantido em memória.
+        
+        Args:
+            inicio: Índice da primeira palavra (padrão: 0)
+            
+        Yields:
+            Palavras únicas, na ordem dos índices
+        """
+        if inicio >= self.total:
+            return
+        tabelas = self.tabelas
+        if self.padroes:
+            for tupla in self.iterar_tuplas(inicio):
+                yield ''.join(tabela[i] for tabela, i in zip(tabelas, tupla))
+            return
+        num_posicoes = len(tabelas)
+        tupla = list(self.tupla(max(inicio, 0)))
+        
+        # prefixos[p] é a concatenação das sílabas das posições anteriores a p
+        prefixos = [''] * num_posicoes
+        for p in range(1, num_posicoes):
+            prefixos[p] = prefixos[p - 1] + tabelas[p - 1][tupla[p - 1]]
+        ultima = tabelas[-1]
+        
+        while True:
+            prefixo = prefixos[-1]
+            for silaba in ultima[tupla[-1]:]:
+                yield prefixo + silaba
+            
+            # Avança o odômetro nas posições anteriores à última
+            p = num_posicoes - 2
+            while p >= 0 and tupla[p] == len(tabelas[p]) - 1:
+                tupla[p] = 0
+                p -= 1
+            if p < 0:
+                return
+            tupla[p] += 1
+            tupla[-1] = 0
+            for q in range(p + 1, num_posicoes):
+                prefixos[q] = prefixos[q - 1] + tabelas[q - 1][tupla[q - 1]]
+    
+    def iterar_tuplas(self, inicio: int = 0) -> Iterator[Tuple[int, ...]]:
+        """
+        Percorre as combinações canônicas a partir do índice `inicio`.
+        
+        As combinações sombreadas são podadas assim que completam um dos
+        `padroes`, sem consultar nenhuma lista de combinações.
+        
+        Args:
+            inicio: Índice da primeira palavra (padrão: 0)
+            
+        Yields:
+            Tuplas de índices de sílabas, na ordem dos índices
+        """
+        if inicio >= self.total:
+            return
+        faixas = [range(len(tabela)) for tabela in self.tabelas]
+        if inicio <= 0 and not self.padroes:
+            yield from product(*faixas)
+            return
+        primeira = self.tupla(max(inicio, 0))
+        num_posicoes = len(faixas)
+        
+        def percorrer(posicao: int, estado: frozenset, parcial: Tuple[int, ...], na_primeira: bool):
+            transicoes = self._transicoes(posicao, estado)
+            for i in faixas[posicao][primeira[posicao] if na_primeira else 0:]:
+                proximo = transicoes.get(i, _SEM_PADRAO)
+                if proximo is None:
+                    continue
+                if posicao == num_posicoes - 1:
+                    yield parcial + (i,)
+                else:
+                    yield from percorrer(
+                        posicao + 1, proximo, parcial + (i,), na_primeira and i == primeira[posicao]
+                    )
+        
+        yield from percorrer(0, _SEM_PADRAO, (), True)
+    
+    def _bruto(self, tupla: Sequence[int]) -> int:
+        return sum(i * m for i, m in zip(tupla, self.multiplicadores))
+    
+    def _decomposicoes(self, palavra: str) -> Iterator[Tuple[int, ...]]:
+        num_posicoes = len(self.tabelas)
+        tamanho = len(palavra)
+        restante_min, restante_max = self.restante_min, self.restante_max
+        
+        def percorrer(posicao: int, inicio: int, parcial: Tuple[int, ...]) -> Iterator[Tuple[int, ...]]:
+            if posicao == num_posicoes:
+                if inicio == tamanho:
+                    yield parcial
+                return
+            # Descarta cedo quando o que falta não cabe nas posições restantes
+            if not restante_min[posicao] <= tamanho - inicio <= restante_max[posicao]:
+                return
+            mapa = self.mapas[posicao]
+            for comprimento in self.comprimentos[posicao]:
+                indice = mapa.get(palavra[inicio:inicio + comprimento])
+                if indice is not None:
+                    yield from percorrer(posicao + 1, inicio + comprimento, parcial + (indice,))
+        
+        return percorrer(0, 0, ())
+    
+    def decompor(self, palavra: str) -> List[Tuple[int, ...]]:
+        """
+        Lista todas as tuplas de índices de sílabas que formam a palavra.
+        
+        Args:
+            palavra: Palavra a ser decomposta
+            
+        Returns:
+            Tuplas de índices, uma por combinação que produz a palavra
+        """
+        return list(self._decomposicoes(palavra))
+    
+    def contem(self, palavra: str) -> bool:
+        """Verifica se a palavra pode ser formada, parando na primeira decomposição."""
+        return next(self._decomposicoes(palavra), None) is not None
+    
+    def tupla(self, indice: int) -> Tuple[int, ...]:
+        """Retorna os índices das sílabas da palavra de índice `indice`."""
+        if not 0 <= indice < self.total:
+            raise IndexError(
+                f"Índice {indice} fora do intervalo [0, {self.total})"
+            )
+        if not self.padroes:
+            partes = []
+            for multiplicador in self.multiplicadores:
+                i, indice = divmod(indice, multiplicador)
+                partes.append(i)
+            return tuple(partes)
+        # Desce posição a posição pulando blocos inteiros de continuações:
+        # os índices fora das transições levam todos ao estado vazio
+        partes = []
+        estado = _SEM_PADRAO
+        resto = indice
+        for posicao in range(len(self.tabelas)):
+            transicoes = self._transicoes(posicao, estado)
+            bloco = self._livres(posicao + 1, _SEM_PADRAO)
+            livre = 0
+            escolhido = None
+            for i, proximo in transicoes.items():
+                antes = (i - livre) * bloco
+                if resto < antes:
+                    break
+                resto -= antes
+                quantidade = self._livres(posicao + 1, proximo) if proximo is not None else 0
+                if resto < quantidade:
+                    escolhido = i
+                    estado = proximo
+                    break
+                resto -= quantidade
+                livre = i + 1
+            if escolhido is None:
+                escolhido = livre + resto // bloco
+                resto %= bloco
+                estado = _SEM_PADRAO
+            partes.append(escolhido)
+        return tuple(partes)
+    
+    def tupla_canonica(self, palavra: str) -> Tuple[int, ...]:
+        """
+        Retorna a combinação canônica (de menor índice bruto) da palavra.
+        
+        Raises:
+            ValueError: Se a palavra não puder ser formada com as sílabas
+        """
+        tuplas = self.decompor(palavra)
+        if not tuplas:
+            raise ValueError(f"A palavra '{palavra}' não pode ser gerada")
+        return min(tuplas, key=self._bruto)
+    
+    def palavra(self, indice: int) -> str:
+        """Retorna a palavra de índice `indice` no espaço deduplicado."""
+        return ''.join(
+            tabela[i] for tabela, i in zip(self.tabelas, self.tupla(indice))
+        )
+    
+    def indice(self, palavra: str) -> int:
+        """Retorna o índice da palavra no espaço deduplicado."""
+        tupla = self.tupla_canonica(palavra)
+        if not self.padroes:
+            return self._bruto(tupla)
+        # Soma as continuações livres de todos os índices menores, posição a posição
+        indice = 0
+        estado = _SEM_PADRAO
+        for posicao, escolhido in enumerate(tupla):
+            transicoes = self._transicoes(posicao, estado)
+            menores = 0
+            for i, proximo in transicoes.items():
+                if i >= escolhido:
+                    break
+                menores += 1
+                if proximo is not None:
+                    indice += self._livres(posicao + 1, proximo)
+            indice += (escolhido - menores) * self._livres(posicao + 1, _SEM_PADRAO)
+            estado = transicoes.get(escolhido, _SEM_PADRAO)
+        return indice
+
+
+@lru_cache(maxsize=None)
+def _regra_proparoxitona(num_silabas: int) -> 're.Pattern':
+    """
+    Compila a regra de validação para palavras de `num_silabas` sílabas.
+    
+    A primeira vogal deve ser acentuada e a palavra deve ter exatamente
+    `num_silabas` vogais. Cada número de sílabas é compilado uma única vez.
+    """
+    vogais = GeradorEgera.VOGAIS_BASICAS + GeradorEgera.VOGAIS_ACENTUADAS
+    return re.compile(
+        rf'[^{vogais}]*[{GeradorEgera.VOGAIS_ACENTUADAS}]'
+        rf'(?:[^{vogais}]*[{vogais}]){{{num_silabas - 1}}}'
+        rf'[^{vogais}]*'
+    )
+
+
+class ResultadoValidacao(NamedTuple):
+    """Resultado da validação de um lote de palavras."""
+    
+    total: int
+    validas: int
+    # Pares (número da linha, palavra) que não passaram na validação
+    invalidas: List[Tuple[int, str]]
+
+
+@lru_cache(maxsize=128)
+def compilar_inventario(
+    *posicoes: Tuple[str, ...],
+    pesos: Optional[Tuple[Optional[PesosPosicao], ...]] = None,
+) -> InventarioCompilado:
+    """
+    Compila um inventário de sílabas, reaproveitando compilações anteriores.
+    
+    Geradores com as mesmas sílabas e pesos compartilham o mesmo inventário.
+    
+    Args:
+        posicoes: Tupla de sílabas de cada posição; a primeira é a tônica
+        pesos: Para cada posição, tupla de pares (sílaba, peso) ou None
+        
+    Returns:
+        Inventário compilado
+    """
+    return InventarioCompilado(posicoes, pesos)
+
+
+def _congelar_pesos(pesos: Optional[Mapping[str, float]]) -> Optional[PesosPosicao]:
+    """Converte um dicionário de pesos em uma tupla ordenada, usável como chave."""
+    if pesos is None:
+        return None
+    return tuple(sorted(pesos.items()))
+
+
+def _pesos_da_tabela(
+    tabela: Tuple[str, ...],
+    originais: Tuple[str, ...],
+    silabas: Tuple[str, ...],
+    pesos: Optional[PesosPosicao],
+) -> Tuple[float, ...]:
+    """
+    Calcula o peso de cada sílaba de uma tabela sem repetições.
+    
+    Cada ocorrência na lista original contribui com o peso informado para
+    ela (pela grafia original ou, na tônica, pela acentuada), ou 1.
+    """
+    informados = dict(pesos or ())
+    desconhecidas = set(informados) - set(originais) - set(silabas)
+    if desconhecidas:
+        raise ValueError(f"Pesos para sílabas inexistentes: {sorted(desconhecidas)}")
+    
+    indices = {silaba: i for i, silaba in enumerate(tabela)}
+    resultado = [0.0] * len(tabela)
+    for original, silaba in zip(originais, silabas):
+        peso = informados.get(original, informados.get(silaba, 1.0))
+        if peso < 0:
+            raise ValueError(f"Peso negativo para a sílaba '{original}': {peso}")
+        resultado[indices[silaba]] += peso
+    if tabela and not sum(resultado) > 0:
+        raise ValueError("O peso total de uma posição deve ser positivo")
+    return tuple(resultado)
+
+
+class _TabelaAlias:
+    """
+    Tabela de alias (método de Vose) para sortear sílabas com pesos.
+    
+    Cada sorteio consome um único número aleatório e custa tempo constante,
+    por mais desigual que seja a distribuição dos pesos.
+    """
+    
+    __slots__ = ('silabas', 'probabilidades', 'aliases')
+    
+    def __init__(self, silabas: Sequence[str], pesos: Sequence[float]):
+        n = len(silabas)
+        self.silabas = tuple(silabas)
+        total = sum(pesos)
+        escalados = [peso * n / total for peso in pesos] if n else []
+        probabilidades = [1.0] * n
+        aliases = list(range(n))
+        
+        pequenos = [i for i, valor in enumerate(escalados) if valor < 1.0]
+        grandes = [i for i, valor in enumerate(escalados) if valor >= 1.0]
+        while pequenos and grandes:
+            pequeno = pequenos.pop()
+            grande = grandes.pop()
+            probabilidades[pequeno] = escalados[pequeno]
+            aliases[pequeno] = grande
+            escalados[grande] -= 1.0 - escalados[pequeno]
+            (pequenos if escalados[grande] < 1.0 else grandes).append(grande)
+        # O que sobrar (por arredondamento) fica com probabilidade 1
+        
+        self.probabilidades = tuple(probabilidades)
+        self.aliases = tuple(aliases)
+    
+    def sortear(self, aleatorio: Callable[[], float]) -> str:
+        """
+        Sorteia uma sílaba.
+        
+        Args:
+            aleatorio: Função que retorna um número uniforme em [0, 1)
+            
+        Returns:
+            Sílaba sorteada de acordo com os pesos
+        """
+        x = aleatorio() * len(self.silabas)
+        i = int(x)
+        if x - i < self.probabilidades[i]:
+            return self.silabas[i]
+        return self.silabas[self.aliases[i]]
+
+
+class _PermutacaoAleatoria:
+    """
+    Permutação pseudoaleatória e preguiçosa de [0, tamanho).
+    
+    Usa uma rede de Feistel sobre o menor domínio 4**k que contém o
+    intervalo e descarta, por "cycle walking", os valores que caem fora
+    dele. Cada posição é calculada sob demanda, com memória constante.
+    """
+    
+    RODADAS = 6
+    _MASCARA_64 = (1 << 64) - 1
+    
+    def __init__(self, tamanho: int, rng=random):
+        self.tamanho = tamanho
+        bits_metade = 1
+        while 1 << (2 * bits_metade) < tamanho:
+            bits_metade += 1
+        self._bits_metade = bits_metade
+        self._mascara_metade = (1 << bits_metade) - 1
+        self._chaves = [rng.getrandbits(64) for _ in range(self.RODADAS)]
+    
+    def __len__(self) -> int:
+        return self.tamanho
+    
+    def _rodada(self, chave: int, valor: int) -> int:
+        # Mistura no estilo splitmix64
+        z = (valor + chave) * 0x9E3779B97F4A7C15 & self._MASCARA_64
+        z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & self._MASCARA_64
+        z = (z ^ (z >> 27)) * 0x94D049BB133111EB & self._MASCARA_64
+        return (z ^ (z >> 31)) & self._mascara_metade
+    
+    def _cifrar(self, valor: int) -> int:
+        esquerda = valor >> self._bits_metade
+        direita = valor & self._mascara_metade
+        for chave in self._chaves:
+            esquerda, direita = direita, esquerda ^ self._rodada(chave, direita)
+        return (esquerda << self._bits_metade) | direita
+    
+    def __getitem__(self, posicao: int) -> int:
+        if not 0 <= posicao < self.tamanho:
+            raise IndexError(f"Posição {posicao} fora do intervalo [0, {self.tamanho})")
+        valor = self._cifrar(posicao)
+        while valor >= self.tamanho:
+            valor = self._cifrar(valor)
+        return valor
+
+
+def _contar_palavras_distintas(tabelas: Sequence[Sequence[str]]) -> int:
+    """
+    Conta as palavras distintas formadas pelas tabelas, sem enumerá-las.
+    
+    Cada posição vira uma árvore de prefixos (trie) das suas sílabas, e a
+    concatenação das posições é lida como um autômato não determinístico.
+    A contagem percorre a versão determinística desse autômato (construída
+    sob demanda, conjunto de estados por conjunto de estados) somando os
+    caminhos até o fim da última posição. Como cada palavra corresponde a
+    um único caminho no autômato determinístico, sílabas repetidas e cortes
+    ambíguos entre sílabas são contados uma só vez. O custo cresce com o
+    número de estados do autômato, isto é, com o tamanho das tabelas.
+    
+    Args:
+        tabelas: Sílabas de cada posição
+        
+    Returns:
+        Quantidade de palavras distintas
+    """
+    num_posicoes = len(tabelas)
+    if num_posicoes == 0 or any(not tabela for tabela in tabelas):
+        return 0
+    
+    # filhos[p][no] mapeia caractere -> nó; terminais[p] marca fins de sílaba
+    filhos: List[List[Dict[str, int]]] = []
+    terminais: List[Set[int]] = []
+    for tabela in tabelas:
+        nos: List[Dict[str, int]] = [{}]
+        fins: Set[int] = set()
+        for silaba in tabela:
+            no = 0
+            for caractere in silaba:
+                proximo = nos[no].get(caractere)
+                if proximo is None:
+                    proximo = len(nos)
+                    nos[no][caractere] = proximo
+                    nos.append({})
+                no = proximo
+            fins.add(no)
+        filhos.append(nos)
+        terminais.append(fins)
+    
+    # Estado (num_posicoes, 0) marca uma palavra completa
+    final = (num_posicoes, 0)
+    
+    def avancar(estados: frozenset, caractere: str) -> frozenset:
+        destino = set()
+        for posicao, no in estados:
+            if posicao == num_posicoes:
+                continue
+            proximo = filhos[posicao][no].get(caractere)
+            if proximo is None:
+                continue
+            if filhos[posicao][proximo]:
+                destino.add((posicao, proximo))
+            if proximo in terminais[posicao]:
+                destino.add((posicao + 1, 0))
+        return frozenset(destino)
+    
+    contagens: Dict[frozenset, int] = {}
+    
+    def contar(estados: frozenset) -> int:
+        resultado = contagens.get(estados)
+        if resultado is not None:
+            return resultado
+        resultado = 1 if final in estados else 0
+        caracteres = set()
+        for posicao, no in estados:
+            if posicao < num_posicoes:
+                caracteres.update(filhos[posicao][no])
+        for caractere in caracteres:
+            resultado += contar(avancar(estados, caractere))
+        contagens[estados] = resultado
+        return resultado
+    
+    return contar(frozenset([(0, 0)]))
+
+
+def _padroes_sombreados(tabelas: Sequence[Sequence[str]]) -> Dict[int, Set[Tuple[int, ...]]]:
+    """
+    Encontra os trechos de combinação que repetem um trecho menor.
+    
+    Percorre apenas os pares de decomposições que divergem em algum ponto:
+    a partir de uma posição em que uma sílaba é prefixo de outra, as duas
+    decomposições avançam alternadamente consumindo o trecho pendente até
+    voltarem a se alinhar na mesma posição. Dos dois trechos encontrados, o
+    de maior índice é sombreado pelo outro, seja qual for o resto da
+    combinação. O custo depende das tabelas e da quantidade de pares
+    divergentes, e não do produto dos tamanhos das tabelas.
+    
+    Args:
+        tabelas: Sílabas de cada posição, sem repetições
+        
+    Returns:
+        Para cada posição inicial, os trechos (tuplas de índices) sombreados
+    """
+    num_posicoes = len(tabelas)
+    padroes: Dict[int, Set[Tuple[int, ...]]] = {}
+    
+    def seguir(inicio: int, atras: Tuple[int, ...], frente: Tuple[int, ...], pendente: str) -> None:
+        # A decomposição de trás ainda precisa consumir `pendente`, já
+        # consumido pela da frente
+        posicao = inicio + len(atras)
+        if not pendente:
+            if len(atras) == len(frente):
+                padroes.setdefault(inicio, set()).add(max(atras, frente))
+                return
+            if posicao == num_posicoes or inicio + len(frente) == num_posicoes:
+                return
+            for i, silaba in enumerate(tabelas[posicao]):
+                seguir(inicio, frente, atras + (i,), silaba)
+            return
+        if posicao == num_posicoes:
+            return
+        for i, silaba in enumerate(tabelas[posicao]):
+            if pendente.startswith(silaba):
+                seguir(inicio, atras + (i,), frente, pendente[len(silaba):])
+            elif silaba.startswith(pendente):
+                seguir(inicio, frente, atras + (i,), silaba[len(pendente):])
+    
+    for posicao, tabela in enumerate(tabelas):
+        for curta, silaba_curta in enumerate(tabela):
+            for longa, silaba_longa in enumerate(tabela):
+                if longa != curta and silaba_longa.startswith(silaba_curta):
+                    seguir(posicao, (curta,), (longa,), silaba_longa[len(silaba_curta):])
+    return padroes
+
+
+# Caractere que, em um padrão de consulta, aceita qualquer caractere
+CURINGA = '?'
+
+
+class ConsultaPalavras:
+    """
+    Palavras únicas que satisfazem restrições de forma.
+    
+    As restrições (prefixo, sufixo, faixa de tamanho e padrão com '?' como
+    curinga) são aplicadas sílaba a sílaba. Para cada tamanho total
+    possível, elas fixam alguns caracteres da palavra, e uma programação
+    dinâmica sobre (posição, deslocamento, estado) guarda as sílabas
+    compatíveis em cada ponto e quantas palavras cada uma completa. O
+    estado é o do autômato de `InventarioCompilado.padroes`, então as
+    combinações sombreadas já ficam fora das contagens. Combinações que não
+    levam a nenhuma palavra são podadas, então contar, enumerar e sortear
+    custam proporcional às palavras produzidas, sem tentativas descartadas.
+    
+    A comparação é exata: a sílaba tônica é acentuada, então o prefixo
+    'stra' não corresponde a 'strá'.
+    """
+    
+    def __init__(
+        self,
+        inventario: 'InventarioCompilado',
+        prefixo: str = '',
+        sufixo: str = '',
+        tamanho_min: Optional[int] = None,
+        tamanho_max: Optional[int] = None,
+        padrao: Optional[str] = None,
+        rng=random,
+    ):
+        """
+        Args:
+            inventario: Inventário compilado consultado
+            prefixo: Início obrigatório das palavras
+            sufixo: Final obrigatório das palavras
+            tamanho_min: Número mínimo de caracteres
+            tamanho_max: Número máximo de caracteres
+            padrao: Máscara da palavra inteira, com '?' para qualquer caractere
+            rng: Gerador aleatório usado em `sortear`
+        """
+        self.inventario = inventario
+        self.prefixo = prefixo
+        self.sufixo = sufixo
+        self.tamanho_min = tamanho_min
+        self.tamanho_max = tamanho_max
+        self.padrao = padrao
+        self._rng = rng
+        
+        menor = max(inventario.restante_min[0], len(prefixo), len(sufixo), tamanho_min or 0)
+        maior = inventario.restante_max[0]
+        if tamanho_max is not None:
+            maior = min(maior, tamanho_max)
+        if padrao is not None:
+            menor = max(menor, len(padrao))
+            maior = min(maior, len(padrao))
+        
+        # Opções de cada tamanho viável: opcoes[p][(deslocamento, estado)]
+        # guarda o total de palavras completadas a partir dali e as sílabas
+        # que levam a elas
+        self._opcoes: Dict[int, List[Dict[Tuple[int, frozenset], Tuple[int, list]]]] = {}
+        for tamanho in range(menor, maior + 1):
+            fixos = self._fixar(tamanho)
+            if fixos is not None:
+                opcoes = self._programar(tamanho, fixos)
+                if opcoes[0][(0, _SEM_PADRAO)][0]:
+                    self._opcoes[tamanho] = opcoes
+        self._total: Optional[int] = None
+    
+    def _fixar(self, tamanho: int) -> Optional[Dict[int, str]]:
+        """Caracteres fixados pelas restrições em uma palavra de `tamanho` caracteres."""
+        restricoes = [
+            enumerate(self.prefixo),
+            enumerate(self.sufixo, tamanho - len(self.sufixo)),
+        ]
+        if self.padrao is not None:
+            restricoes.append((i, c) for i, c in enumerate(self.padrao) if c != CURINGA)
+        fixos: Dict[int, str] = {}
+        for restricao in restricoes:
+            for posicao, caractere in restricao:
+                if fixos.setdefault(posicao, caractere) != caractere:
+                    return None
+        return fixos
+    
+    def _programar(self, tamanho: int, fixos: Dict[int, str]):
+        inventario = self.inventario
+        tabelas = inventario.tabelas
+        restante_min, restante_max = inventario.restante_min, inventario.restante_max
+        num_posicoes = len(tabelas)
+        opcoes: List[Dict[Tuple[int, frozenset], Tuple[int, List[Tuple[int, int, frozenset, int]]]]] = [
+            {} for _ in range(num_posicoes)
+        ]
+        padroes = inventario.padroes
+        
+        def completar(posicao: int, deslocamento: int, estado: frozenset) -> int:
+            if posicao == num_posicoes:
+                return 1 if deslocamento == tamanho else 0
+            memo = opcoes[posicao].get((deslocamento, estado))
+            if memo is not None:
+                return memo[0]
+            transicoes = inventario._transicoes(posicao, estado) if padroes else {}
+            total = 0
+            escolhas = []
+            for i, silaba in enumerate(tabelas[posicao]):
+                fim = deslocamento + len(silaba)
+                if not restante_min[posicao + 1] <= tamanho - fim <= restante_max[posicao + 1]:
+                    continue
+                if fixos and any(
+                    fixos.get(deslocamento + k, c) != c for k, c in enumerate(silaba)
+                ):
+                    continue
+                # Sílabas que completam um padrão formariam uma combinação sombreada
+                proximo = transicoes.get(i, _SEM_PADRAO)
+                if proximo is None:
+                    continue
+                quantidade = completar(posicao + 1, fim, proximo)
+                if quantidade:
+                    escolhas.append((i, fim, proximo, quantidade))
+                    total += quantidade
+            opcoes[posicao][(deslocamento, estado)] = (total, escolhas)
+            return total
+        
+        completar(0, 0, _SEM_PADRAO)
+        return opcoes
+    
+    def aceita(self, palavra: str) -> bool:
+        """Verifica se a palavra satisfaz as restrições (sem checar se pode ser gerada)."""
+        tamanho = len(palavra)
+        if self.tamanho_min is not None and tamanho < self.tamanho_min:
+            return False
+        if self.tamanho_max is not None and tamanho > self.tamanho_max:
+            return False
+        if self.padrao is not None and (
+            tamanho != len(self.padrao)
+            or any(p != CURINGA and p != c for p, c in zip(self.padrao, palavra))
+        ):
+            return False
+        return palavra.startswith(self.prefixo) and palavra.endswith(self.sufixo)
+    
+    def contar(self) -> int:
+        """
+        Conta as palavras únicas que satisfazem as restrições.
+        
+        Returns:
+            Número de palavras, sem enumerá-las
+        """
+        if self._total is None:
+            self._total = sum(opcoes[0][(0, _SEM_PADRAO)][0] for opcoes in self._opcoes.values())
+        return self._total
+    
+    def __len__(self) -> int:
+        return self.contar()
+    
+    def _enumerar(self, tamanho: int) -> Iterator[Tuple[int, str]]:
+        tabelas = self.inventario.tabelas
+        opcoes = self._opcoes[tamanho]
+        num_posicoes = len(tabelas)
+        tupla = [0] * num_posicoes
+        
+        def percorrer(posicao: int, deslocamento: int, estado: frozenset, texto: str) -> Iterator[Tuple[int, str]]:
+            for i, fim, proximo, _ in opcoes[posicao][(deslocamento, estado)][1]:
+                tupla[posicao] = i
+                if posicao == num_posicoes - 1:
+                    yield self.inventario._bruto(tupla), texto + tabelas[posicao][i]
+                else:
+                    yield from percorrer(posicao + 1, fim, proximo, texto + tabelas[posicao][i])
+        
+        return percorrer(0, 0, _SEM_PADRAO, '')
+    
+    def __iter__(self) -> Iterator[str]:
+        """Percorre as palavras que satisfazem as restrições, na ordem dos índices."""
+        # Cada tamanho é percorrido em ordem de índice bruto; a intercalação
+        # mantém a ordem global
+        por_tamanho = [self._enumerar(tamanho) for tamanho in self._opcoes]
+        for _, palavra in heapq.merge(*por_tamanho):
+            yield palavra
+    
+    def sortear(self, quantidade: int = 1) -> List[str]:
+        """
+        Sorteia palavras uniformemente entre as que satisfazem as restrições.
+        
+        Cada palavra é montada sílaba a sílaba, escolhendo cada sílaba com
+        probabilidade proporcional ao número de palavras que ela completa.
+        O sorteio é com reposição e ignora os pesos das sílabas.
+        
+        Args:
+            quantidade: Número de palavras a sortear
+            
+        Returns:
+            Lista de palavras sorteadas
+            
+        Raises:
+            ValueError: Se nenhuma palavra satisfizer as restrições
+        """
+        if not self._opcoes:
+            raise ValueError("Nenhuma palavra satisfaz as restrições")
+        tabelas = self.inventario.tabelas
+        tamanhos = list(self._opcoes)
+        totais = [self._opcoes[tamanho][0][(0, _SEM_PADRAO)][0] for tamanho in tamanhos]
+        randrange = self._rng.randrange
+        soma = sum(totais)
+        palavras = []
+        for _ in range(quantidade):
+            sorteado = randrange(soma)
+            for tamanho, total in zip(tamanhos, totais):
+                if sorteado < total:
+                    break
+                sorteado -= total
+            opcoes = self._opcoes[tamanho]
+            partes = []
+            deslocamento = 0
+            estado = _SEM_PADRAO
+            for posicao, tabela in enumerate(tabelas):
+                for i, fim, proximo, quantidade_silaba in opcoes[posicao][(deslocamento, estado)][1]:
+                    if sorteado < quantidade_silaba:
+                        break
+                    sorteado -= quantidade_silaba
+                partes.append(tabela[i])
+                deslocamento = fim
+                estado = proximo
+            palavras.append(''.join(partes))
+        return palavras
+
+
+# Protege a criação preguiçosa dos geradores aleatórios das instâncias
+_TRAVA_FLUXOS = threading.Lock()
+
+# Inventário das sílabas padrão de cada (classe, número de sílabas), com as
+# constantes de sílabas e pesos da classe de quando ele foi compilado
+_INVENTARIOS_PADRAO: Dict[Tuple[type, int], Tuple[tuple, 'InventarioCompilado']] = {}
+
+
+def _constantes_silabas(classe: type) -> tuple:
+    # Comparadas por identidade dos elementos, é barato detectar uma troca
+    return (classe.SILABAS_TONICAS, classe.SILABAS_MEDIAS, classe.SILABAS_FINAIS,
+            classe.PESOS_MEDIAS, classe.PESOS_FINAIS)
 
 
 class GeradorEgera:
     """
-    Gerador de palavras proparoxítonas de 3 sílabas.
+    Gerador de palavras proparoxítonas de 3 sílabas (ou mais, com `num_silabas`).
     
     Combina sílabas tônicas, médias e finais para criar palavras
     proparoxítonas que podem ser usadas como apelidos.
@@ -23,30 +993,213 @@ class GeradorEgera:
     VOGAIS_ACENTUADAS = 'áéíóú'
     VOGAIS_BASICAS = 'aeiou'
     
-    def __init__(self):
-        # Sílabas iniciais (tônicas) - primeira sílaba
-        # Todas devem ter vogal para formar sílaba válida em português
-        self.silabas_tonicas = [
-            'pró', 'fí', 'sô', 'bál', 'rés', 'nhú', 'jú', 'tê', 'drú',
-            'cá', 'dé', 'fó', 'gá', 'hí', 'lí', 'má', 'ná', 'pá', 'rá',
-            'sá', 'tá', 'vá', 'zá', 'chá', 'flá', 'glá', 'plá', 'trá',
-            'brá', 'crá', 'drá', 'frá', 'grá', 'prá', 'scrá', 'sprá', 'strá'
-        ]
+    # Sílabas iniciais (tônicas) - primeira sílaba
+    # Todas devem ter vogal para formar sílaba válida em português
+    SILABAS_TONICAS = (
+        'pró', 'fí', 'sô', 'bál', 'rés', 'nhú', 'jú', 'tê', 'drú',
+        'cá', 'dé', 'fó', 'gá', 'hí', 'lí', 'má', 'ná', 'pá', 'rá',
+        'sá', 'tá', 'vá', 'zá', 'chá', 'flá', 'glá', 'plá', 'trá',
+        'brá', 'crá', 'drá', 'frá', 'grá', 'prá', 'scrá', 'sprá', 'strá'
+    )
+    
+    # Sílabas médias - segunda sílaba
+    SILABAS_MEDIAS = (
+        'tu', 'bra', 'ma', 'ho', 'sno', 'ça', 'ni',
+        'la', 'ta', 'na', 'ra', 'sa', 'ca', 'da', 'fa', 'ga',
+        'ha', 'ja', 'ka', 'pa', 'va', 'xa', 'za', 'cha', 'lha',
+        'nha', 'rha', 'tha', 'bla', 'cla', 'fla', 'gla', 'pla'
+    )
+    
+    # Sílabas finais - terceira sílaba
+    SILABAS_FINAIS = (
+        'la', 'ta', 'ne', 'de', 'te', 'na', 'ca', 'pe',
+        'ra', 'sa', 'da', 'fa', 'ga', 'ma', 'pa', 'va',
+        'za', 'cha', 'lha', 'nha', 'rha', 'tha'
+    )
+    
+    # Pesos padrão do sorteio: sílabas preferidas saem com mais frequência
+    # (as demais têm peso 1). Só valem para as listas de sílabas padrão.
+    PESOS_MEDIAS = (('ma', 3),)
+    PESOS_FINAIS = (('ca', 2), ('ga', 2))
+    
+    def __init__(
+        self,
+        silabas_tonicas: Optional[Sequence[str]] = None,
+        silabas_medias: Optional[Sequence[str]] = None,
+        silabas_finais: Optional[Sequence[str]] = None,
+        num_silabas: int = NUM_SILABAS_ESPERADO,
+        semente: Optional[int] = None,
+        pesos_tonicas: Optional[Mapping[str, float]] = None,
+        pesos_medias: Optional[Mapping[str, float]] = None,
+        pesos_finais: Optional[Mapping[str, float]] = None,
+    ):
+        """
+        Args:
+            silabas_tonicas: Sílabas da primeira posição (padrão: SILABAS_TONICAS)
+            silabas_medias: Sílabas das posições intermediárias (padrão: SILABAS_MEDIAS)
+            silabas_finais: Sílabas da última posição (padrão: SILABAS_FINAIS)
+            num_silabas: Número de sílabas das palavras; cada sílaba além da
+                terceira é uma posição média a mais (padrão: 3)
+            semente: Semente do gerador de números aleatórios da instância;
+                a mesma semente reproduz a mesma sequência de palavras
+            pesos_tonicas: Peso de sorteio de cada sílaba tônica; as
+                ausentes têm peso 1
+            pesos_medias: Peso de sorteio de cada sílaba média (padrão:
+                PESOS_MEDIAS, se as sílabas médias forem as padrão)
+            pesos_finais: Peso de sorteio de cada sílaba final (padrão:
+                PESOS_FINAIS, se as sílabas finais forem as padrão)
+            
+        Raises:
+            ValueError: Se num_silabas for menor que 3 ou se algum peso for
+                inválido (negativo, de sílaba inexistente ou todos zero)
+        """
+        if num_silabas < 3:
+            raise ValueError(
+                f"Uma proparoxítona tem pelo menos 3 sílabas (recebido: {num_silabas})"
+            )
+        self.num_silabas = num_silabas
+        self._regra = _regra_proparoxitona(num_silabas)
         
-        # Sílabas médias - segunda sílaba
-        self.silabas_medias = [
-            'tu', 'bra', 'ma', 'ho', 'sno', 'ma', 'ça', 'ni', 'ma',
-            'la', 'ta', 'na', 'ra', 'sa', 'ca', 'da', 'fa', 'ga',
-            'ha', 'ja', 'ka', 'pa', 'va', 'xa', 'za', 'cha', 'lha',
-            'nha', 'rha', 'tha', 'bla', 'cla', 'fla', 'gla', 'pla'
-        ]
+        # Cada instância tem o próprio gerador aleatório; a chave identifica
+        # o fluxo e é a base da derivação de fluxos filhos. Os dois só são
+        # criados no primeiro uso (veja `_rng`), para que construir um
+        # gerador continue custando pouco mais que consultar o inventário
+        self._semente = semente
+        self._chave_fluxo: Optional[Tuple[int, ...]] = None
+        self._rng_fluxo: Optional[random.Random] = None
+        self._filhos_derivados = 0
         
-        # Sílabas finais - terceira sílaba
-        self.silabas_finais = [
-            'la', 'ta', 'ne', 'de', 'te', 'na', 'ca', 'pe',
-            'ra', 'sa', 'da', 'fa', 'ga', 'ma', 'pa', 'va',
-            'za', 'cha', 'lha', 'nha', 'rha', 'tha', 'ca', 'ga'
-        ]
+        padrao = (
+            silabas_tonicas is None and silabas_medias is None and silabas_finais is None
+            and pesos_tonicas is None and pesos_medias is None and pesos_finais is None
+        )
+        # Sílabas e pesos padrão: o inventário fica guardado por classe e
+        # número de sílabas, sem montar e comparar a chave do cache
+        guardado = _INVENTARIOS_PADRAO.get((type(self), num_silabas)) if padrao else None
+        if guardado is not None and guardado[0] == _constantes_silabas(type(self)):
+            self._inventario = guardado[1]
+        else:
+            self._inventario = self._compilar(
+                silabas_tonicas, silabas_medias, silabas_finais,
+                pesos_tonicas, pesos_medias, pesos_finais,
+            )
+            if padrao:
+                _INVENTARIOS_PADRAO[(type(self), num_silabas)] = (
+                    _constantes_silabas(type(self)), self._inventario,
+                )
+    
+    def _compilar(self, silabas_tonicas, silabas_medias, silabas_finais,
+                  pesos_tonicas, pesos_medias, pesos_finais) -> 'InventarioCompilado':
+        # Os pesos padrão já são pares (sílaba, peso) e não precisam de dict
+        pesos_medias = _congelar_pesos(pesos_medias)
+        if silabas_medias is None and pesos_medias is None:
+            pesos_medias = tuple(sorted(self.PESOS_MEDIAS))
+        pesos_finais = _congelar_pesos(pesos_finais)
+        if silabas_finais is None and pesos_finais is None:
+            pesos_finais = tuple(sorted(self.PESOS_FINAIS))
+        medias = tuple(silabas_medias) if silabas_medias is not None else self.SILABAS_MEDIAS
+        return compilar_inventario(
+            tuple(silabas_tonicas) if silabas_tonicas is not None else self.SILABAS_TONICAS,
+            *[medias] * (self.num_silabas - 2),
+            tuple(silabas_finais) if silabas_finais is not None else self.SILABAS_FINAIS,
+            pesos=(
+                (_congelar_pesos(pesos_tonicas),)
+                + (pesos_medias,) * (self.num_silabas - 2)
+                + (pesos_finais,)
+            ),
+        )
+    
+    def derivar(self, quantidade: int) -> List['GeradorEgera']:
+        """
+        Cria geradores filhos com fluxos aleatórios independentes.
+        
+        A semente de cada filho é obtida por hash (SHA-256) da chave do pai
+        e da posição do filho, então os fluxos são estatisticamente
+        independentes entre si e em relação ao pai, e reprodutíveis quando
+        o pai tem semente fixa. Chamadas sucessivas produzem filhos novos.
+        Os filhos compartilham o inventário do pai e podem ser usados em
+        threads ou processos separados, sem disputar estado global.
+        
+        Args:
+            quantidade: Número de filhos
+            
+        Returns:
+            Lista de geradores filhos
+        """
+        filhos = []
+        for _ in range(quantidade):
+            filho = copy.copy(self)
+            filho._chave_fluxo = self._chave + (self._filhos_derivados,)
+            resumo = hashlib.sha256(repr(filho._chave_fluxo).encode('ascii')).digest()
+            filho._rng_fluxo = random.Random(int.from_bytes(resumo, 'big'))
+            filho._filhos_derivados = 0
+            self._filhos_derivados += 1
+            filhos.append(filho)
+        return filhos
+    
+    def _iniciar_fluxo(self) -> None:
+        with _TRAVA_FLUXOS:
+            if self._rng_fluxo is None:
+                semente = self._semente
+                if semente is None:
+                    semente = random.SystemRandom().getrandbits(128)
+                self._chave_fluxo = (semente,)
+                self._rng_fluxo = random.Random(semente)
+    
+    @property
+    def _rng(self) -> random.Random:
+        """Gerador aleatório da instância, criado no primeiro uso."""
+        if self._rng_fluxo is None:
+            self._iniciar_fluxo()
+        return self._rng_fluxo
+    
+    @property
+    def _chave(self) -> Tuple[int, ...]:
+        """Chave do fluxo aleatório, base da derivação dos filhos."""
+        if self._chave_fluxo is None:
+            self._iniciar_fluxo()
+        return self._chave_fluxo
+    
+    @property
+    def inventario(self) -> 'InventarioCompilado':
+        """Inventário compilado, compartilhado entre geradores com as mesmas sílabas."""
+        return self._inventario
+    
+    def _trocar_posicoes(self, indices: range, silabas: Sequence[str]) -> None:
+        # As posições trocadas voltam ao sorteio uniforme; as demais mantêm os pesos
+        posicoes = list(self._inventario.posicoes)
+        pesos = list(self._inventario.pesos_informados)
+        for posicao in indices:
+            posicoes[posicao] = tuple(silabas)
+            pesos[posicao] = None
+        self._inventario = compilar_inventario(*posicoes, pesos=tuple(pesos))
+    
+    @property
+    def silabas_tonicas(self) -> Tuple[str, ...]:
+        """Sílabas da primeira posição, como foram informadas."""
+        return self._inventario.posicoes[0]
+    
+    @silabas_tonicas.setter
+    def silabas_tonicas(self, silabas: Sequence[str]) -> None:
+        self._trocar_posicoes(range(0, 1), silabas)
+    
+    @property
+    def silabas_medias(self) -> Tuple[str, ...]:
+        """Sílabas das posições intermediárias, como foram informadas."""
+        return self._inventario.posicoes[1]
+    
+    @silabas_medias.setter
+    def silabas_medias(self, silabas: Sequence[str]) -> None:
+        self._trocar_posicoes(range(1, self.num_silabas - 1), silabas)
+    
+    @property
+    def silabas_finais(self) -> Tuple[str, ...]:
+        """Sílabas da última posição, como foram informadas."""
+        return self._inventario.posicoes[-1]
+    
+    @silabas_finais.setter
+    def silabas_finais(self, silabas: Sequence[str]) -> None:
+        self._trocar_posicoes(range(self.num_silabas - 1, self.num_silabas), silabas)
     
     def adicionar_acento(self, silaba: str) -> str:
         """
@@ -58,53 +1211,50 @@ class GeradorEgera:
         Returns:
             Sílaba com acento agudo na primeira vogal
         """
-        vogais_acentuadas = {
-            'a': 'á', 'e': 'é', 'i': 'í', 'o': 'ó', 'u': 'ú'
-        }
-        
-        # Se já tem acento, retorna como está
-        if any(c in silaba for c in self.VOGAIS_ACENTUADAS):
-            return silaba
-        
-        # Encontra a primeira vogal e acentua
-        for i, char in enumerate(silaba):
-            if char.lower() in vogais_acentuadas:
-                vogal_acentuada = vogais_acentuadas[char.lower()]
-                if char.isupper():
-                    vogal_acentuada = vogal_acentuada.upper()
-                return silaba[:i] + vogal_acentuada + silaba[i+1:]
-        
-        return silaba
+        return _acentuar(silaba)
     
     def gerar_palavra(self) -> str:
         """
-        Gera uma palavra proparoxítona de 3 sílabas aleatoriamente.
+        Gera uma palavra proparoxítona de `num_silabas` sílabas aleatoriamente.
         
         Returns:
-            Palavra proparoxítona de 3 sílabas com acento na primeira sílaba
+            Palavra proparoxítona com acento na primeira sílaba
         """
-        # Seleciona sílabas aleatoriamente
-        silaba1 = random.choice(self.silabas_tonicas)
-        silaba2 = random.choice(self.silabas_medias)
-        silaba3 = random.choice(self.silabas_finais)
-        
-        # Garante que a primeira sílaba tenha acento
-        silaba1 = self.adicionar_acento(silaba1)
-        
-        # Combina as sílabas
-        return silaba1 + silaba2 + silaba3
+        # Sorteia cada sílaba pela tabela de alias da posição, de acordo com
+        # os pesos; as tônicas já estão acentuadas
+        aleatorio = self._rng.random
+        return ''.join([tabela.sortear(aleatorio) for tabela in self._inventario.sorteadores])
     
-    def gerar_multiplas(self, quantidade: int = 10) -> List[str]:
+    def gerar_multiplas(self, quantidade: int = 10, unicas: bool = False) -> List[str]:
         """
         Gera múltiplas palavras proparoxítonas.
         
+        Com `unicas=True` as palavras são sorteadas sem reposição: uma
+        permutação pseudoaleatória do espaço de palavras únicas é percorrida
+        sob demanda, então o custo de memória não depende da quantidade.
+        
         Args:
             quantidade: Número de palavras a gerar (padrão: 10)
+            unicas: Se True, não repete palavras (padrão: False)
             
         Returns:
             Lista de palavras proparoxítonas geradas
+            
+        Raises:
+            ValueError: Se `unicas=True` e a quantidade exceder o número de
+                palavras únicas possíveis
         """
-        return [self.gerar_palavra() for _ in range(quantidade)]
+        if not unicas:
+            return [self.gerar_palavra() for _ in range(quantidade)]
+        
+        indice = self._inventario
+        if quantidade > len(indice):
+            raise ValueError(
+                f"Não é possível gerar {quantidade:,} palavras únicas; "
+                f"o máximo é {len(indice):,}"
+            )
+        permutacao = _PermutacaoAleatoria(len(indice), self._rng)
+        return [indice.palavra(permutacao[i]) for i in range(quantidade)]
     
     def calcular_maximo_palavras(self) -> int:
         """
@@ -113,71 +1263,335 @@ class GeradorEgera:
         Returns:
             Número máximo teórico de combinações possíveis
         """
-        return len(self.silabas_tonicas) * len(self.silabas_medias) * len(self.silabas_finais)
+        maximo = 1
+        for silabas in self._inventario.posicoes:
+            maximo *= len(silabas)
+        return maximo
+    
+    def calcular_palavras_unicas(self) -> int:
+        """
+        Calcula a quantidade de palavras distintas que podem ser geradas.
+        
+        Returns:
+            Número de palavras únicas (sem combinações repetidas)
+        """
+        return len(self._inventario)
+    
+    def palavra_por_indice(self, indice: int) -> str:
+        """
+        Retorna a palavra única de posição `indice`, sem gerar a lista completa.
+        
+        Args:
+            indice: Posição no intervalo [0, calcular_palavras_unicas())
+            
+        Returns:
+            Palavra correspondente ao índice
+            
+        Raises:
+            IndexError: Se o índice estiver fora do intervalo
+        """
+        return self._inventario.palavra(indice)
+    
+    def contem(self, palavra: str) -> bool:
+        """
+        Verifica se a palavra pode ser produzida pelo gerador.
+        
+        A consulta usa apenas as tabelas de sílabas (buscas em dicionário a
+        cada ponto de corte possível), sem montar a lista de palavras, e seu
+        custo depende só do tamanho da palavra.
+        
+        Args:
+            palavra: Palavra a verificar
+            
+        Returns:
+            True se alguma combinação de sílabas produz a palavra
+        """
+        return self._inventario.contem(palavra)
+    
+    def decompor(self, palavra: str) -> List[Tuple[str, ...]]:
+        """
+        Lista as combinações (tônica, média, final) que produzem a palavra.
+        
+        Algumas palavras são produzidas por mais de uma combinação, quando a
+        fronteira entre as sílabas é ambígua.
+        
+        Args:
+            palavra: Palavra a decompor
+            
+        Returns:
+            Combinações de sílabas que formam a palavra (lista vazia se nenhuma);
+            a sílaba tônica aparece já acentuada
+        """
+        tabelas = self._inventario.tabelas
+        return [
+            tuple(tabela[i] for tabela, i in zip(tabelas, tupla))
+            for tupla in self._inventario.decompor(palavra)
+        ]
     
-    def gerar_todas_palavras_possiveis(self) -> List[str]:
+    def indice_da_palavra(self, palavra: str) -> int:
+        """
+        Retorna a posição de uma palavra no espaço de palavras únicas.
+        
+        É a operação inversa de `palavra_por_indice`.
+        
+        Args:
+            palavra: Palavra que pode ser gerada pelo gerador
+            
+        Returns:
+            Índice da palavra no intervalo [0, calcular_palavras_unicas())
+            
+        Raises:
+            ValueError: Se a palavra não puder ser gerada pelas sílabas atuais
+        """
+        return self._inventario.indice(palavra)
+
+    def consultar(
+        self,
+        prefixo: str = '',
+        sufixo: str = '',
+        tamanho_min: Optional[int] = None,
+        tamanho_max: Optional[int] = None,
+        padrao: Optional[str] = None,
+    ) -> ConsultaPalavras:
+        """
+        Seleciona as palavras únicas que satisfazem restrições de forma.
+
+        As sílabas incompatíveis com as restrições são podadas posição a
+        posição, então contar, enumerar e sortear não passam pelas palavras
+        descartadas.
+
+        Args:
+            prefixo: Início obrigatório, ex.: 'str' (a tônica é acentuada)
+            sufixo: Final obrigatório, ex.: 'nha'
+            tamanho_min: Número mínimo de caracteres
+            tamanho_max: Número máximo de caracteres
+            padrao: Máscara da palavra inteira, com '?' para qualquer caractere
+
+        Returns:
+            Consulta com `contar()`, iteração em ordem de índice e `sortear()`
+        """
+        return ConsultaPalavras(
+            self._inventario, prefixo, sufixo, tamanho_min, tamanho_max, padrao, self._rng
+        )
+
+    def gerar_todas_palavras_possiveis(self, compacto: bool = False) -> Sequence[str]:
         """
         Gera todas as palavras possíveis sem duplicatas.
         
+        Args:
+            compacto: Se True, retorna um `lexico.LexicoCompacto`, que guarda
+                cada palavra como índices de sílabas e ocupa uma fração da
+                memória de uma lista de strings (padrão: False)
+            
         Returns:
             Lista com todas as palavras únicas possíveis
         """
-        palavras = []
+        if compacto:
+            # lexico importa este módulo, então a importação só pode ser
+            # feita aqui, na chamada, e não no topo do arquivo
+            from lexico import LexicoCompacto
+            return LexicoCompacto.de_inventario(self._inventario)
+        
+        # Percorre apenas as combinações canônicas: não há duplicatas a remover
+        return list(self._inventario)
+    
+    def iterar_palavras_unicas(
+        self, embaralhar: bool = False, semente: Optional[int] = None, inicio: int = 0
+    ) -> Iterator[str]:
+        """
+        Percorre todas as palavras únicas sem montar a lista completa.
+        
+        A enumeração pode ser retomada: com `inicio=k` ela produz as mesmas
+        palavras que a enumeração completa a partir da k-ésima (no caso
+        embaralhado, desde que a semente seja a mesma).
+        
+        Args:
+            embaralhar: Se True, percorre as palavras em ordem aleatória
+            semente: Semente do embaralhamento (padrão: usa o gerador
+                aleatório da instância)
+            inicio: Quantidade de palavras a pular no começo (padrão: 0)
+            
+        Yields:
+            Cada palavra única exatamente uma vez
+        """
+        if not embaralhar:
+            yield from self._inventario.iterar(inicio)
+            return
+        
+        inventario = self._inventario
+        rng = self._rng if semente is None else random.Random(semente)
+        permutacao = _PermutacaoAleatoria(len(inventario), rng)
+        for posicao in range(max(inicio, 0), len(permutacao)):
+            yield inventario.palavra(permutacao[posicao])
+    
+    def iterar_blocos(
+        self,
+        tamanho_bloco: int = 100_000,
+        inicio: int = 0,
+        embaralhar: bool = False,
+        semente: Optional[int] = None,
+    ) -> Iterator[List[str]]:
+        """
+        Percorre as palavras únicas em blocos de tamanho limitado.
         
-        # Gera todas as combinações possíveis
-        for silaba1 in self.silabas_tonicas:
-            for silaba2 in self.silabas_medias:
-                for silaba3 in self.silabas_finais:
-                    # Garante que a primeira sílaba tenha acento
-                    silaba1_acentuada = self.adicionar_acento(silaba1)
-                    palavra = silaba1_acentuada + silaba2 + silaba3
-                    palavras.append(palavra)
+        Para retomar uma enumeração interrompida, passe em `inicio` o total
+        de palavras já recebidas.
         
-        # Remove duplicatas e retorna
-        return list(set(palavras))
+        Args:
+            tamanho_bloco: Número máximo de palavras por bloco
+            inicio: Quantidade de palavras a pular no começo (padrão: 0)
+            embaralhar: Se True, percorre as palavras em ordem aleatória
+            semente: Semente do embaralhamento (padrão: usa o gerador
+                aleatório da instância)
+            
+        Yields:
+            Listas com até `tamanho_bloco` palavras
+        """
+        palavras = self.iterar_palavras_unicas(embaralhar, semente, inicio)
+        while True:
+            bloco = list(islice(palavras, tamanho_bloco))
+            if not bloco:
+                return
+            yield bloco
     
     def validar_proparoxitona(self, palavra: str) -> bool:
         """
-        Valida se a palavra tem 3 sílabas e é proparoxítona.
+        Valida se a palavra tem `num_silabas` sílabas e acento na primeira.
         
         Args:
             palavra: Palavra a ser validada
             
         Returns:
-            True se a palavra é proparoxítona de 3 sílabas, False caso contrário
+            True se a palavra é proparoxítona de `num_silabas` sílabas, False caso contrário
         """
-        palavra_lower = palavra.lower()
+        # Conta as sílabas aproximadas (vogais) e verifica se a primeira
+        # vogal é acentuada em uma única passagem
+        return self._regra.fullmatch(palavra.lower()) is not None
+    
+    def validar_lote(
+        self,
+        palavras: Iterable[str],
+        max_invalidas: Optional[int] = None,
+    ) -> ResultadoValidacao:
+        """
+        Valida muitas palavras em uma única passagem.
         
-        # Conta sílabas aproximadas (vogais)
-        vogais = re.findall(rf'[{self.VOGAIS_BASICAS}{self.VOGAIS_ACENTUADAS}]', palavra_lower)
-        num_silabas = len(vogais)
+        Cada item é tratado como uma linha: espaços nas pontas são removidos
+        e linhas em branco são ignoradas (mas contam na numeração).
         
-        # Verifica se tem acento na primeira sílaba
-        primeira_silaba = re.match(
-            rf'^[^{self.VOGAIS_BASICAS}{self.VOGAIS_ACENTUADAS}]*[{self.VOGAIS_BASICAS}{self.VOGAIS_ACENTUADAS}]',
-            palavra_lower
-        )
-        tem_acento_na_primeira = (
-            primeira_silaba is not None and
-            any(c in primeira_silaba.group() for c in self.VOGAIS_ACENTUADAS)
-        )
+        Args:
+            palavras: Iterável de palavras, por exemplo as linhas de um arquivo
+            max_invalidas: Número máximo de linhas inválidas guardadas no
+                resultado (padrão: todas); as contagens continuam exatas
+            
+        Returns:
+            Resultado com as contagens e as linhas inválidas numeradas a partir de 1
+        """
+        validar = self._regra.fullmatch
+        total = 0
+        validas = 0
+        invalidas = []
+        for numero, linha in enumerate(palavras, 1):
+            palavra = linha.strip()
+            if not palavra:
+                continue
+            total += 1
+            if validar(palavra.lower()) is not None:
+                validas += 1
+            elif max_invalidas is None or len(invalidas) < max_invalidas:
+                invalidas.append((numero, palavra))
+        return ResultadoValidacao(total, validas, invalidas)
+    
+    def validar_arquivo(
+        self,
+        caminho: str,
+        encoding: str = 'utf-8',
+        max_invalidas: Optional[int] = None,
+    ) -> ResultadoValidacao:
+        """
+        Valida um arquivo com uma palavra por linha, sem carregá-lo inteiro.
         
-        return num_silabas == self.NUM_SILABAS_ESPERADO and tem_acento_na_primeira
+        Args:
+            caminho: Caminho do arquivo
+            encoding: Codificação do arquivo (padrão: utf-8)
+            max_invalidas: Número máximo de linhas inválidas guardadas no
+                resultado (padrão: todas)
+            
+        Returns:
+            Resultado com as contagens e as linhas inválidas
+        """
+        with open(caminho, 'r', encoding=encoding, buffering=1 << 20) as arquivo:
+            return self.validar_lote(arquivo, max_invalidas)
 
 
-def main() -> None:
-    """
-    Função principal do programa.
+# Palavras geradas e gravadas por vez na saída em lote
+TAMANHO_BLOCO_SAIDA = 65_536
+# Buffer de escrita da saída em lote, em bytes
+TAMANHO_BUFFER_SAIDA = 1 << 20
+
+
+class _SaidaPadrao:
+    """Encaminha as escritas para um fluxo de texto sem fechá-lo."""
     
-    Interage com o usuário para gerar palavras proparoxítonas.
+    def __init__(self, fluxo: TextIO):
+        self._fluxo = fluxo
+    
+    def write(self, texto: str) -> int:
+        return self._fluxo.write(texto)
+    
+    def close(self) -> None:
+        self._fluxo.flush()
+
+
+def _abrir_saida(caminho: Optional[str]) -> TextIO:
+    """Abre a saída em lote: um arquivo (gzip se terminar em .gz) ou a saída padrão."""
+    if caminho is not None and caminho != '-':
+        if caminho.endswith('.gz'):
+            return gzip.open(caminho, 'wt', encoding='utf-8', newline='')
+        return open(caminho, 'w', encoding='utf-8', newline='', buffering=TAMANHO_BUFFER_SAIDA)
+    try:
+        descritor = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Saída padrão substituída por um objeto sem descritor (ex.: em testes)
+        return _SaidaPadrao(sys.stdout)
+    sys.stdout.flush()
+    return open(descritor, 'w', encoding='utf-8', newline='',
+                buffering=TAMANHO_BUFFER_SAIDA, closefd=False)
+
+
+def _gravar_em_lote(gerador: 'GeradorEgera', args: argparse.Namespace, formato: str) -> None:
+    """Gera `args.count` palavras e as grava em blocos na saída escolhida."""
+    escrever = FORMATOS[formato]
+    if args.unique:
+        palavras = gerador.iterar_palavras_unicas(embaralhar=True)
+    else:
+        gerar_palavra = gerador.gerar_palavra
+        palavras = (gerar_palavra() for _ in range(args.count))
+    
+    saida = _abrir_saida(args.output)
+    try:
+        saida.write(CABECALHOS.get(formato, ''))
+        restantes = args.count
+        while restantes > 0:
+            bloco = list(islice(palavras, min(restantes, TAMANHO_BLOCO_SAIDA)))
+            escrever(bloco, saida)
+            restantes -= len(bloco)
+    finally:
+        saida.close()
+
+
+def _main_interativo(gerador: 'GeradorEgera') -> int:
     """
-    gerador = GeradorEgera()
+    Interage com o usuário para gerar palavras proparoxítonas.
     
+    Returns:
+        0 em caso de sucesso, 1 se a quantidade informada for inválida
+    """
     print("Gerador de Apelidos Proparoxítonos para Égera")
     print()
     
-    # Calcula e exibe a quantidade máxima de palavras possíveis
-    maximo = gerador.calcular_maximo_palavras()
+    # Calcula e exibe a quantidade máxima de palavras distintas possíveis
+    maximo = gerador.calcular_palavras_unicas()
     print(f"Quantidade máxima de palavras que podem ser geradas: {maximo:,}")
     print()
     
@@ -188,25 +1602,83 @@ def main() -> None:
         quantidade = int(quantidade_input)
         if quantidade <= 0:
             print("Por favor, digite um número positivo.")
-            return
+            return 1
         if quantidade > maximo:
             print(f"Erro: Você solicitou {quantidade:,} palavras, mas o máximo possível é {maximo:,}.")
             print(f"Por favor, digite um número entre 1 e {maximo:,}.")
-            return
+            return 1
     except ValueError:
         print("Por favor, digite um número válido.")
-        return
+        return 1
     
-    # Gera as palavras
-    palavras = gerador.gerar_multiplas(quantidade)
+    # Gera as palavras, sem repetições
+    palavras = gerador.gerar_multiplas(quantidade, unicas=True)
     
-    # Exibe as palavras geradas
+    # Exibe as palavras geradas de uma só vez
     print()
     print("Palavras geradas:")
-    for palavra in palavras:
-        print(palavra)
+    print('\n'.join(palavras))
+    return 0
 
 
-if __name__ == "__main__":
-    main()
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Função principal do programa.
+    
+    Com --count, gera as palavras sem interação e as grava em fluxo, em
+    blocos, na saída padrão ou em um arquivo. Sem --count, pergunta ao
+    usuário quantas palavras criar.
+    
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv[1:])
+        
+    Returns:
+        Código de saída do programa
+    """
+    parser = argparse.ArgumentParser(
+        description='Gera palavras proparoxítonas que podem ser apelidos para "égera".'
+    )
+    parser.add_argument('-n', '--count', type=int, default=None,
+                        help='quantidade de palavras (sem esta opção, o programa é interativo)')
+    parser.add_argument('-u', '--unique', action='store_true',
+                        help='não repete palavras')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='semente do gerador aleatório, para reproduzir a saída')
+    parser.add_argument('-f', '--format', choices=sorted(FORMATOS), default=None,
+                        help='formato da saída (padrão: pela extensão de --output, ou txt)')
+    parser.add_argument('-o', '--output', default=None,
+                        help="arquivo de saída, opcionalmente .gz (padrão: '-', a saída padrão)")
+    args = parser.parse_args(argv)
+    
+    gerador = GeradorEgera(semente=args.seed)
+    if args.count is None:
+        return _main_interativo(gerador)
+    
+    if args.count < 0:
+        parser.error("--count deve ser um número não negativo")
+    if args.unique and args.count > gerador.calcular_palavras_unicas():
+        parser.error(
+            f"--count {args.count:,} excede as {gerador.calcular_palavras_unicas():,} palavras únicas"
+        )
+    formato = args.format
+    if formato is None:
+        if args.output is not None and args.output != '-':
+            try:
+                formato = formato_do_arquivo(args.output)
+            except ValueError as erro:
+                parser.error(str(erro))
+        else:
+            formato = 'txt'
+    
+    try:
+        _gravar_em_lote(gerador, args, formato)
+    except BrokenPipeError:
+        # O leitor fechou o pipe (ex.: `| head`): encerra sem mensagem de erro
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
 
+
+if __name__ == "__main__":
+    sys.exit(main())
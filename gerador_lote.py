@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de geração em lote com NumPy.
+
+Sorteia os índices das sílabas de milhões de palavras de uma só vez e
+mantém o resultado como uma matriz compacta de códigos, convertendo em
+texto apenas quando solicitado.
+
+NumPy é uma dependência deste módulo (listada em requirements.txt); o
+restante do projeto não depende dele.
+"""
+
+from functools import reduce
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from gerador import GeradorEgera
+
+
+def _tipo_codigo(tamanho: int) -> type:
+    """Menor tipo inteiro sem sinal capaz de indexar uma tabela de `tamanho` sílabas."""
+    for tipo in (np.uint8, np.uint16, np.uint32):
+        if tamanho - 1 <= np.iinfo(tipo).max:
+            return tipo
+    return np.uint64
+
+
+class LoteCodigos:
+    """
+    Lote de palavras representado por índices de sílabas.
+
+    Cada linha de `codigos` contém, para uma palavra, o índice de cada
+    sílaba nas tabelas deduplicadas do gerador, no menor tipo inteiro
+    que comporta a maior tabela (uint8, uint16 ou uint32).
+    """
+
+    def __init__(self, codigos: np.ndarray, tabelas: List[np.ndarray]):
+        self.codigos = codigos
+        self.tabelas = tabelas
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+    def __getitem__(self, posicao: int) -> str:
+        return ''.join(
+            str(tabela[codigo]) for tabela, codigo in zip(self.tabelas, self.codigos[posicao])
+        )
+
+    def palavras(self) -> List[str]:
+        """
+        Converte o lote inteiro em palavras.
+
+        Returns:
+            Lista de palavras, na ordem do lote
+        """
+        if not len(self.codigos):
+            return []
+        colunas = (tabela[self.codigos[:, p]] for p, tabela in enumerate(self.tabelas))
+        return reduce(np.char.add, colunas).tolist()
+
+
+class GeradorLote:
+    """
+    Gerador vetorizado de palavras proparoxítonas.
+
+    Reproduz a distribuição de `GeradorEgera.gerar_palavra` (sorteio
+    com os pesos de cada sílaba, pelas mesmas tabelas de alias), mas
+    sorteia todas as sílabas de um lote com operações vetorizadas.
+    """
+
+    def __init__(self, gerador: Optional[GeradorEgera] = None, semente: Optional[int] = None):
+        """
+        Args:
+            gerador: Gerador cujas sílabas serão usadas (padrão: GeradorEgera())
+            semente: Semente do gerador de números aleatórios (padrão: derivada
+                do gerador aleatório de `gerador`, reprodutível se ele tiver semente)
+        """
+        self.gerador = gerador if gerador is not None else GeradorEgera()
+        if semente is None:
+            semente = self.gerador._rng.getrandbits(128)
+        self._rng = np.random.default_rng(semente)
+
+        inventario = self.gerador.inventario
+        self._dtype = _tipo_codigo(max(len(tabela) for tabela in inventario.tabelas))
+
+        # Probabilidades e aliases de cada posição, já nos índices das tabelas
+        self._alias = [
+            (
+                np.array(sorteador.probabilidades, dtype=np.float64),
+                np.array(sorteador.aliases, dtype=self._dtype),
+            )
+            for sorteador in inventario.sorteadores
+        ]
+        self.tabelas = [np.array(tabela) for tabela in inventario.tabelas]
+
+    def gerar(self, quantidade: int) -> LoteCodigos:
+        """
+        Sorteia um lote de palavras.
+
+        Args:
+            quantidade: Número de palavras do lote
+
+        Returns:
+            Lote com os códigos das palavras sorteadas
+        """
+        codigos = np.empty((quantidade, len(self._alias)), dtype=self._dtype)
+        for posicao, (probabilidades, aliases) in enumerate(self._alias):
+            # Um único número por sílaba: a parte inteira escolhe a coluna e
+            # a fracionária decide entre a sílaba da coluna e o seu alias
+            x = self._rng.random(quantidade) * len(probabilidades)
+            colunas = x.astype(np.intp)
+            aceitas = (x - colunas) < probabilidades[colunas]
+            codigos[:, posicao] = np.where(aceitas, colunas, aliases[colunas])
+        return LoteCodigos(codigos, self.tabelas)
+
+    def gerar_blocos(self, quantidade: int, tamanho_bloco: int = 1_000_000) -> Iterator[LoteCodigos]:
+        """
+        Sorteia `quantidade` palavras em lotes de tamanho limitado.
+
+        Args:
+            quantidade: Número total de palavras
+            tamanho_bloco: Número máximo de palavras por lote
+
+        Yields:
+            Lotes com os códigos das palavras sorteadas
+        """
+        while quantidade > 0:
+            atual = min(quantidade, tamanho_bloco)
+            yield self.gerar(atual)
+            quantidade -= atual
+
+    def gerar_palavras(self, quantidade: int) -> List[str]:
+        """
+        Sorteia um lote de palavras e o converte em texto.
+
+        Args:
+            quantidade: Número de palavras a gerar
+
+        Returns:
+            Lista de palavras geradas
+        """
+        return self.gerar(quantidade).palavras()
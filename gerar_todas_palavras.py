@@ -4,37 +4,317 @@
 Script para gerar todas as palavras possíveis do gerador.
 
 Gera todas as combinações possíveis de palavras proparoxítonas
-e salva em arquivo TXT com uma palavra por linha.
+e salva em arquivos TXT e CSV, em ordem aleatória.
+
+A exportação é feita em fluxo: as palavras são produzidas sob demanda
+e gravadas em blocos, em todos os formatos ao mesmo tempo, sem manter
+a lista completa em memória.
+
+O TXT funciona como cache: se as sílabas não mudaram desde a última
+execução, nada é refeito; se sílabas foram acrescentadas ou retiradas,
+só a diferença é calculada e aplicada (veja cache_lexico.py). O CSV e
+o léxico binário acompanham o TXT: palavras novas são anexadas aos dois,
+e só remoções os regravam. Use --completo para gerar o léxico do zero.
+
+Com --ordenado o léxico é gravado em ordem alfabética: cada sílaba tônica
+forma uma fatia ordenada à parte, gravada já no formato final, e as
+fatias são concatenadas ao final. Com --processos as fatias são ordenadas
+e gravadas por processos separados, com o mesmo resultado da versão
+sequencial.
 """
+import argparse
+import gzip
+import heapq
+import io
+import os
 import random
-from gerador import GeradorEgera
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from typing import Iterable, List, Optional, Sequence, TextIO, Tuple
+
+from cache_lexico import AtualizacaoLexico, CacheLexico
+from formatos import CABECALHOS, FORMATOS, formato_do_arquivo
+from gerador import GeradorEgera, InventarioCompilado, compilar_inventario
+from lexico import LexicoBinario, anexar_lexico_binario, escrever_lexico_binario
+
+
+def _abrir(caminho: str, modo: str = 'w') -> TextIO:
+    if caminho.endswith('.gz'):
+        return gzip.open(caminho, modo + 't', encoding='utf-8', newline='')
+    return open(caminho, modo, encoding='utf-8', newline='', buffering=io.DEFAULT_BUFFER_SIZE * 16)
+
+
+def exportar_palavras(
+    palavras: Iterable[str],
+    caminhos: Sequence[str],
+    tamanho_bloco: int = 10_000,
+    anexar: bool = False,
+) -> int:
+    """
+    Grava as palavras em um ou mais arquivos em uma única passagem.
+
+    O formato de cada arquivo é definido pela extensão (.txt, .csv, .jsonl),
+    e a compressão gzip é usada quando o nome termina em '.gz'. As palavras
+    são consumidas em blocos de até `tamanho_bloco`, então a memória usada
+    não depende do total de palavras.
+
+    Args:
+        palavras: Iterável com as palavras a exportar
+        caminhos: Arquivos de saída
+        tamanho_bloco: Número máximo de palavras mantidas em memória
+        anexar: Acrescenta as palavras ao final de arquivos já exportados,
+            sem repetir o cabeçalho
+
+    Returns:
+        Quantidade de palavras exportadas
+    """
+    formatos = [formato_do_arquivo(caminho) for caminho in caminhos]
+    arquivos = []
+    total = 0
+    try:
+        for caminho, formato in zip(caminhos, formatos):
+            arquivo = _abrir(caminho, 'a' if anexar else 'w')
+            arquivos.append(arquivo)
+            if not anexar:
+                arquivo.write(CABECALHOS.get(formato, ''))
+
+        iterador = iter(palavras)
+        while True:
+            bloco = list(islice(iterador, tamanho_bloco))
+            if not bloco:
+                break
+            for arquivo, formato in zip(arquivos, formatos):
+                FORMATOS[formato](bloco, arquivo)
+            total += len(bloco)
+    finally:
+        for arquivo in arquivos:
+            arquivo.close()
+    return total
+
+
+def _agrupar_tonicas(tonicas: Sequence[str]) -> List[List[str]]:
+    """
+    Agrupa as sílabas tônicas cujas palavras podem se intercalar na ordem.
+
+    Todas as palavras de uma fatia começam pela sua tônica, então fatias de
+    tônicas em que nenhuma é prefixo da outra ocupam intervalos disjuntos.
+    Na ordem alfabética, as tônicas que começam por uma tônica vêm logo
+    depois dela, e cada grupo é uma tônica seguida dessas extensões.
+    """
+    grupos: List[List[str]] = []
+    for tonica in sorted(tonicas):
+        if grupos and tonica.startswith(grupos[-1][0]):
+            grupos[-1].append(tonica)
+        else:
+            grupos.append([tonica])
+    return grupos
+
+
+def _gravar_trecho(palavras: List[str], caminho: str, formato: str, comprimir: bool) -> None:
+    # Sem cabeçalho, e em gzip sem nome nem data, para que os trechos possam
+    # ser concatenados e o resultado não dependa de quando foi gerado
+    with open(caminho, 'wb') as bruto:
+        saida = gzip.GzipFile(filename='', mode='wb', fileobj=bruto, mtime=0) if comprimir else bruto
+        with io.TextIOWrapper(saida, encoding='utf-8', newline='') as arquivo:
+            FORMATOS[formato](palavras, arquivo)
+
+
+def _ordenar_fatia(
+    numero: int,
+    fatias: Sequence[Tuple[Tuple[str, ...], ...]],
+    saidas: Sequence[Tuple[str, bool]],
+    diretorio: str,
+) -> Tuple[int, List[str]]:
+    """
+    Ordena as palavras de um grupo de fatias e grava o trecho de cada saída.
+
+    Cada fatia é compilada como um subinventário próprio, então o processo
+    não depende de nenhum estado calculado sobre o léxico inteiro. As fatias
+    do grupo são intercaladas sem repetições e gravadas já no formato final
+    de cada saída (pares formato e compressão), prontas para concatenar.
+
+    Returns:
+        Quantidade de palavras do grupo e caminhos dos trechos, na ordem das saídas
+    """
+    ordenadas = [sorted(compilar_inventario(*posicoes)) for posicoes in fatias]
+    palavras = [palavra for palavra, _ in groupby(heapq.merge(*ordenadas))]
+    del ordenadas
+    caminhos = []
+    for indice, (formato, comprimir) in enumerate(saidas):
+        caminho = os.path.join(diretorio, f'fatia_{numero:06d}_{indice}.{formato}')
+        _gravar_trecho(palavras, caminho, formato, comprimir)
+        caminhos.append(caminho)
+    return len(palavras), caminhos
+
+
+def exportar_ordenado(
+    gerador: GeradorEgera,
+    caminhos: Sequence[str],
+    processos: Optional[int] = None,
+) -> int:
+    """
+    Grava todas as palavras únicas em ordem alfabética.
 
+    O léxico é dividido em fatias, uma por sílaba tônica: cada fatia é um
+    subinventário com uma única tônica e as demais posições completas.
+    Fatias cujas palavras podem se intercalar (uma tônica prefixo de outra)
+    formam um grupo; os grupos ocupam intervalos disjuntos da ordem final.
+    Cada grupo é enumerado, ordenado, livre de repetições e gravado em
+    trechos já no formato de cada saída, e o processo principal só copia os
+    trechos em sequência. Só um grupo por processo fica em memória, e com
+    mais de um processo os grupos são distribuídos em um pool. O resultado
+    é idêntico, byte a byte, com qualquer número de processos.
 
-def main() -> None:
+    Args:
+        gerador: Gerador cujas palavras serão exportadas
+        caminhos: Arquivos de saída (mesmos formatos de `exportar_palavras`)
+        processos: Número de processos (padrão: os.cpu_count(); 1 = sequencial)
+
+    Returns:
+        Quantidade de palavras exportadas
+
+    Raises:
+        ValueError: Se `processos` for menor que 1
+    """
+    if processos is None:
+        processos = os.cpu_count() or 1
+    elif processos < 1:
+        raise ValueError("O número de processos deve ser pelo menos 1")
+
+    saidas = [(formato_do_arquivo(caminho), caminho.endswith('.gz')) for caminho in caminhos]
+    posicoes = gerador.inventario.posicoes
+    grupos = [
+        [((tonica,),) + posicoes[1:] for tonica in grupo]
+        for grupo in _agrupar_tonicas(gerador.inventario.tabelas[0])
+    ]
+
+    with tempfile.TemporaryDirectory(prefix='lexico_') as diretorio:
+        argumentos = (range(len(grupos)), grupos, [saidas] * len(grupos), [diretorio] * len(grupos))
+        if processos == 1:
+            trechos = list(map(_ordenar_fatia, *argumentos))
+        else:
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                trechos = list(executor.map(_ordenar_fatia, *argumentos))
+
+        for indice, (caminho, (formato, comprimir)) in enumerate(zip(caminhos, saidas)):
+            with open(caminho, 'wb') as saida:
+                cabecalho = CABECALHOS.get(formato, '').encode('utf-8')
+                if cabecalho:
+                    saida.write(gzip.compress(cabecalho, mtime=0) if comprimir else cabecalho)
+                for _, arquivos in trechos:
+                    with open(arquivos[indice], 'rb') as trecho:
+                        shutil.copyfileobj(trecho, saida, 1 << 20)
+        return sum(quantidade for quantidade, _ in trechos)
+
+
+def _tamanho_lexico_binario(caminho: str) -> Optional[int]:
+    try:
+        with LexicoBinario(caminho) as lexico:
+            return len(lexico)
+    except (OSError, ValueError):
+        return None
+
+
+def atualizar_derivados(
+    atualizacao: AtualizacaoLexico,
+    cache: CacheLexico,
+    inventario: InventarioCompilado,
+    arquivo_csv: str,
+    arquivo_bin: str,
+) -> bool:
+    """
+    Leva ao CSV e ao léxico binário a sincronização aplicada ao TXT do cache.
+
+    Palavras apenas acrescentadas são anexadas ao final dos dois arquivos.
+    Palavras removidas exigem regravar os dois a partir do TXT, assim como
+    arquivos ausentes ou um léxico binário com outra quantidade de palavras
+    ou sem espaço para as sílabas novas.
+
+    Args:
+        atualizacao: Resultado de `cache.sincronizar`
+        cache: Cache cujo TXT os derivados acompanham
+        inventario: Inventário atual do gerador
+        arquivo_csv: CSV derivado do TXT
+        arquivo_bin: Léxico binário derivado do TXT
+
+    Returns:
+        True se os arquivos foram regravados por completo
+    """
+    existentes = os.path.exists(arquivo_csv) and os.path.exists(arquivo_bin)
+    if atualizacao.situacao == 'acerto' and existentes:
+        return False
+    if atualizacao.situacao == 'incremental' and not atualizacao.removidas and existentes:
+        anteriores = atualizacao.total - len(atualizacao.adicionadas)
+        if _tamanho_lexico_binario(arquivo_bin) == anteriores:
+            try:
+                anexar_lexico_binario(arquivo_bin, inventario, atualizacao.adicionadas)
+            except ValueError:
+                pass
+            else:
+                exportar_palavras(atualizacao.adicionadas, [arquivo_csv], anexar=True)
+                return False
+    exportar_palavras(cache.palavras(), [arquivo_csv])
+    escrever_lexico_binario(arquivo_bin, inventario, cache.palavras())
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     """Função principal do script."""
+    parser = argparse.ArgumentParser(description='Gera todas as palavras possíveis do gerador.')
+    parser.add_argument('--ordenado', action='store_true',
+                        help='grava as palavras em ordem alfabética, em vez de aleatória')
+    parser.add_argument('--processos', type=int, default=None,
+                        help='processos usados com --ordenado (padrão: número de CPUs)')
+    parser.add_argument('--completo', action='store_true',
+                        help='ignora o cache e gera o léxico do zero')
+    args = parser.parse_args(argv)
+    if args.processos is not None and args.processos < 1:
+        parser.error("--processos deve ser pelo menos 1")
+
     gerador = GeradorEgera()
-    
+
     print("Gerando todas as palavras possíveis...")
-    
-    # Gera todas as palavras possíveis usando o método da classe
-    palavras_unicas = gerador.gerar_todas_palavras_possiveis()
-    
-    # Embaralha em ordem aleatória
-    random.shuffle(palavras_unicas)
-    
-    # Salva em arquivo TXT com uma palavra por linha
+
     arquivo_txt = 'palavras_completas.txt'
-    with open(arquivo_txt, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(palavras_unicas))
-    
+    arquivo_csv = 'palavras_completas.csv'
+    arquivo_bin = 'palavras_completas.bin'
+
+    if args.ordenado:
+        CacheLexico(arquivo_txt).invalidar()
+        total = exportar_ordenado(gerador, [arquivo_txt, arquivo_csv], args.processos)
+        # O léxico binário também é regravado a partir do TXT, para não ficar
+        # com a ordem e as sílabas de uma exportação anterior
+        with open(arquivo_txt, 'r', encoding='utf-8') as palavras:
+            escrever_lexico_binario(arquivo_bin, gerador.inventario, map(str.rstrip, palavras))
+        print(f"✓ Total de palavras geradas: {total:,}")
+        print(f"✓ Arquivos salvos: {arquivo_txt}, {arquivo_csv}, {arquivo_bin} (em ordem alfabética)")
+        return
+
+    # O TXT é o léxico em cache: com as mesmas sílabas nada é refeito, e com
+    # sílabas novas ou retiradas só a diferença é aplicada, sem reembaralhar
+    cache = CacheLexico(arquivo_txt)
+    atualizacao = cache.sincronizar(gerador, semente=random.randrange(2 ** 32), completo=args.completo)
+    total = atualizacao.total
+
+    # O CSV e o léxico binário seguem a ordem do TXT
+    atualizar_derivados(atualizacao, cache, gerador.inventario, arquivo_csv, arquivo_bin)
+
     maximo_teorico = gerador.calcular_maximo_palavras()
-    
-    print(f"✓ Total de palavras geradas: {len(palavras_unicas):,}")
+
+    if atualizacao.situacao == 'acerto':
+        print("✓ Sílabas inalteradas: léxico reaproveitado do cache")
+    elif atualizacao.situacao == 'incremental':
+        print(f"✓ Atualização incremental: {len(atualizacao.adicionadas):,} palavras adicionadas, "
+              f"{len(atualizacao.removidas):,} removidas")
+    print(f"✓ Total de palavras geradas: {total:,}")
     print(f"✓ Máximo teórico: {maximo_teorico:,}")
-    print(f"✓ Duplicatas removidas: {maximo_teorico - len(palavras_unicas):,}")
+    print(f"✓ Duplicatas removidas: {maximo_teorico - total:,}")
     print(f"✓ Arquivo TXT salvo: {arquivo_txt} (uma palavra por linha, em ordem aleatória)")
+    print(f"✓ Arquivo CSV salvo: {arquivo_csv} (com cabeçalho, em ordem aleatória)")
+    print(f"✓ Léxico binário salvo: {arquivo_bin} (mesma ordem do TXT, para acesso via mmap)")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentação opcional dos métodos mais usados do gerador.
+
+`Instrumentacao.instrumentar(gerador)` troca a classe da instância por uma
+subclasse que conta as chamadas e mede o tempo de cada método de
+`METODOS`. Os geradores não instrumentados continuam usando a classe
+original, então a medição não custa nada quando está desligada. Além dos
+tempos, são contadas as palavras geradas, as que já tinham saído antes
+(duplicatas) e as palavras rejeitadas pela validação.
+
+Os números podem ser lidos a qualquer momento com `resumo()` (um dicionário
+pronto para JSON), `texto()` ou `exportar(caminho)`, inclusive de outra
+thread enquanto o gerador é usado.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Iterator
+
+from gerador import GeradorEgera
+
+# Métodos instrumentados
+METODOS = (
+    'gerar_palavra',
+    'gerar_multiplas',
+    'gerar_todas_palavras_possiveis',
+    'adicionar_acento',
+    'validar_proparoxitona',
+    'validar_lote',
+)
+
+
+class _Tempo:
+    """Chamadas e tempo acumulado de um ponto medido."""
+
+    __slots__ = ('chamadas', 'total_ns', 'maximo_ns')
+
+    def __init__(self):
+        self.chamadas = 0
+        self.total_ns = 0
+        self.maximo_ns = 0
+
+
+class Instrumentacao:
+    """
+    Contadores e cronômetros compartilhados por um ou mais geradores.
+
+    As chamadas de um método instrumentado dentro de outro (por exemplo,
+    `gerar_palavra` dentro de `gerar_multiplas`) entram nos tempos dos dois,
+    mas as palavras e as rejeições são apuradas só na chamada mais externa.
+    As duplicatas são verificadas contra todas as palavras já geradas, que
+    ficam em um conjunto limitado ao tamanho do léxico.
+    """
+
+    def __init__(self, contar_duplicatas: bool = True):
+        """
+        Args:
+            contar_duplicatas: Guarda as palavras geradas para contar as
+                repetidas (padrão: True)
+        """
+        self.contar_duplicatas = contar_duplicatas
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self._classes: Dict[type, type] = {}
+        self.zerar()
+
+    def zerar(self) -> None:
+        """Zera todos os contadores e tempos."""
+        with self._trava:
+            self._tempos: Dict[str, _Tempo] = {}
+            self._contadores: Dict[str, int] = {}
+            self._vistas: set = set()
+            self.palavras_geradas = 0
+            self.duplicatas = 0
+            self.rejeicoes = 0
+
+    # Pontos de medição
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        """
+        Soma `quantidade` a um contador livre.
+
+        Args:
+            nome: Nome do contador
+            quantidade: Valor a somar
+        """
+        with self._trava:
+            self._contadores[nome] = self._contadores.get(nome, 0) + quantidade
+
+    def _registrar_tempo(self, nome: str, duracao_ns: int) -> None:
+        with self._trava:
+            tempo = self._tempos.get(nome)
+            if tempo is None:
+                tempo = self._tempos[nome] = _Tempo()
+            tempo.chamadas += 1
+            tempo.total_ns += duracao_ns
+            if duracao_ns > tempo.maximo_ns:
+                tempo.maximo_ns = duracao_ns
+
+    @contextmanager
+    def cronometrar(self, nome: str) -> Iterator[None]:
+        """
+        Mede o tempo de um bloco de código.
+
+        Args:
+            nome: Nome do ponto medido, somado aos tempos com o mesmo nome
+        """
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._registrar_tempo(nome, time.perf_counter_ns() - inicio)
+
+    def registrar_palavras(self, palavras: Iterable[str]) -> None:
+        """
+        Conta palavras geradas e, entre elas, as que já tinham saído antes.
+
+        Args:
+            palavras: Palavras geradas
+        """
+        with self._trava:
+            if not self.contar_duplicatas:
+                self.palavras_geradas += sum(1 for _ in palavras)
+                return
+            vistas = self._vistas
+            antes = len(vistas)
+            total = 0
+            for palavra in palavras:
+                vistas.add(palavra)
+                total += 1
+            self.palavras_geradas += total
+            self.duplicatas += total - (len(vistas) - antes)
+
+    def registrar_rejeicoes(self, quantidade: int = 1) -> None:
+        """
+        Conta palavras rejeitadas pela validação.
+
+        Args:
+            quantidade: Número de rejeições
+        """
+        with self._trava:
+            self.rejeicoes += quantidade
+
+    # Geradores
+
+    def _apurar(self, nome: str, resultado: object) -> None:
+        if nome == 'gerar_palavra':
+            self.registrar_palavras((resultado,))
+        elif nome == 'gerar_multiplas':
+            self.registrar_palavras(resultado)
+        elif nome == 'validar_proparoxitona':
+            if not resultado:
+                self.registrar_rejeicoes()
+        elif nome == 'validar_lote':
+            self.registrar_rejeicoes(resultado.total - resultado.validas)
+
+    def _envolver(self, nome: str, metodo: Callable) -> Callable:
+        local = self._local
+        registrar_tempo = self._registrar_tempo
+        apurar = self._apurar
+
+        @wraps(metodo)
+        def envolvido(gerador, *args, **kwargs):
+            profundidade = getattr(local, 'profundidade', 0)
+            local.profundidade = profundidade + 1
+            inicio = time.perf_counter_ns()
+            try:
+                resultado = metodo(gerador, *args, **kwargs)
+            finally:
+                registrar_tempo(nome, time.perf_counter_ns() - inicio)
+                local.profundidade = profundidade
+            if profundidade == 0:
+                apurar(nome, resultado)
+            return resultado
+        return envolvido
+
+    def instrumentar(self, gerador: GeradorEgera) -> GeradorEgera:
+        """
+        Passa a medir os métodos de `METODOS` de um gerador.
+
+        Os geradores criados depois com `gerador.derivar()` também ficam
+        instrumentados, com os mesmos contadores. Um gerador instrumentado
+        não pode ser serializado com pickle; use `remover` antes.
+
+        Args:
+            gerador: Gerador a instrumentar
+
+        Returns:
+            O próprio gerador
+
+        Raises:
+            ValueError: Se o gerador já estiver instrumentado por outra
+                instância de Instrumentacao
+        """
+        atual = getattr(gerador, '_instrumentacao', None)
+        if atual is self:
+            return gerador
+        if atual is not None:
+            raise ValueError("O gerador já está instrumentado por outra Instrumentacao")
+        classe = type(gerador)
+        instrumentada = self._classes.get(classe)
+        if instrumentada is None:
+            atributos = {nome: self._envolver(nome, getattr(classe, nome)) for nome in METODOS}
+            atributos.update(_instrumentacao=self, __module__=classe.__module__, __qualname__=classe.__qualname__)
+            instrumentada = self._classes[classe] = type(classe.__name__, (classe,), atributos)
+        gerador.__class__ = instrumentada
+        return gerador
+
+    def remover(self, gerador: GeradorEgera) -> GeradorEgera:
+        """
+        Devolve o gerador à classe original, sem medição.
+
+        Args:
+            gerador: Gerador instrumentado por esta instância
+
+        Returns:
+            O próprio gerador
+        """
+        if getattr(gerador, '_instrumentacao', None) is self:
+            gerador.__class__ = type(gerador).__mro__[1]
+        return gerador
+
+    # Leitura
+
+    def resumo(self) -> dict:
+        """
+        Retorna um retrato dos contadores, pronto para JSON.
+
+        Returns:
+            Dicionário com 'tempos' (chamadas, total, média e máximo em
+            microssegundos por ponto medido), 'contadores', 'palavras_geradas',
+            'duplicatas' e 'rejeicoes'
+        """
+        with self._trava:
+            tempos = {
+                nome: {
+                    'chamadas': tempo.chamadas,
+                    'total_us': tempo.total_ns / 1000,
+                    'media_us': tempo.total_ns / tempo.chamadas / 1000,
+                    'maximo_us': tempo.maximo_ns / 1000,
+                }
+                for nome, tempo in sorted(self._tempos.items())
+            }
+            return {
+                'tempos': tempos,
+                'contadores': dict(sorted(self._contadores.items())),
+                'palavras_geradas': self.palavras_geradas,
+                'duplicatas': self.duplicatas,
+                'rejeicoes': self.rejeicoes,
+            }
+
+    def texto(self) -> str:
+        """Formata o resumo como uma tabela legível."""
+        resumo = self.resumo()
+        linhas = [f"{'ponto medido':<32} {'chamadas':>10} {'total (ms)':>12} "
+                  f"{'média (µs)':>12} {'máximo (µs)':>12}"]
+        for nome, tempo in resumo['tempos'].items():
+            linhas.append(
+                f"{nome:<32} {tempo['chamadas']:>10,} {tempo['total_us'] / 1000:>12,.2f} "
+                f"{tempo['media_us']:>12,.2f} {tempo['maximo_us']:>12,.2f}"
+            )
+        for nome, valor in resumo['contadores'].items():
+            linhas.append(f"{nome:<32} {valor:>10,}")
+        linhas.append(f"Palavras geradas: {resumo['palavras_geradas']:,}")
+        linhas.append(f"Duplicatas: {resumo['duplicatas']:,}")
+        linhas.append(f"Rejeições: {resumo['rejeicoes']:,}")
+        return '\n'.join(linhas)
+
+    def exportar(self, caminho: str) -> None:
+        """
+        Grava o resumo em um arquivo JSON.
+
+        Args:
+            caminho: Arquivo de saída
+        """
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.resumo(), arquivo, ensure_ascii=False, indent=2)
+
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Representações compactas do léxico.
+
+`LexicoCompacto` guarda as palavras em memória como índices de sílabas
+empacotados em um `array`. `LexicoBinario` lê o mesmo tipo de registro
+de um arquivo mapeado em memória.
+
+O arquivo binário guarda um registro de largura fixa por palavra com os
+índices das suas sílabas e, depois dos registros, as tabelas de sílabas,
+uma única vez. O carregamento mapeia o arquivo em memória e decodifica cada
+palavra apenas quando ela é acessada. Como as tabelas ficam no final, novas
+palavras podem ser anexadas sem regravar os registros existentes (veja
+`anexar_lexico_binario`).
+
+Layout (inteiros little-endian):
+
+    cabeçalho    magic (8 bytes), versão (u16), posições (u8),
+                 bytes por índice (u8), quantidade de palavras (u64),
+                 início das tabelas (u64)
+    registros    quantidade × posições índices de 1, 2 ou 4 bytes
+    tabelas      para cada posição: quantidade de sílabas (u32) e, para
+                 cada sílaba, tamanho em bytes (u16) seguido do UTF-8
+"""
+
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from gerador import InventarioCompilado, compilar_inventario
+
+MAGIC = b'EGERALEX'
+VERSAO = 3
+_CABECALHO = struct.Struct('<8sHBBQQ')
+_FORMATO_INDICE = {1: 'B', 2: 'H', 4: 'I'}
+_TAMANHO_TABELA = struct.Struct('<I')
+_TAMANHO_SILABA = struct.Struct('<H')
+
+# Registros copiados do mapa de cada vez durante a iteração
+_REGISTROS_POR_BLOCO = 65_536
+
+
+def _largura(tabelas: Tuple[Tuple[str, ...], ...]) -> int:
+    """
+    Menor largura, em bytes, capaz de guardar o maior índice das tabelas.
+
+    Raises:
+        ValueError: Se nenhuma largura do formato comportar as tabelas
+    """
+    maior = max(len(tabela) for tabela in tabelas) - 1
+    for largura in _FORMATO_INDICE:
+        if maior < 1 << (8 * largura):
+            return largura
+    raise ValueError("As tabelas de sílabas são grandes demais para o léxico binário")
+
+
+def _codificar_tabelas(tabelas: Tuple[Tuple[str, ...], ...]) -> bytes:
+    """
+    Codifica as tabelas de sílabas no layout do final do arquivo.
+
+    Raises:
+        ValueError: Se alguma sílaba passar de 65535 bytes em UTF-8
+    """
+    partes = []
+    for tabela in tabelas:
+        partes.append(_TAMANHO_TABELA.pack(len(tabela)))
+        for silaba in tabela:
+            codificada = silaba.encode('utf-8')
+            if len(codificada) > 0xFFFF:
+                raise ValueError(f"Sílaba longa demais para o léxico binário ({len(codificada)} bytes)")
+            partes.append(_TAMANHO_SILABA.pack(len(codificada)) + codificada)
+    return b''.join(partes)
+
+
+def _ler_tabelas(dados, posicao: int, num_posicoes: int) -> Tuple[Tuple[Tuple[str, ...], ...], int]:
+    """Decodifica as tabelas a partir de `posicao`; retorna as tabelas e o fim delas."""
+    tabelas = []
+    for _ in range(num_posicoes):
+        (tamanho,) = _TAMANHO_TABELA.unpack_from(dados, posicao)
+        posicao += _TAMANHO_TABELA.size
+        tabela = []
+        for _ in range(tamanho):
+            (comprimento,) = _TAMANHO_SILABA.unpack_from(dados, posicao)
+            posicao += _TAMANHO_SILABA.size
+            tabela.append(bytes(dados[posicao:posicao + comprimento]).decode('utf-8'))
+            posicao += comprimento
+        tabelas.append(tuple(tabela))
+    return tuple(tabelas), posicao
+
+
+def _gravar_registros(
+    arquivo: BinaryIO,
+    inventario: InventarioCompilado,
+    palavras: Iterable[str],
+    registro: struct.Struct,
+    tamanho_bloco: int,
+) -> int:
+    """Grava um registro por palavra na posição atual do arquivo; retorna a quantidade."""
+    total = 0
+    iterador = iter(palavras)
+    while True:
+        bloco = list(islice(iterador, tamanho_bloco))
+        if not bloco:
+            break
+        arquivo.write(b''.join(
+            registro.pack(*inventario.tupla_canonica(palavra)) for palavra in bloco
+        ))
+        total += len(bloco)
+    return total
+
+
+def escrever_lexico_binario(
+    caminho: str,
+    inventario: InventarioCompilado,
+    palavras: Iterable[str],
+    tamanho_bloco: int = 65_536,
+) -> int:
+    """
+    Grava palavras no formato binário, na ordem em que forem fornecidas.
+
+    Cada palavra é gravada como a sua combinação canônica de sílabas, então
+    o arquivo ocupa um registro de poucos bytes por palavra.
+
+    Args:
+        caminho: Arquivo de saída
+        inventario: Inventário cujas tabelas serão gravadas no arquivo
+        palavras: Palavras a gravar, todas formáveis com o inventário
+        tamanho_bloco: Número de palavras convertidas por escrita
+
+    Returns:
+        Quantidade de palavras gravadas
+
+    Raises:
+        ValueError: Se alguma palavra não puder ser formada com o inventário,
+            ou se as tabelas não couberem no formato (mais de 2³² sílabas em
+            uma posição ou uma sílaba com mais de 65535 bytes)
+    """
+    # As tabelas são validadas antes de qualquer registro ser gravado
+    largura = _largura(inventario.tabelas)
+    tabelas = _codificar_tabelas(inventario.tabelas)
+    num_posicoes = len(inventario.tabelas)
+    registro = struct.Struct('<' + _FORMATO_INDICE[largura] * num_posicoes)
+
+    with open(caminho, 'wb') as arquivo:
+        # A quantidade e o início das tabelas são reescritos no final
+        arquivo.write(_CABECALHO.pack(MAGIC, VERSAO, num_posicoes, largura, 0, 0))
+        total = _gravar_registros(arquivo, inventario, palavras, registro, tamanho_bloco)
+        inicio_tabelas = arquivo.tell()
+        arquivo.write(tabelas)
+        arquivo.seek(0)
+        arquivo.write(_CABECALHO.pack(MAGIC, VERSAO, num_posicoes, largura, total, inicio_tabelas))
+    return total
+
+
+def anexar_lexico_binario(
+    caminho: str,
+    inventario: InventarioCompilado,
+    palavras: Iterable[str],
+    tamanho_bloco: int = 65_536,
+) -> int:
+    """
+    Acrescenta palavras ao final de um léxico binário, sem regravá-lo.
+
+    As sílabas do inventário que ainda não estão no arquivo entram no fim
+    de cada tabela, então os registros existentes continuam válidos; só os
+    novos registros e as tabelas, que ficam depois deles, são gravados.
+
+    Args:
+        caminho: Arquivo gravado por `escrever_lexico_binario`
+        inventario: Inventário com o qual as novas palavras são formadas
+        palavras: Palavras a acrescentar
+        tamanho_bloco: Número de palavras convertidas por escrita
+
+    Returns:
+        Quantidade total de palavras no arquivo
+
+    Raises:
+        ValueError: Se o arquivo não for um léxico binário da versão atual
+            com o mesmo número de posições, se as tabelas ampliadas não
+            couberem na largura dos registros ou no formato, ou se alguma
+            palavra não puder ser formada; nesses casos o léxico precisa ser
+            regravado
+    """
+    with open(caminho, 'r+b') as arquivo:
+        cabecalho = arquivo.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size:
+            raise ValueError("Arquivo curto demais para um léxico binário")
+        magic, versao, num_posicoes, largura, quantidade, inicio_tabelas = _CABECALHO.unpack(cabecalho)
+        if magic != MAGIC or versao != VERSAO or largura not in _FORMATO_INDICE:
+            raise ValueError("Arquivo não é um léxico binário compatível")
+        if num_posicoes != len(inventario.tabelas):
+            raise ValueError("O léxico binário tem outro número de sílabas")
+
+        arquivo.seek(inicio_tabelas)
+        tabelas, _ = _ler_tabelas(arquivo.read(), 0, num_posicoes)
+        ampliadas = tuple(
+            tabela + tuple(silaba for silaba in nova if silaba not in set(tabela))
+            for tabela, nova in zip(tabelas, inventario.tabelas)
+        )
+        if _largura(ampliadas) > largura:
+            raise ValueError("As sílabas novas não cabem nos registros do léxico binário")
+        codificadas = _codificar_tabelas(ampliadas)
+
+        # As tabelas gravadas já estão acentuadas e sem repetições
+        registro = struct.Struct('<' + _FORMATO_INDICE[largura] * num_posicoes)
+        arquivo.seek(inicio_tabelas)
+        total = quantidade + _gravar_registros(
+            arquivo, compilar_inventario(*ampliadas), palavras, registro, tamanho_bloco
+        )
+        inicio_tabelas = arquivo.tell()
+        arquivo.write(codificadas)
+        arquivo.truncate()
+        arquivo.seek(0)
+        arquivo.write(_CABECALHO.pack(MAGIC, VERSAO, num_posicoes, largura, total, inicio_tabelas))
+    return total
+
+
+class _LexicoCodificado(Sequence, ABC):
+    """
+    Base dos léxicos que guardam cada palavra como índices de sílabas.
+
+    As subclasses definem `tabelas`, `__len__`, `codigos` e
+    `_iterar_codigos`; a decodificação, as fatias e a busca por
+    pertinência ficam aqui.
+    """
+
+    tabelas: Tuple[Tuple[str, ...], ...]
+    _inventario: Optional[InventarioCompilado] = None
+    _presentes: Optional[bytearray] = None
+
+    @abstractmethod
+    def codigos(self, posicao: int) -> Tuple[int, ...]:
+        """
+        Retorna os índices das sílabas da palavra na posição informada.
+
+        Args:
+            posicao: Posição da palavra no léxico
+
+        Returns:
+            Tupla com o índice de cada sílaba em `tabelas`
+        """
+
+    @abstractmethod
+    def _iterar_codigos(self, inicio: int, fim: int) -> Iterator[Tuple[int, ...]]:
+        """Percorre os índices das sílabas das palavras nas posições [inicio, fim)."""
+
+    def _normalizar_posicao(self, posicao: int) -> int:
+        if posicao < 0:
+            posicao += len(self)
+        if not 0 <= posicao < len(self):
+            raise IndexError("Posição fora do léxico")
+        return posicao
+
+    def _decodificar(self, codigos: Tuple[int, ...]) -> str:
+        return ''.join(tabela[i] for tabela, i in zip(self.tabelas, codigos))
+
+    def __getitem__(self, posicao: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(posicao, slice):
+            inicio, fim, passo = posicao.indices(len(self))
+            if passo == 1:
+                return list(self._iterar(inicio, fim))
+            return [self[i] for i in range(inicio, fim, passo)]
+        return self._decodificar(self.codigos(posicao))
+
+    def _iterar(self, inicio: int, fim: int) -> Iterator[str]:
+        decodificar = self._decodificar
+        for codigos in self._iterar_codigos(inicio, fim):
+            yield decodificar(codigos)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._iterar(0, len(self))
+
+    @property
+    def inventario(self) -> InventarioCompilado:
+        """Inventário compilado a partir das tabelas do léxico."""
+        if self._inventario is None:
+            # As tabelas já estão acentuadas e sem repetições: compilá-las
+            # de novo produz exatamente as mesmas tabelas
+            self._inventario = compilar_inventario(*self.tabelas)
+        return self._inventario
+
+    def __contains__(self, palavra: object) -> bool:
+        """
+        Verifica se a palavra está no léxico em tempo constante.
+
+        Na primeira consulta é montado um mapa de bits sobre o espaço de
+        combinações do inventário, com um bit por combinação.
+        """
+        if not isinstance(palavra, str):
+            return False
+        inventario = self.inventario
+        decomposicoes = inventario.decompor(palavra)
+        if not decomposicoes:
+            return False
+        if self._presentes is None:
+            presentes = bytearray((inventario.total_bruto + 7) // 8)
+            multiplicadores = inventario.multiplicadores
+            for codigos in self._iterar_codigos(0, len(self)):
+                i = sum(c * m for c, m in zip(codigos, multiplicadores))
+                presentes[i >> 3] |= 1 << (i & 7)
+            self._presentes = presentes
+        # Registros anexados depois de novas sílabas podem não usar a
+        # combinação canônica das tabelas ampliadas; qualquer uma serve
+        presentes = self._presentes
+        for tupla in decomposicoes:
+            bruto = inventario._bruto(tupla)
+            if presentes[bruto >> 3] & (1 << (bruto & 7)):
+                return True
+        return False
+
+
+class LexicoCompacto(_LexicoCodificado):
+    """
+    Léxico em memória com as palavras empacotadas como índices de sílabas.
+
+    Cada palavra ocupa um byte por posição (ou dois, para tabelas com mais
+    de 256 sílabas, e quatro acima de 65536), em vez de um objeto `str`. As palavras são
+    decodificadas apenas quando acessadas.
+    """
+
+    def __init__(self, inventario: InventarioCompilado, codigos: array):
+        """
+        Args:
+            inventario: Inventário cujas tabelas os códigos referenciam
+            codigos: Índices de sílabas de todas as palavras, em sequência
+        """
+        self._inventario = inventario
+        self.tabelas = inventario.tabelas
+        self._num_posicoes = len(self.tabelas)
+        self._codigos = codigos
+
+    @staticmethod
+    def _novo_array(inventario: InventarioCompilado) -> array:
+        # Menor tipo sem sinal capaz de guardar o maior índice das tabelas
+        maior = max(len(tabela) for tabela in inventario.tabelas) - 1
+        for tipo in 'BHIL':
+            if maior < 1 << (8 * array(tipo).itemsize):
+                return array(tipo)
+        return array('Q')
+
+    @classmethod
+    def de_inventario(cls, inventario: InventarioCompilado) -> 'LexicoCompacto':
+        """
+        Monta o léxico com todas as palavras únicas, na ordem dos índices.
+
+        Args:
+            inventario: Inventário compilado
+
+        Returns:
+            Léxico com uma entrada por palavra única
+        """
+        codigos = cls._novo_array(inventario)
+        for combinacao in inventario.iterar_tuplas():
+            codigos.extend(combinacao)
+        return cls(inventario, codigos)
+
+    @classmethod
+    def de_palavras(cls, inventario: InventarioCompilado, palavras: Iterable[str]) -> 'LexicoCompacto':
+        """
+        Monta o léxico a partir de palavras, preservando a ordem.
+
+        Args:
+            inventario: Inventário com o qual as palavras são formadas
+            palavras: Palavras a guardar
+
+        Returns:
+            Léxico com as palavras fornecidas
+
+        Raises:
+            ValueError: Se alguma palavra não puder ser formada com o inventário
+        """
+        codigos = cls._novo_array(inventario)
+        for palavra in palavras:
+            codigos.extend(inventario.tupla_canonica(palavra))
+        return cls(inventario, codigos)
+
+    def __len__(self) -> int:
+        return len(self._codigos) // self._num_posicoes
+
+    def codigos(self, posicao: int) -> Tuple[int, ...]:
+        inicio = self._normalizar_posicao(posicao) * self._num_posicoes
+        return tuple(self._codigos[inicio:inicio + self._num_posicoes])
+
+    def _iterar_codigos(self, inicio: int, fim: int) -> Iterator[Tuple[int, ...]]:
+        n = self._num_posicoes
+        valores = iter(self._codigos[inicio * n:fim * n])
+        return zip(*[valores] * n)
+
+    def tamanho_em_bytes(self) -> int:
+        """Retorna o espaço ocupado pelos códigos das palavras."""
+        return len(self._codigos) * self._codigos.itemsize
+
+
+class LexicoBinario(_LexicoCodificado):
+    """
+    Léxico binário mapeado em memória.
+
+    Abrir o arquivo lê apenas o cabeçalho; as palavras são decodificadas
+    sob demanda em `__getitem__` e na iteração.
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Args:
+            caminho: Arquivo gravado por `escrever_lexico_binario`
+
+        Raises:
+            ValueError: Se o arquivo não estiver no formato esperado
+        """
+        with open(caminho, 'rb') as arquivo:
+            # O mmap não aceita arquivos vazios; curtos demais nem são mapeados
+            if os.fstat(arquivo.fileno()).st_size < _CABECALHO.size:
+                raise ValueError("Arquivo curto demais para um léxico binário")
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._ler_cabecalho()
+        except Exception:
+            self._mapa.close()
+            raise
+
+    def _ler_cabecalho(self) -> None:
+        mapa = self._mapa
+        magic, versao, num_posicoes, largura, quantidade, inicio_tabelas = _CABECALHO.unpack_from(mapa, 0)
+        if magic != MAGIC or versao != VERSAO or largura not in _FORMATO_INDICE:
+            raise ValueError("Arquivo não é um léxico binário compatível")
+
+        self._registro = struct.Struct('<' + _FORMATO_INDICE[largura] * num_posicoes)
+        try:
+            tabelas, _ = _ler_tabelas(mapa, inicio_tabelas, num_posicoes)
+        except (struct.error, IndexError):
+            raise ValueError("Arquivo de léxico binário truncado") from None
+        self.tabelas: Tuple[Tuple[str, ...], ...] = tabelas
+        self._inicio = _CABECALHO.size
+        self._quantidade = quantidade
+        if inicio_tabelas < self._inicio + quantidade * self._registro.size:
+            raise ValueError("Arquivo de léxico binário truncado")
+
+    def __len__(self) -> int:
+        return self._quantidade
+
+    def codigos(self, posicao: int) -> Tuple[int, ...]:
+        posicao = self._normalizar_posicao(posicao)
+        return self._registro.unpack_from(self._mapa, self._inicio + posicao * self._registro.size)
+
+    def _iterar_codigos(self, inicio: int, fim: int) -> Iterator[Tuple[int, ...]]:
+        # Cada bloco é copiado do mapa em vez de exposto por uma memoryview:
+        # um iterador suspenso não impede `close`
+        tamanho = self._registro.size
+        for bloco in range(inicio, fim, _REGISTROS_POR_BLOCO):
+            comeco = self._inicio + bloco * tamanho
+            final = self._inicio + min(bloco + _REGISTROS_POR_BLOCO, fim) * tamanho
+            yield from self._registro.iter_unpack(self._mapa[comeco:final])
+
+    def close(self) -> None:
+        """Libera o mapeamento do arquivo."""
+        self._mapa.close()
+
+    def __enter__(self) -> 'LexicoBinario':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.close()
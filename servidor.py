@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor HTTP assíncrono do gerador.
+
+Um único laço de eventos (asyncio) atende muitos clientes ao mesmo tempo,
+com conexões persistentes (HTTP/1.1). Todas as respostas são JSON:
+
+    GET  /palavras?quantidade=N              palavras sorteadas, com repetição
+    GET  /unicas?quantidade=N[&semente=S]    palavras sem repetição
+    GET  /validar?palavra=P                  valida uma palavra
+    POST /validar                            valida o corpo, uma palavra por linha
+    GET  /consulta?palavra=P                 índice e decomposições de uma palavra
+    GET  /consulta?indice=I                  palavra única de índice I
+    GET  /estado                             tamanho do léxico e das reservas
+    GET  /metricas                           contadores da instrumentação, se ligada
+
+As palavras avulsas e os lotes pequenos saem de reservas pré-geradas, que
+tarefas em segundo plano reabastecem quando ficam pela metade, então a
+resposta não espera pela geração. Lotes grandes são gerados em blocos e
+enviados aos poucos com `Transfer-Encoding: chunked`, liberando o laço
+entre um bloco e outro para os demais clientes.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import deque
+from http import HTTPStatus
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from gerador import GeradorEgera
+from instrumentacao import Instrumentacao
+
+# Palavras mantidas em cada reserva
+CAPACIDADE_RESERVA = 4096
+# Lotes acima deste tamanho são enviados em fluxo, e não de uma vez
+LIMITE_SEM_FLUXO = 10_000
+# Palavras geradas e enviadas por bloco de uma resposta em fluxo
+TAMANHO_BLOCO_FLUXO = 8192
+# Maior lote aceito em /palavras
+MAXIMO_PALAVRAS = 10_000_000
+# Maior corpo aceito em POST /validar, em bytes
+MAXIMO_CORPO = 16 << 20
+# Segundos que uma conexão ociosa é mantida aberta
+TEMPO_OCIOSO = 60.0
+
+
+class _ErroHTTP(Exception):
+    """Erro que vira uma resposta JSON com o status informado."""
+
+    def __init__(self, status: HTTPStatus, mensagem: str, cabecalhos: Optional[Dict[str, str]] = None):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+        self.cabecalhos = cabecalhos or {}
+
+
+class _Reserva:
+    """
+    Palavras pré-geradas, reabastecidas em segundo plano.
+
+    `retirar` nunca espera: entrega o que houver na reserva e gera na hora
+    apenas o que faltar. Quando a reserva cai abaixo da metade, a tarefa de
+    reabastecimento é acordada e a completa em blocos, cedendo o laço de
+    eventos entre um bloco e outro.
+    """
+
+    def __init__(self, gerar: Callable[[int], List[str]], capacidade: int, bloco: int = 1024):
+        self._gerar = gerar
+        self.capacidade = capacidade
+        self._bloco = bloco
+        self._palavras: Deque[str] = deque()
+        self._pedido = asyncio.Event()
+        self._tarefa: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._palavras)
+
+    def iniciar(self) -> None:
+        self._tarefa = asyncio.get_running_loop().create_task(self._reabastecer())
+        self._pedido.set()
+
+    async def encerrar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def retirar(self, quantidade: int) -> List[str]:
+        palavras = self._palavras
+        disponiveis = min(quantidade, len(palavras))
+        retiradas = [palavras.popleft() for _ in range(disponiveis)]
+        if disponiveis < quantidade:
+            retiradas.extend(self._gerar(quantidade - disponiveis))
+        if len(palavras) < self.capacidade // 2:
+            self._pedido.set()
+        return retiradas
+
+    async def _reabastecer(self) -> None:
+        while True:
+            await self._pedido.wait()
+            self._pedido.clear()
+            while len(self._palavras) < self.capacidade:
+                self._palavras.extend(self._gerar(min(self._bloco, self.capacidade - len(self._palavras))))
+                await asyncio.sleep(0)
+
+
+def _inteiro(
+    parametros: Dict[str, List[str]],
+    nome: str,
+    padrao: Optional[int] = None,
+    minimo: Optional[int] = None,
+    maximo: Optional[int] = None,
+) -> Optional[int]:
+    """Lê um parâmetro inteiro da URL, com erro 400 se for inválido."""
+    valores = parametros.get(nome)
+    if not valores:
+        return padrao
+    try:
+        valor = int(valores[-1])
+    except ValueError:
+        raise _ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um número inteiro")
+    if minimo is not None and valor < minimo:
+        raise _ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser no mínimo {minimo:,}")
+    if maximo is not None and valor > maximo:
+        raise _ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser no máximo {maximo:,}")
+    return valor
+
+
+def _texto(parametros: Dict[str, List[str]], nome: str) -> Optional[str]:
+    valores = parametros.get(nome)
+    return valores[-1] if valores else None
+
+
+def _json(dados: object) -> bytes:
+    return json.dumps(dados, ensure_ascii=False).encode('utf-8')
+
+
+class _Fluxo:
+    """Lote de palavras enviado em blocos, como {"palavras": [...]}."""
+
+    def __init__(self, blocos: Iterator[List[str]]):
+        self.blocos = blocos
+
+
+class ServidorEgera:
+    """
+    Serviço HTTP de geração e validação de palavras.
+
+    Todos os clientes compartilham o mesmo gerador e as mesmas reservas;
+    como o servidor roda em um único laço de eventos, não há concorrência
+    entre as rotas.
+    """
+
+    def __init__(
+        self,
+        gerador: Optional[GeradorEgera] = None,
+        capacidade_reserva: int = CAPACIDADE_RESERVA,
+        instrumentacao: Optional[Instrumentacao] = None,
+    ):
+        """
+        Args:
+            gerador: Gerador usado pelas rotas (padrão: GeradorEgera())
+            capacidade_reserva: Palavras mantidas em cada reserva
+            instrumentacao: Se informada, o gerador é instrumentado e os
+                contadores ficam disponíveis em /metricas
+        """
+        self.gerador = gerador if gerador is not None else GeradorEgera()
+        self.instrumentacao = instrumentacao
+        if instrumentacao is not None:
+            instrumentacao.instrumentar(self.gerador)
+        self._capacidade_reserva = capacidade_reserva
+        self._unicas_em_sequencia = self._percorrer_unicas()
+        self._reservas: Dict[str, _Reserva] = {}
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._conexoes: set = set()
+        self._rotas: Dict[str, Dict[str, Callable[[Dict[str, List[str]], bytes], object]]] = {
+            '/palavras': {'GET': self._palavras},
+            '/unicas': {'GET': self._unicas},
+            '/validar': {'GET': self._validar, 'POST': self._validar_lote},
+            '/consulta': {'GET': self._consulta},
+            '/estado': {'GET': self._estado},
+            '/metricas': {'GET': self._metricas},
+        }
+
+    def _percorrer_unicas(self) -> Iterator[str]:
+        # Permutações sucessivas do léxico: lotes pequenos consecutivos não
+        # se repetem até que todas as palavras tenham saído
+        while True:
+            semente = self.gerador._rng.getrandbits(64)
+            yield from self.gerador.iterar_palavras_unicas(embaralhar=True, semente=semente)
+
+    @property
+    def porta(self) -> int:
+        """Porta em que o servidor está escutando."""
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def iniciar(self, host: str = '127.0.0.1', porta: int = 8000) -> None:
+        """
+        Começa a aceitar conexões e a preencher as reservas.
+
+        Args:
+            host: Endereço de escuta
+            porta: Porta de escuta (0 escolhe uma porta livre; veja `porta`)
+        """
+        gerar_multiplas = self.gerador.gerar_multiplas
+        self._reservas = {
+            'palavras': _Reserva(gerar_multiplas, self._capacidade_reserva),
+            'unicas': _Reserva(
+                lambda quantidade: list(islice(self._unicas_em_sequencia, quantidade)),
+                self._capacidade_reserva,
+            ),
+        }
+        for reserva in self._reservas.values():
+            reserva.iniciar()
+        self._servidor = await asyncio.start_server(self._atender, host, porta)
+
+    async def servir(self) -> None:
+        """Atende as conexões até o servidor ser encerrado."""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self) -> None:
+        """Para de aceitar conexões, fecha as abertas e para as reservas."""
+        if self._servidor is not None:
+            self._servidor.close()
+            for escritor in list(self._conexoes):
+                escritor.close()
+            await self._servidor.wait_closed()
+        for reserva in self._reservas.values():
+            await reserva.encerrar()
+
+    async def __aenter__(self) -> 'ServidorEgera':
+        return self
+
+    async def __aexit__(self, *excecao) -> None:
+        await self.encerrar()
+
+    # Rotas
+
+    def _palavras(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        quantidade = _inteiro(parametros, 'quantidade', 1, 0, MAXIMO_PALAVRAS)
+        if quantidade <= LIMITE_SEM_FLUXO:
+            return HTTPStatus.OK, {'palavras': self._reservas['palavras'].retirar(quantidade)}
+        gerar_multiplas = self.gerador.gerar_multiplas
+
+        def blocos() -> Iterator[List[str]]:
+            for inicio in range(0, quantidade, TAMANHO_BLOCO_FLUXO):
+                yield gerar_multiplas(min(TAMANHO_BLOCO_FLUXO, quantidade - inicio))
+        return _Fluxo(blocos())
+
+    def _unicas(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        maximo = self.gerador.calcular_palavras_unicas()
+        quantidade = _inteiro(parametros, 'quantidade', 1, 0, maximo)
+        semente = _inteiro(parametros, 'semente')
+        if semente is None and quantidade <= LIMITE_SEM_FLUXO:
+            palavras = self._reservas['unicas'].retirar(quantidade)
+            if len(set(palavras)) != quantidade:
+                # O lote atravessou o fim de uma permutação
+                palavras = self.gerador.gerar_multiplas(quantidade, unicas=True)
+            return HTTPStatus.OK, {'palavras': palavras}
+        if semente is None:
+            semente = self.gerador._rng.getrandbits(64)
+        palavras = islice(self.gerador.iterar_palavras_unicas(embaralhar=True, semente=semente), quantidade)
+        blocos = iter(lambda: list(islice(palavras, TAMANHO_BLOCO_FLUXO)), [])
+        if quantidade <= LIMITE_SEM_FLUXO:
+            return HTTPStatus.OK, {'palavras': [palavra for bloco in blocos for palavra in bloco]}
+        return _Fluxo(blocos)
+
+    def _validar(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        palavra = _texto(parametros, 'palavra')
+        if palavra is None:
+            raise _ErroHTTP(HTTPStatus.BAD_REQUEST, "Informe o parâmetro 'palavra'")
+        return HTTPStatus.OK, {
+            'palavra': palavra,
+            'valida': self.gerador.validar_proparoxitona(palavra),
+            'gerada': self.gerador.contem(palavra),
+        }
+
+    def _validar_lote(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        try:
+            linhas = corpo.decode('utf-8').splitlines()
+        except UnicodeDecodeError:
+            raise _ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve estar em UTF-8")
+        resultado = self.gerador.validar_lote(linhas)
+        return HTTPStatus.OK, {
+            'total': resultado.total,
+            'validas': resultado.validas,
+            'invalidas': [{'linha': linha, 'palavra': palavra} for linha, palavra in resultado.invalidas],
+        }
+
+    def _consulta(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        palavra = _texto(parametros, 'palavra')
+        if palavra is not None:
+            decomposicoes = self.gerador.decompor(palavra)
+            return HTTPStatus.OK, {
+                'palavra': palavra,
+                'existe': bool(decomposicoes),
+                'indice': self.gerador.indice_da_palavra(palavra) if decomposicoes else None,
+                'decomposicoes': [list(silabas) for silabas in decomposicoes],
+            }
+        indice = _inteiro(parametros, 'indice')
+        if indice is None:
+            raise _ErroHTTP(HTTPStatus.BAD_REQUEST, "Informe o parâmetro 'palavra' ou 'indice'")
+        try:
+            return HTTPStatus.OK, {'indice': indice, 'palavra': self.gerador.palavra_por_indice(indice)}
+        except IndexError:
+            raise _ErroHTTP(HTTPStatus.NOT_FOUND, f"Não há palavra de índice {indice:,}")
+
+    def _estado(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        return HTTPStatus.OK, {
+            'palavras_unicas': self.gerador.calcular_palavras_unicas(),
+            'reservas': {nome: len(reserva) for nome, reserva in self._reservas.items()},
+            'conexoes': len(self._conexoes),
+        }
+
+    def _metricas(self, parametros: Dict[str, List[str]], corpo: bytes) -> object:
+        if self.instrumentacao is None:
+            raise _ErroHTTP(HTTPStatus.NOT_FOUND, "Instrumentação desligada (use --metricas)")
+        return HTTPStatus.OK, self.instrumentacao.resumo()
+
+    # Protocolo
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        self._conexoes.add(escritor)
+        try:
+            manter = True
+            while manter:
+                try:
+                    cabecalho = await asyncio.wait_for(leitor.readuntil(b'\r\n\r\n'), TEMPO_OCIOSO)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+                except asyncio.LimitOverrunError:
+                    erro = _ErroHTTP(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeçalho grande demais")
+                    await self._enviar_erro(escritor, erro, manter=False)
+                    break
+                manter = await self._processar(cabecalho, leitor, escritor)
+        except ConnectionError:
+            pass
+        finally:
+            self._conexoes.discard(escritor)
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _processar(
+        self, cabecalho: bytes, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ) -> bool:
+        """Lê o corpo, responde a uma requisição e diz se a conexão continua aberta."""
+        try:
+            linhas = cabecalho.decode('latin-1').split('\r\n')
+            metodo, alvo, versao = linhas[0].split(' ')
+            cabecalhos = {}
+            for linha in linhas[1:]:
+                if linha:
+                    nome, _, valor = linha.partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+            tamanho = int(cabecalhos.get('content-length', 0))
+            if tamanho < 0:
+                raise ValueError(tamanho)
+        except ValueError:
+            await self._enviar_erro(escritor, _ErroHTTP(HTTPStatus.BAD_REQUEST, "Requisição malformada"), False)
+            return False
+
+        conexao = cabecalhos.get('connection', '').lower()
+        manter = conexao != 'close' if versao == 'HTTP/1.1' else conexao == 'keep-alive'
+        if tamanho > MAXIMO_CORPO:
+            erro = _ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"O corpo excede {MAXIMO_CORPO:,} bytes")
+            await self._enviar_erro(escritor, erro, False)
+            return False
+        corpo = await leitor.readexactly(tamanho) if tamanho else b''
+
+        partes = urlsplit(alvo)
+        try:
+            metodos = self._rotas.get(partes.path)
+            if metodos is None:
+                raise _ErroHTTP(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {partes.path}")
+            rota = metodos.get(metodo)
+            if rota is None:
+                raise _ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f"Método {metodo} não permitido",
+                                {'Allow': ', '.join(metodos)})
+            resposta = rota(parse_qs(partes.query), corpo)
+        except _ErroHTTP as erro:
+            await self._enviar_erro(escritor, erro, manter)
+            return manter
+
+        if isinstance(resposta, _Fluxo):
+            # Sem codificação em blocos (HTTP/1.0), o fim da resposta é o fim da conexão
+            fragmentado = versao == 'HTTP/1.1'
+            await self._enviar_fluxo(escritor, resposta, fragmentado, manter and fragmentado)
+            return manter and fragmentado
+        status, dados = resposta
+        await self._enviar(escritor, status, _json(dados), manter)
+        return manter
+
+    @staticmethod
+    def _linha_de_status(status: HTTPStatus, cabecalhos: Dict[str, str], manter: bool) -> bytes:
+        cabecalhos = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Connection': 'keep-alive' if manter else 'close',
+            **cabecalhos,
+        }
+        linhas = [f'HTTP/1.1 {status.value} {status.phrase}']
+        linhas.extend(f'{nome}: {valor}' for nome, valor in cabecalhos.items())
+        return ('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1')
+
+    async def _enviar(
+        self,
+        escritor: asyncio.StreamWriter,
+        status: HTTPStatus,
+        corpo: bytes,
+        manter: bool,
+        cabecalhos: Optional[Dict[str, str]] = None,
+    ) -> None:
+        cabecalhos = {'Content-Length': str(len(corpo)), **(cabecalhos or {})}
+        escritor.write(self._linha_de_status(status, cabecalhos, manter) + corpo)
+        await escritor.drain()
+
+    async def _enviar_erro(self, escritor: asyncio.StreamWriter, erro: _ErroHTTP, manter: bool) -> None:
+        await self._enviar(escritor, erro.status, _json({'erro': erro.mensagem}), manter, erro.cabecalhos)
+
+    async def _enviar_fluxo(
+        self, escritor: asyncio.StreamWriter, fluxo: _Fluxo, fragmentado: bool, manter: bool
+    ) -> None:
+        cabecalhos = {'Transfer-Encoding': 'chunked'} if fragmentado else {}
+        escritor.write(self._linha_de_status(HTTPStatus.OK, cabecalhos, manter))
+
+        def enviar(dados: bytes) -> None:
+            if fragmentado:
+                escritor.write(b'%x\r\n%s\r\n' % (len(dados), dados))
+            else:
+                escritor.write(dados)
+
+        separador = ''
+        enviar(b'{"palavras": [')
+        for bloco in fluxo.blocos:
+            texto = separador + ', '.join(json.dumps(palavra, ensure_ascii=False) for palavra in bloco)
+            enviar(texto.encode('utf-8'))
+            separador = ', '
+            # Espera o cliente consumir; `drain` só cede o laço quando o
+            # transporte está pausado, então cede explicitamente aos demais clientes
+            await escritor.drain()
+            await asyncio.sleep(0)
+        enviar(b']}')
+        if fragmentado:
+            escritor.write(b'0\r\n\r\n')
+        await escritor.drain()
+
+
+async def _executar(servidor: ServidorEgera, host: str, porta: int) -> None:
+    await servidor.iniciar(host, porta)
+    print(f"Servidor em http://{host}:{servidor.porta}/ (Ctrl+C para encerrar)")
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.encerrar()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Função principal do servidor.
+
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv[1:])
+
+    Returns:
+        Código de saída do programa
+    """
+    parser = argparse.ArgumentParser(description='Serve o gerador de palavras por HTTP.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=8000,
+                        help='porta de escuta (padrão: 8000)')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='semente do gerador aleatório')
+    parser.add_argument('--metricas', action='store_true',
+                        help='instrumenta o gerador e expõe os contadores em /metricas')
+    args = parser.parse_args(argv)
+
+    instrumentacao = Instrumentacao() if args.metricas else None
+    servidor = ServidorEgera(GeradorEgera(semente=args.seed), instrumentacao=instrumentacao)
+    try:
+        asyncio.run(_executar(servidor, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Busca por similaridade no léxico.
+
+`IndiceSimilaridade` encontra as palavras mais próximas de uma palavra
+alvo (por exemplo, 'égera' ou 'pécora') sem comparar o alvo com todo o
+léxico. As palavras ficam em uma árvore de prefixos, e a distância de
+edição é calculada uma única vez para cada prefixo compartilhado; a busca
+percorre primeiro os ramos mais promissores e descarta os que não podem
+mais alcançar os resultados.
+
+A distância considera os acentos: trocar uma vogal pela mesma vogal com
+outro acento ('e' por 'é') custa menos que trocar por outra letra.
+"""
+
+import heapq
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+# Custo de trocar uma letra pela mesma letra com outro acento (ou sem acento)
+CUSTO_ACENTO = 0.5
+
+
+def remover_acentos(texto: str) -> str:
+    """
+    Remove os acentos e converte para minúsculas.
+
+    Args:
+        texto: Texto a normalizar
+
+    Returns:
+        Texto sem acentos, em minúsculas ('Égera' -> 'egera')
+    """
+    decomposto = unicodedata.normalize('NFD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def distancia(palavra: str, outra: str) -> float:
+    """
+    Calcula a distância de edição entre duas palavras, considerando acentos.
+
+    Inserções, remoções e trocas custam 1; trocar uma letra pela mesma
+    letra com outro acento custa `CUSTO_ACENTO`. Maiúsculas e minúsculas
+    são equivalentes.
+
+    Args:
+        palavra: Primeira palavra
+        outra: Segunda palavra
+
+    Returns:
+        Distância entre as palavras
+    """
+    a, b = palavra.lower(), outra.lower()
+    base_a, base_b = remover_acentos(a), remover_acentos(b)
+    if len(base_a) != len(a) or len(base_b) != len(b):
+        # Letras que não se decompõem em um único caractere base
+        base_a, base_b = a, b
+
+    anterior = [float(j) for j in range(len(b) + 1)]
+    for i, (letra, base) in enumerate(zip(a, base_a), 1):
+        atual = [float(i)]
+        for j, (outra_letra, outra_base) in enumerate(zip(b, base_b), 1):
+            if letra == outra_letra:
+                troca = anterior[j - 1]
+            elif base == outra_base:
+                troca = anterior[j - 1] + CUSTO_ACENTO
+            else:
+                troca = anterior[j - 1] + 1
+            atual.append(min(troca, anterior[j] + 1, atual[j - 1] + 1))
+        anterior = atual
+    return anterior[-1]
+
+
+class Vizinho(NamedTuple):
+    """Palavra do léxico e a sua distância até o alvo da consulta."""
+    palavra: str
+    distancia: float
+
+
+class _No:
+    """Nó da árvore de prefixos."""
+
+    __slots__ = ('filhos', 'palavras', 'menor', 'maior')
+
+    def __init__(self):
+        self.filhos: Dict[str, '_No'] = {}
+        # Posições no léxico das palavras que terminam neste nó
+        self.palavras: List[int] = []
+        # Menor e maior número de caracteres que faltam até o fim de uma palavra
+        self.menor = 0
+        self.maior = 0
+
+
+class IndiceSimilaridade:
+    """
+    Índice para busca das palavras mais próximas de um alvo.
+
+    As palavras, em minúsculas, são guardadas em uma árvore de prefixos;
+    a montagem é linear no número de caracteres do léxico. Cada nó guarda
+    também o menor e o maior número de caracteres que faltam até o fim
+    das palavras abaixo dele.
+
+    A busca calcula, para cada nó visitado, a linha da matriz de distância
+    de edição entre o prefixo do nó e o alvo, reaproveitando a linha do nó
+    pai. A linha, junto com os comprimentos restantes, dá um limite
+    inferior para a distância de todas as palavras do ramo. Os nós são
+    visitados em ordem crescente desse limite, então cada palavra sai da
+    busca já na ordem final e a busca para assim que as k mais próximas
+    forem encontradas. O resultado é exato: o mesmo de comparar o alvo
+    com todas as palavras.
+
+    O custo depende de quão perto o alvo está do léxico: alvos distantes
+    de todas as palavras só param depois de visitar boa parte da árvore.
+    Com `distancia_maxima`, os ramos cujo limite passa dela são descartados
+    e a busca fica restrita à vizinhança do alvo.
+    """
+
+    def __init__(self, palavras: Iterable[str]):
+        """
+        Args:
+            palavras: Léxico a indexar (por exemplo, a saída de
+                `GeradorEgera.gerar_todas_palavras_possiveis`)
+        """
+        self.palavras: Sequence[str] = palavras if isinstance(palavras, Sequence) else list(palavras)
+        self._raiz = _No()
+        for posicao, palavra in enumerate(self.palavras):
+            no = self._raiz
+            for caractere in palavra.lower():
+                filho = no.filhos.get(caractere)
+                if filho is None:
+                    filho = no.filhos[caractere] = _No()
+                no = filho
+            no.palavras.append(posicao)
+        self._medir(self._raiz)
+
+    @staticmethod
+    def _medir(raiz: _No) -> None:
+        # Pós-ordem iterativa: os filhos são medidos antes do pai
+        pilha = [raiz]
+        ordem = []
+        while pilha:
+            no = pilha.pop()
+            ordem.append(no)
+            pilha.extend(no.filhos.values())
+        for no in reversed(ordem):
+            filhos = no.filhos.values()
+            no.maior = max((filho.maior + 1 for filho in filhos), default=0)
+            no.menor = 0 if no.palavras else min((filho.menor + 1 for filho in filhos), default=0)
+
+    @classmethod
+    def de_gerador(cls, gerador=None) -> 'IndiceSimilaridade':
+        """
+        Indexa todas as palavras únicas de um gerador.
+
+        Args:
+            gerador: GeradorEgera de origem (padrão: GeradorEgera())
+
+        Returns:
+            Índice sobre o léxico completo do gerador
+        """
+        if gerador is None:
+            from gerador import GeradorEgera
+            gerador = GeradorEgera()
+        return cls(gerador.gerar_todas_palavras_possiveis())
+
+    def __len__(self) -> int:
+        return len(self.palavras)
+
+    def mais_proximas(
+        self,
+        alvo: str,
+        k: int = 10,
+        distancia_maxima: Optional[float] = None,
+    ) -> List[Vizinho]:
+        """
+        Encontra as k palavras do léxico mais próximas do alvo.
+
+        Args:
+            alvo: Palavra de referência, com ou sem acentos
+            k: Número de palavras retornadas
+            distancia_maxima: Maior distância aceita; palavras mais
+                distantes não são retornadas e os ramos que só contêm
+                palavras assim não são visitados (padrão: sem limite)
+
+        Returns:
+            Até k vizinhos, do mais próximo para o mais distante; empates
+            seguem a ordem do léxico
+        """
+        if k <= 0:
+            return []
+        maxima = float('inf') if distancia_maxima is None else distancia_maxima
+        texto = alvo.lower()
+        bases = remover_acentos(texto)
+        if len(bases) != len(texto):
+            bases = texto
+        m = len(texto)
+
+        # Custo de trocar cada caractere do alvo por um caractere do léxico
+        custos: Dict[str, List[float]] = {}
+
+        def custos_de(caractere: str) -> List[float]:
+            linha = custos.get(caractere)
+            if linha is None:
+                base = remover_acentos(caractere) or caractere
+                linha = custos[caractere] = [
+                    0.0 if letra == caractere else CUSTO_ACENTO if outra == base else 1.0
+                    for letra, outra in zip(texto, bases)
+                ]
+            return linha
+
+        # Itens do heap: (limite, tipo, desempate, nó, linha). Palavras (tipo 1)
+        # saem depois dos nós (tipo 0) de mesmo limite, o que garante que
+        # todas as palavras empatadas já estejam no heap, ordenadas pela posição
+        inicial = [float(j) for j in range(m + 1)]
+        heap = [(0.0, 0, 0, self._raiz, inicial)]
+        contador = 1
+        vizinhos: List[Vizinho] = []
+        while heap and len(vizinhos) < k:
+            limite, tipo, desempate, no, linha = heapq.heappop(heap)
+            if tipo == 1:
+                vizinhos.append(Vizinho(self.palavras[desempate], limite))
+                continue
+            if linha[-1] <= maxima:
+                for posicao in no.palavras:
+                    heapq.heappush(heap, (linha[-1], 1, posicao, None, None))
+            for caractere, filho in no.filhos.items():
+                troca = custos_de(caractere)
+                menor, maior = filho.menor, filho.maior
+                # Linha seguinte da matriz e, junto, o limite inferior do ramo:
+                # a célula j ainda precisa transformar m - j caracteres do alvo
+                # em um sufixo de menor a maior caracteres
+                anterior = linha[0] + 1
+                nova = [anterior]
+                falta = m
+                melhor = anterior + (menor - falta if falta < menor else falta - maior if falta > maior else 0)
+                for j in range(m):
+                    x = linha[j] + troca[j]
+                    y = linha[j + 1] + 1
+                    z = anterior + 1
+                    anterior = x if x < y and x < z else y if y < z else z
+                    nova.append(anterior)
+                    falta -= 1
+                    candidato = anterior + (
+                        menor - falta if falta < menor else falta - maior if falta > maior else 0
+                    )
+                    if candidato < melhor:
+                        melhor = candidato
+                if melhor <= maxima:
+                    heapq.heappush(heap, (melhor, 0, contador, filho, nova))
+                    contador += 1
+        return vizinhos
@@ -0,0 +1,144 @@
+"""
+Testes unitários para o alocador de apelidos entre processos
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from alocador import AlocadorApelidos
+from gerador import GeradorEgera
+
+
+def _silabas_pequenas():
+    return GeradorEgera(silabas_tonicas=['pró', 'fí', 'sô'], silabas_medias=['tu', 'ma'],
+                        silabas_finais=['la', 'ta', 'ca'])
+
+
+def _alocar_em_processo(caminho, semente, quantidade):
+    with AlocadorApelidos(caminho, semente=semente) as alocador:
+        return [alocador.alocar() for _ in range(quantidade)]
+
+
+class TestAlocadorApelidos:
+    """Testes para a classe AlocadorApelidos"""
+    
+    @pytest.fixture
+    def caminho(self, tmp_path):
+        """Fixture que retorna o caminho do arquivo de estado"""
+        return str(tmp_path / 'alocador.bin')
+    
+    def test_esgota_sem_repetir(self, caminho):
+        """Testa que todas as palavras são emitidas uma única vez"""
+        gerador = _silabas_pequenas()
+        with AlocadorApelidos(caminho, gerador, semente=1) as alocador:
+            palavras = [alocador.alocar() for _ in range(alocador.total)]
+            assert sorted(palavras) == sorted(gerador.inventario)
+            assert alocador.livres == 0
+            with pytest.raises(RuntimeError):
+                alocador.alocar()
+    
+    def test_liberar_e_reservar(self, caminho):
+        """Testa a devolução e a reserva de palavras específicas"""
+        with AlocadorApelidos(caminho, _silabas_pequenas(), semente=2) as alocador:
+            assert alocador.reservar('prótula')
+            assert not alocador.reservar('prótula')
+            assert 'prótula' in alocador
+            assert alocador.liberar('prótula')
+            assert not alocador.liberar('prótula')
+            assert 'prótula' not in alocador
+            assert 'xyz' not in alocador
+            with pytest.raises(ValueError):
+                alocador.reservar('xyz')
+    
+    def test_alocar_varias_e_atomico(self, caminho):
+        """Testa que um pedido maior que o disponível não emite nada"""
+        with AlocadorApelidos(caminho, _silabas_pequenas(), semente=3) as alocador:
+            assert len(set(alocador.alocar_varias(10))) == 10
+            with pytest.raises(RuntimeError):
+                alocador.alocar_varias(alocador.livres + 1)
+            assert alocador.emitidas == 10
+    
+    def test_estado_persiste_apos_reabrir(self, caminho):
+        """Testa que as palavras emitidas continuam emitidas após reiniciar"""
+        with AlocadorApelidos(caminho, semente=4) as alocador:
+            emitidas = alocador.alocar_varias(100)
+        with AlocadorApelidos(caminho, semente=4) as alocador:
+            assert alocador.emitidas == 100
+            assert all(palavra in alocador for palavra in emitidas)
+            assert not set(alocador.alocar_varias(500)) & set(emitidas)
+    
+    def test_sorteio_uniforme_com_espaco_quase_cheio(self, caminho):
+        """Testa que as últimas palavras livres são sorteadas por igual"""
+        from collections import Counter
+        gerador = GeradorEgera()
+        livres = ['prótula', 'strámanha', 'fíbrala']
+        with AlocadorApelidos(caminho, gerador, semente=5) as alocador:
+            for palavra in gerador.inventario:
+                if palavra not in livres:
+                    alocador.reservar(palavra)
+            assert alocador.livres == 3
+            contagem = Counter()
+            for _ in range(3000):
+                palavra = alocador.alocar()
+                contagem[palavra] += 1
+                alocador.liberar(palavra)
+        assert set(contagem) == set(livres)
+        assert all(800 < vezes < 1200 for vezes in contagem.values())
+    
+    def test_arquivo_de_outras_silabas(self, caminho):
+        """Testa que um arquivo criado para outras sílabas é rejeitado"""
+        AlocadorApelidos(caminho, _silabas_pequenas()).close()
+        with pytest.raises(ValueError):
+            AlocadorApelidos(caminho, GeradorEgera(silabas_finais=['la']))
+    
+    def test_contagens_reconstruidas_ao_reabrir(self, caminho):
+        """Testa que contagens desatualizadas (processo interrompido) são corrigidas"""
+        gerador = _silabas_pequenas()
+        with AlocadorApelidos(caminho, gerador, semente=6) as alocador:
+            alocador.alocar_varias(5)
+            # Simula um processo que marcou bits sem atualizar as contagens
+            alocador._bits[0] = (1 << alocador.total) - 1
+        with AlocadorApelidos(caminho, gerador, semente=6) as alocador:
+            assert alocador.livres == 0
+            assert alocador.emitidas == alocador.total
+            with pytest.raises(RuntimeError):
+                alocador.alocar()
+    
+    def test_contagens_inconsistentes_nao_emitem(self, caminho):
+        """Testa que o sorteio falha, sem emitir nada, se as contagens excederem o mapa"""
+        with AlocadorApelidos(caminho, _silabas_pequenas(), semente=7) as alocador:
+            alocador.alocar_varias(alocador.total - 1)
+            alocador._bits[0] = (1 << alocador.total) - 1
+            with pytest.raises(RuntimeError):
+                alocador.alocar()
+            assert alocador.livres == 1
+    
+    def test_processos_nao_repetem_palavras(self, caminho):
+        """Testa que processos concorrentes nunca recebem a mesma palavra"""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            resultados = list(executor.map(
+                _alocar_em_processo, [caminho] * 4, range(4), [1500] * 4
+            ))
+        palavras = [palavra for resultado in resultados for palavra in resultado]
+        assert len(palavras) == len(set(palavras)) == 6000
+        with AlocadorApelidos(caminho) as alocador:
+            assert alocador.emitidas == 6000
+    
+    def test_threads_na_mesma_instancia_nao_repetem_palavras(self, caminho):
+        """Testa que threads que compartilham uma instância nunca recebem a mesma palavra"""
+        import sys
+        from concurrent.futures import ThreadPoolExecutor
+        intervalo = sys.getswitchinterval()
+        # Trocas de thread frequentes expõem a disputa entre sorteio e marcação
+        sys.setswitchinterval(1e-6)
+        try:
+            with AlocadorApelidos(caminho, semente=3) as alocador:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    resultados = list(executor.map(
+                        lambda _: [alocador.alocar() for _ in range(2000)], range(8)
+                    ))
+                assert alocador.emitidas == 16000
+        finally:
+            sys.setswitchinterval(intervalo)
+        palavras = [palavra for resultado in resultados for palavra in resultado]
+        assert len(palavras) == len(set(palavras)) == 16000
@@ -0,0 +1,95 @@
+"""
+Testes unitários para os benchmarks do gerador
+"""
+import json
+
+import pytest
+
+import benchmark
+from benchmark import Medicao, comparar, executar
+
+
+def _medicao(**valores):
+    padrao = dict(funcao='gerar_palavra', tamanho='pequeno', palavras_unicas=432,
+                  itens_por_segundo=1000.0, latencia_p50_us=10.0, latencia_p90_us=12.0,
+                  latencia_p99_us=15.0, memoria_pico_bytes=1000, amostras=30)
+    padrao.update(valores)
+    return Medicao(**padrao)
+
+
+class TestBenchmark:
+    """Testes para as medições e a comparação com a referência"""
+    
+    def test_executar_mede_todas_as_funcoes(self):
+        """Testa uma execução curta em todos os métodos"""
+        medicoes = executar(['pequeno'], amostras=3, duracao_amostra=0.001)
+        assert [medicao.funcao for medicao in medicoes] == list(benchmark.FUNCOES)
+        for medicao in medicoes:
+            assert medicao.itens_por_segundo > 0
+            assert 0 < medicao.latencia_p50_us <= medicao.latencia_p90_us <= medicao.latencia_p99_us
+            assert medicao.memoria_pico_bytes >= 0
+            assert medicao.amostras == 3
+    
+    def test_latencias_por_chamada(self):
+        """Testa que os percentis vêm de chamadas isoladas, e não de médias de lotes"""
+        import time
+        
+        chamadas = [0]
+        def operacao():
+            # Uma chamada lenta a cada 20: some na média de um lote, não no p99
+            chamadas[0] += 1
+            if chamadas[0] % 20 == 0:
+                time.sleep(0.002)
+        
+        _, latencias, _ = benchmark.medir(operacao, 1, amostras=5, duracao_amostra=0.005)
+        assert len(latencias) <= benchmark.MAX_CHAMADAS_LATENCIA
+        assert benchmark._percentil(latencias, 0.50) < 1000
+        assert benchmark._percentil(latencias, 0.99) >= 2000
+    
+    def test_tamanho_desconhecido(self):
+        """Testa que tamanhos e métodos desconhecidos são rejeitados"""
+        with pytest.raises(ValueError):
+            executar(['enorme'])
+        with pytest.raises(ValueError):
+            executar(['pequeno'], ['gerar_nada'])
+    
+    def test_comparar_detecta_regressoes(self):
+        """Testa as regressões de vazão, latência e memória"""
+        referencia = {'pequeno/gerar_palavra': _medicao()}
+        assert comparar([_medicao(itens_por_segundo=900.0)], referencia) == []
+        regressoes = comparar([_medicao(itens_por_segundo=500.0, latencia_p50_us=20.0,
+                                        memoria_pico_bytes=1500)], referencia)
+        assert {regressao.metrica for regressao in regressoes} == {
+            'itens_por_segundo', 'latencia_p50_us', 'memoria_pico_bytes'
+        }
+        assert all(regressao.variacao > 0 for regressao in regressoes)
+        # Melhorias e medições sem referência não são regressões
+        assert comparar([_medicao(itens_por_segundo=5000.0, tamanho='padrao')], referencia) == []
+        assert comparar([_medicao(itens_por_segundo=5000.0)], referencia) == []
+    
+    def test_referencia_ida_e_volta(self, tmp_path):
+        """Testa gravar e carregar a referência"""
+        caminho = str(tmp_path / 'referencia.json')
+        benchmark.salvar_referencia(caminho, [_medicao()])
+        assert benchmark.carregar_referencia(caminho) == {'pequeno/gerar_palavra': _medicao()}
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({'versao': 0}, arquivo)
+        with pytest.raises(ValueError):
+            benchmark.carregar_referencia(caminho)
+    
+    def test_main_salva_e_compara(self, tmp_path, capsys):
+        """Testa a linha de comando, com e sem regressões"""
+        caminho = str(tmp_path / 'referencia.json')
+        argumentos = ['--tamanhos', 'pequeno', '--funcoes', 'gerar_palavra', '--amostras', '2',
+                      '--referencia', caminho]
+        assert benchmark.main(argumentos + ['--salvar']) == 0
+        assert benchmark.main(argumentos + ['--limite-tempo', '100']) == 0
+        
+        # Uma referência dez vezes mais rápida acusa regressão
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        dados['medicoes']['pequeno/gerar_palavra']['itens_por_segundo'] *= 10
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo)
+        assert benchmark.main(argumentos) == 1
+        assert 'itens_por_segundo' in capsys.readouterr().out
@@ -0,0 +1,116 @@
+"""
+Testes unitários para o cache incremental do léxico
+"""
+import pytest
+
+from cache_lexico import CacheLexico, calcular_diferenca, impressao_digital
+from gerador import GeradorEgera, compilar_inventario
+
+
+class TestImpressaoDigital:
+    """Testes para a impressão digital do inventário"""
+    
+    def test_ignora_ordem_e_pesos(self):
+        """Testa que a ordem das sílabas e os pesos não mudam a impressão digital"""
+        base = GeradorEgera(silabas_finais=['la', 'ta'])
+        invertido = GeradorEgera(silabas_finais=['ta', 'la'], pesos_finais={'la': 5})
+        assert impressao_digital(base.inventario) == impressao_digital(invertido.inventario)
+    
+    def test_muda_com_as_silabas(self):
+        """Testa que acrescentar uma sílaba muda a impressão digital"""
+        base = GeradorEgera(silabas_finais=['la', 'ta'])
+        maior = GeradorEgera(silabas_finais=['la', 'ta', 'ca'])
+        assert impressao_digital(base.inventario) != impressao_digital(maior.inventario)
+
+
+class TestCalcularDiferenca:
+    """Testes para a diferença entre os léxicos de dois inventários"""
+    
+    @pytest.mark.parametrize('antes, depois', [
+        ((['pró', 'fí'], ['tu', 'ma'], ['la']), (['pró', 'fí', 'sô'], ['tu', 'ma'], ['la'])),
+        ((['pró', 'fí'], ['tu', 'ma'], ['la', 'ta']), (['pró'], ['tu', 'ma', 'ni'], ['ta'])),
+        # Palavras que continuam formáveis por outra decomposição não mudam
+        ((['bá', 'bál'], ['lha', 'ha'], ['la']), (['bá', 'bál'], ['lha'], ['la'])),
+        ((['bá'], ['lha'], ['la']), (['bá', 'bál'], ['lha', 'ha'], ['la'])),
+    ])
+    def test_diferenca_igual_a_comparacao_completa(self, antes, depois):
+        """Testa a diferença contra a comparação dos léxicos inteiros"""
+        anterior = compilar_inventario(*(tuple(t) for t in antes))
+        atual = compilar_inventario(*(tuple(t) for t in depois))
+        adicionadas, removidas = calcular_diferenca(anterior, atual)
+        assert sorted(adicionadas) == sorted(set(atual) - set(anterior))
+        assert sorted(removidas) == sorted(set(anterior) - set(atual))
+    
+    def test_numero_de_silabas_diferente(self):
+        """Testa que inventários com tamanhos diferentes são rejeitados"""
+        with pytest.raises(ValueError):
+            calcular_diferenca(GeradorEgera().inventario, GeradorEgera(num_silabas=4).inventario)
+
+
+class TestCacheLexico:
+    """Testes para o léxico em cache no disco"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Fixture que retorna um cache em um diretório temporário"""
+        return CacheLexico(str(tmp_path / 'lexico.txt'))
+    
+    def test_primeira_sincronizacao_e_acerto(self, cache):
+        """Testa a geração completa seguida de um acerto"""
+        gerador = GeradorEgera(semente=1)
+        primeira = cache.sincronizar(gerador)
+        assert primeira.situacao == 'completa'
+        assert primeira.total == gerador.calcular_palavras_unicas()
+        assert sorted(cache.palavras()) == sorted(gerador.inventario)
+        
+        segunda = cache.sincronizar(GeradorEgera())
+        assert segunda.situacao == 'acerto'
+        assert segunda.total == primeira.total
+    
+    def test_acrescentar_silaba_anexa_so_a_diferenca(self, cache):
+        """Testa que uma sílaba nova só anexa as palavras novas, sem reembaralhar"""
+        gerador = GeradorEgera(semente=2)
+        cache.sincronizar(gerador)
+        antes = list(cache.palavras())
+        
+        gerador.silabas_tonicas = list(gerador.silabas_tonicas) + ['xó']
+        atualizacao = cache.sincronizar(gerador)
+        assert atualizacao.situacao == 'incremental'
+        assert atualizacao.removidas == []
+        assert len(atualizacao.adicionadas) == len(gerador.silabas_medias) * len(gerador.silabas_finais)
+        
+        depois = list(cache.palavras())
+        assert depois[:len(antes)] == antes
+        assert sorted(depois[len(antes):]) == sorted(atualizacao.adicionadas)
+        assert atualizacao.total == len(depois) == gerador.calcular_palavras_unicas()
+    
+    def test_retirar_silaba_remove_preservando_a_ordem(self, cache):
+        """Testa que retirar uma sílaba remove as palavras sem alterar a ordem das demais"""
+        gerador = GeradorEgera(semente=3)
+        cache.sincronizar(gerador)
+        antes = list(cache.palavras())
+        
+        gerador.silabas_finais = [silaba for silaba in gerador.silabas_finais if silaba != 'la']
+        atualizacao = cache.sincronizar(gerador)
+        assert atualizacao.situacao == 'incremental'
+        assert all(palavra.endswith('la') for palavra in atualizacao.removidas)
+        removidas = set(atualizacao.removidas)
+        assert list(cache.palavras()) == [palavra for palavra in antes if palavra not in removidas]
+        assert cache.sincronizar(gerador).situacao == 'acerto'
+    
+    def test_arquivo_alterado_invalida_o_cache(self, cache):
+        """Testa que um arquivo modificado por fora do cache é gerado de novo"""
+        gerador = GeradorEgera(silabas_finais=['la', 'ta'])
+        cache.sincronizar(gerador)
+        with open(cache.caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write('intrusa\n')
+        assert cache.impressao_digital() is None
+        assert cache.sincronizar(gerador).situacao == 'completa'
+        assert 'intrusa' not in set(cache.palavras())
+    
+    def test_numero_de_silabas_diferente_gera_de_novo(self, cache):
+        """Testa que mudar o número de sílabas refaz o léxico"""
+        cache.sincronizar(GeradorEgera(silabas_finais=['la']))
+        gerador = GeradorEgera(silabas_finais=['la'], num_silabas=4)
+        assert cache.sincronizar(gerador).situacao == 'completa'
+        assert sorted(cache.palavras()) == sorted(gerador.inventario)
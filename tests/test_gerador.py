@@ -142,6 +142,25 @@ class TestGeradorEgera:
                           for s in gerador.silabas_tonicas), \
                     f"Primeira sílaba {primeira_silaba} não está nas sílabas tônicas conhecidas"
     
+    def test_gerar_multiplas_unicas_sem_repeticao(self, gerador):
+        """Testa que gerar_multiplas com unicas=True não repete palavras"""
+        palavras = gerador.gerar_multiplas(2000, unicas=True)
+        assert len(palavras) == 2000
+        assert len(set(palavras)) == 2000
+        todas = set(gerador.gerar_todas_palavras_possiveis())
+        assert set(palavras) <= todas
+    
+    def test_gerar_multiplas_unicas_todas_as_palavras(self, gerador):
+        """Testa que é possível sortear exatamente todas as palavras únicas"""
+        total = gerador.calcular_palavras_unicas()
+        palavras = gerador.gerar_multiplas(total, unicas=True)
+        assert set(palavras) == set(gerador.gerar_todas_palavras_possiveis())
+    
+    def test_gerar_multiplas_unicas_acima_do_maximo(self, gerador):
+        """Testa que pedir mais palavras únicas que o possível gera ValueError"""
+        with pytest.raises(ValueError):
+            gerador.gerar_multiplas(gerador.calcular_palavras_unicas() + 1, unicas=True)
+    
     def test_gerar_multiplas_com_zero_retorna_lista_vazia(self, gerador):
         """Testa que gerar_multiplas(0) retorna lista vazia"""
         palavras = gerador.gerar_multiplas(0)
@@ -270,3 +289,553 @@ class TestIntegracao:
             assert len(palavras_arquivo) == len(palavras_geradas), \
                 f"Arquivo tem {len(palavras_arquivo)} palavras, mas deveria ter {len(palavras_geradas)}"
 
+
+
+class TestIndicePalavras:
+    """Testes para o índice combinatório de palavras únicas"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    def test_calcular_palavras_unicas(self, gerador):
+        """Testa que a contagem bate com a enumeração deduplicada"""
+        assert gerador.calcular_palavras_unicas() == len(gerador.gerar_todas_palavras_possiveis())
+    
+    def test_palavra_por_indice_cobre_todas_as_palavras(self, gerador):
+        """Testa que os índices percorrem todas as palavras sem repetição"""
+        total = gerador.calcular_palavras_unicas()
+        palavras = [gerador.palavra_por_indice(i) for i in range(total)]
+        
+        assert len(set(palavras)) == total
+        assert set(palavras) == set(gerador.gerar_todas_palavras_possiveis())
+    
+    def test_indice_da_palavra_inverte_palavra_por_indice(self, gerador):
+        """Testa que indice_da_palavra é o inverso de palavra_por_indice"""
+        total = gerador.calcular_palavras_unicas()
+        for indice in [0, 1, 37, total // 2, total - 1]:
+            palavra = gerador.palavra_por_indice(indice)
+            assert gerador.indice_da_palavra(palavra) == indice
+    
+    def test_palavra_por_indice_fora_do_intervalo(self, gerador):
+        """Testa que índices fora do intervalo geram IndexError"""
+        with pytest.raises(IndexError):
+            gerador.palavra_por_indice(gerador.calcular_palavras_unicas())
+        with pytest.raises(IndexError):
+            gerador.palavra_por_indice(-1)
+    
+    def test_indice_da_palavra_inexistente(self, gerador):
+        """Testa que palavras que não podem ser geradas geram ValueError"""
+        with pytest.raises(ValueError):
+            gerador.indice_da_palavra('casa')
+    
+    def test_indice_com_silabas_ambiguas(self, gerador):
+        """Testa o índice quando sílabas diferentes formam a mesma palavra"""
+        # 'bá' + 'lha' e 'bál' + 'ha' produzem a mesma palavra
+        gerador.silabas_tonicas = ['bá', 'bál', 'cá']
+        gerador.silabas_medias = ['lha', 'ha', 'ma', 'ma']
+        gerador.silabas_finais = ['la', 'ta']
+        
+        esperadas = set(gerador.gerar_todas_palavras_possiveis())
+        total = gerador.calcular_palavras_unicas()
+        palavras = [gerador.palavra_por_indice(i) for i in range(total)]
+        
+        assert total == len(esperadas)
+        assert set(palavras) == esperadas
+        for indice, palavra in enumerate(palavras):
+            assert gerador.indice_da_palavra(palavra) == indice
+
+
+class TestInventarioCompilado:
+    """Testes para o inventário de sílabas compilado"""
+    
+    def test_inventario_compartilhado_entre_instancias(self):
+        """Testa que geradores com as mesmas sílabas compartilham o inventário"""
+        assert GeradorEgera().inventario is GeradorEgera().inventario
+        
+        personalizado = GeradorEgera(silabas_finais=['la', 'ta'])
+        assert personalizado.inventario is not GeradorEgera().inventario
+        assert personalizado.inventario is GeradorEgera(silabas_finais=('la', 'ta')).inventario
+    
+    def test_construcao_barata(self, monkeypatch):
+        """Testa que construir um gerador não cria o gerador aleatório nem recompila"""
+        import random
+        import timeit
+        import gerador as modulo
+        
+        GeradorEgera()
+        def proibido(*args, **kwargs):
+            raise AssertionError("criado durante a construção")
+        monkeypatch.setattr(modulo, 'compilar_inventario', proibido)
+        monkeypatch.setattr(random, 'SystemRandom', proibido)
+        monkeypatch.setattr(random, 'Random', proibido)
+        GeradorEgera()
+        GeradorEgera(semente=7)
+        monkeypatch.undo()
+        
+        # Margem larga: antes do ajuste cada construção custava ~13 µs
+        custo = min(timeit.repeat(GeradorEgera, number=2000, repeat=5)) / 2000
+        assert custo < 10e-6
+        
+        # O fluxo criado no primeiro uso continua reprodutível
+        assert GeradorEgera(semente=7).gerar_palavra() == GeradorEgera(semente=7).gerar_palavra()
+    
+    def test_tabela_tonica_pre_acentuada(self):
+        """Testa que a tabela tônica compilada já está acentuada"""
+        gerador = GeradorEgera(silabas_tonicas=['ca', 'pro', 'fí'])
+        assert gerador.inventario.tabelas[0] == ('cá', 'pró', 'fí')
+        assert gerador.silabas_tonicas == ('ca', 'pro', 'fí')
+    
+    def test_tabelas_sem_repeticoes(self):
+        """Testa que as tabelas compiladas não têm sílabas repetidas"""
+        inventario = GeradorEgera().inventario
+        for tabela in inventario.tabelas:
+            assert len(tabela) == len(set(tabela))
+        # Repetições em listas personalizadas viram peso de sorteio
+        repetidas = GeradorEgera(silabas_medias=['tu', 'ma', 'ma']).inventario
+        assert repetidas.tabelas[1] == ('tu', 'ma')
+        assert repetidas.pesos_silabas[1] == (1.0, 2.0)
+    
+    def test_trocar_silabas_recompila(self):
+        """Testa que atribuir novas sílabas troca o inventário do gerador"""
+        gerador = GeradorEgera(silabas_finais=['la'])
+        gerador.silabas_medias = ['tu']
+        assert gerador.inventario.tabelas[1] == ('tu',)
+        for _ in range(10):
+            assert gerador.gerar_palavra().endswith('tula')
+
+    def test_indice_ambiguo_confere_com_forca_bruta(self):
+        """Testa índice, iteração e sombreamento contra a enumeração completa"""
+        from itertools import product
+        from gerador import InventarioCompilado
+
+        # Cortes ambíguos em posições diferentes, inclusive com realinhamento tardio
+        inventario = InventarioCompilado([
+            ('ca', 'cab', 'c'), ('ba', 'a', 'aba', 'b'), ('la', 'bla', 'ala', 'a'), ('ta', 'ata'),
+        ])
+        tabelas = inventario.tabelas
+        canonicas = {}
+        for tupla in product(*(range(len(tabela)) for tabela in tabelas)):
+            canonicas.setdefault(''.join(t[i] for t, i in zip(tabelas, tupla)), tupla)
+        tuplas = sorted(canonicas.values())
+        palavras = [''.join(t[i] for t, i in zip(tabelas, tupla)) for tupla in tuplas]
+
+        assert inventario.padroes
+        assert len(inventario) == len(tuplas)
+        assert list(inventario) == palavras
+        assert list(inventario.iterar_tuplas(5)) == tuplas[5:]
+        for indice, (tupla, palavra) in enumerate(zip(tuplas, palavras)):
+            assert inventario.tupla(indice) == tupla
+            assert inventario.indice(palavra) == indice
+        for tupla in product(*(range(len(tabela)) for tabela in tabelas)):
+            assert inventario.sombreada(tupla) == (tupla not in set(tuplas))
+
+
+class TestValidacaoLote:
+    """Testes para a validação de palavras em lote"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    def test_validar_lote_coincide_com_validacao_individual(self, gerador):
+        """Testa que o lote aplica a mesma regra de validar_proparoxitona"""
+        palavras = gerador.gerar_multiplas(500) + ['casa', 'computador', 'cá', 'Prótula']
+        resultado = gerador.validar_lote(palavras)
+        
+        esperadas = [palavra for palavra in palavras if not gerador.validar_proparoxitona(palavra)]
+        assert resultado.total == len(palavras)
+        assert resultado.validas == len(palavras) - len(esperadas)
+        assert [palavra for _, palavra in resultado.invalidas] == esperadas
+    
+    def test_validar_lote_numera_linhas_e_ignora_em_branco(self, gerador):
+        """Testa a numeração das linhas inválidas e o descarte de linhas vazias"""
+        resultado = gerador.validar_lote(['prótula\n', '\n', 'casa\n', '  fíbrala  \n', 'cá'])
+        assert resultado.total == 4
+        assert resultado.validas == 2
+        assert resultado.invalidas == [(3, 'casa'), (5, 'cá')]
+    
+    def test_validar_arquivo(self, gerador, tmp_path):
+        """Testa a validação de um arquivo com uma palavra por linha"""
+        arquivo = tmp_path / 'apelidos.txt'
+        arquivo.write_text('prótula\ncasa\nfíbrala\n', encoding='utf-8')
+        resultado = gerador.validar_arquivo(str(arquivo))
+        assert (resultado.total, resultado.validas, resultado.invalidas) == (3, 2, [(2, 'casa')])
+    
+    def test_validar_lote_limita_invalidas_guardadas(self, gerador):
+        """Testa que max_invalidas limita a lista sem alterar as contagens"""
+        resultado = gerador.validar_lote(['casa', 'prótula', 'cá', 'mesa'], max_invalidas=1)
+        assert (resultado.total, resultado.validas, resultado.invalidas) == (4, 1, [(1, 'casa')])
+        assert gerador.validar_lote(['casa', 'cá'], max_invalidas=0).invalidas == []
+
+
+class TestDecomposicao:
+    """Testes para a consulta de pertinência e decomposição de palavras"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    def test_contem_todas_as_palavras_geradas(self, gerador):
+        """Testa que contem reconhece todas as palavras do gerador"""
+        assert all(gerador.contem(palavra) for palavra in gerador.iterar_palavras_unicas())
+    
+    def test_contem_rejeita_palavras_externas(self, gerador):
+        """Testa que contem rejeita palavras que o gerador não produz"""
+        for palavra in ['casa', 'égera', 'prótul', 'prótulaa', '', 'PRÓTULA']:
+            assert not gerador.contem(palavra), f"Palavra {palavra} não deveria ser reconhecida"
+    
+    def test_decompor_palavra_simples(self, gerador):
+        """Testa a decomposição de uma palavra com uma única combinação"""
+        assert gerador.decompor('prótula') == [('pró', 'tu', 'la')]
+        assert gerador.decompor('casa') == []
+    
+    def test_decompor_palavra_ambigua(self):
+        """Testa que todas as combinações de uma palavra ambígua são listadas"""
+        gerador = GeradorEgera(
+            silabas_tonicas=['bá', 'bál'],
+            silabas_medias=['lha', 'ha'],
+            silabas_finais=['la'],
+        )
+        assert sorted(gerador.decompor('bálhala')) == [('bá', 'lha', 'la'), ('bál', 'ha', 'la')]
+        assert gerador.contem('bálhala')
+
+
+class TestContagemPalavrasUnicas:
+    """Testes para a contagem exata de palavras distintas"""
+    
+    @pytest.mark.parametrize('tonicas, medias, finais', [
+        (['pró', 'fí'], ['tu', 'ma', 'ma'], ['la', 'ca', 'ca']),
+        (['bá', 'bál'], ['lha', 'ha', 'a'], ['la', 'hala']),
+        (['cá', 'cáb'], ['b', 'bb', 'ba'], ['a', 'ba', 'aba', 'bab']),
+    ])
+    def test_contagem_igual_a_enumeracao(self, tonicas, medias, finais):
+        """Testa a contagem com sílabas repetidas e cortes ambíguos"""
+        from itertools import product
+        gerador = GeradorEgera(tonicas, medias, finais)
+        distintas = {''.join(partes) for partes in product(*gerador.inventario.tabelas)}
+        assert gerador.calcular_palavras_unicas() == len(distintas)
+    
+    def test_contagem_do_inventario_padrao(self):
+        """Testa a contagem com as sílabas padrão"""
+        gerador = GeradorEgera()
+        assert gerador.calcular_palavras_unicas() == 26862
+        # As listas padrão não têm repetições nem cortes ambíguos
+        assert gerador.calcular_palavras_unicas() == gerador.calcular_maximo_palavras()
+    
+    def test_contagem_de_espaco_grande(self):
+        """Testa que espaços grandes são contados sem enumerar as combinações"""
+        silabas = [c + v for c in 'bcdfglmnprstv' for v in 'aeiou']
+        gerador = GeradorEgera(silabas, silabas + ['b', 'l'], silabas + ['la'])
+        # 65 * 67 * 66 combinações; 'b' e 'l' criam cortes ambíguos
+        assert 0 < gerador.calcular_palavras_unicas() < 65 * 67 * 66
+        assert gerador.calcular_palavras_unicas() == len(set(gerador.iterar_palavras_unicas()))
+    
+    def test_main_rejeita_quantidade_acima_das_unicas(self, monkeypatch, capsys):
+        """Testa que main valida a entrada contra o número de palavras únicas"""
+        import gerador as modulo
+        unicas = GeradorEgera().calcular_palavras_unicas()
+        monkeypatch.setattr('builtins.input', lambda _: str(unicas + 1))
+        assert modulo.main([]) == 1
+        assert f"o máximo possível é {unicas:,}" in capsys.readouterr().out
+
+
+class TestNumeroDeSilabas:
+    """Testes para palavras com mais de três sílabas"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna um gerador de palavras de 4 sílabas"""
+        return GeradorEgera(
+            silabas_tonicas=['pró', 'fí', 'cá'],
+            silabas_medias=['tu', 'ma', 'la'],
+            silabas_finais=['la', 'ta'],
+            num_silabas=4,
+        )
+    
+    def test_posicoes_medias_repetidas(self, gerador):
+        """Testa que cada sílaba extra é uma nova posição média"""
+        assert len(gerador.inventario.tabelas) == 4
+        assert gerador.calcular_maximo_palavras() == 3 * 3 * 3 * 2
+        assert gerador.calcular_palavras_unicas() == 3 * 3 * 3 * 2
+    
+    def test_palavras_geradas_tem_quatro_silabas(self, gerador):
+        """Testa que as palavras geradas têm 4 sílabas e são validadas como tal"""
+        for _ in range(20):
+            palavra = gerador.gerar_palavra()
+            assert len(re.findall(r'[aeiouáéíóú]', palavra)) == 4
+            assert gerador.validar_proparoxitona(palavra)
+        assert not gerador.validar_proparoxitona('prótula')
+        assert GeradorEgera().validar_proparoxitona('prótula')
+    
+    def test_num_silabas_invalido(self):
+        """Testa que menos de 3 sílabas gera ValueError"""
+        with pytest.raises(ValueError):
+            GeradorEgera(num_silabas=2)
+    
+    def test_trocar_silabas_medias_afeta_todas_as_posicoes(self, gerador):
+        """Testa que atribuir silabas_medias troca todas as posições médias"""
+        gerador.silabas_medias = ['ni']
+        assert gerador.inventario.tabelas[1] == gerador.inventario.tabelas[2] == ('ni',)
+        assert gerador.gerar_palavra()[-6:-2] == 'nini'
+    
+    def test_iterar_a_partir_de_deslocamento(self, gerador):
+        """Testa que a enumeração pode começar em qualquer posição"""
+        todas = list(gerador.iterar_palavras_unicas())
+        assert todas == [gerador.palavra_por_indice(i) for i in range(len(todas))]
+        for inicio in (0, 1, 17, len(todas) - 1, len(todas)):
+            assert list(gerador.iterar_palavras_unicas(inicio=inicio)) == todas[inicio:]
+    
+    def test_iterar_blocos_retomavel(self, gerador):
+        """Testa que blocos interrompidos podem ser retomados pelo total recebido"""
+        todas = list(gerador.iterar_palavras_unicas(embaralhar=True, semente=9))
+        blocos = gerador.iterar_blocos(10, embaralhar=True, semente=9)
+        recebidas = next(blocos) + next(blocos)
+        
+        retomada = gerador.iterar_blocos(10, inicio=len(recebidas), embaralhar=True, semente=9)
+        for bloco in retomada:
+            assert len(bloco) <= 10
+            recebidas.extend(bloco)
+        assert recebidas == todas
+
+
+class TestSementeEFluxos:
+    """Testes para o gerador aleatório por instância e fluxos derivados"""
+    
+    def test_mesma_semente_reproduz_palavras(self):
+        """Testa que a mesma semente produz a mesma sequência"""
+        primeiro = GeradorEgera(semente=123)
+        segundo = GeradorEgera(semente=123)
+        assert primeiro.gerar_multiplas(50) == segundo.gerar_multiplas(50)
+        assert primeiro.gerar_multiplas(50, unicas=True) == segundo.gerar_multiplas(50, unicas=True)
+    
+    def test_estado_global_nao_interfere(self):
+        """Testa que o módulo random global não afeta nem é afetado pela instância"""
+        import random
+        esperadas = GeradorEgera(semente=5).gerar_multiplas(20)
+        
+        gerador = GeradorEgera(semente=5)
+        random.seed(0)
+        antes = random.random()
+        random.seed(0)
+        assert gerador.gerar_multiplas(20) == esperadas
+        assert random.random() == antes
+    
+    def test_derivar_fluxos_reprodutiveis_e_distintos(self):
+        """Testa que filhos derivados são reprodutíveis e diferentes entre si"""
+        filhos = GeradorEgera(semente=7).derivar(4)
+        repetidos = GeradorEgera(semente=7).derivar(4)
+        
+        sequencias = [filho.gerar_multiplas(30) for filho in filhos]
+        assert sequencias == [filho.gerar_multiplas(30) for filho in repetidos]
+        assert len({tuple(sequencia) for sequencia in sequencias}) == 4
+    
+    def test_derivar_novamente_gera_novos_fluxos(self):
+        """Testa que chamadas sucessivas a derivar não repetem fluxos"""
+        pai = GeradorEgera(semente=7)
+        primeiro = pai.derivar(1)[0].gerar_multiplas(30)
+        segundo = pai.derivar(1)[0].gerar_multiplas(30)
+        assert primeiro != segundo
+    
+    def test_filhos_em_threads(self):
+        """Testa que filhos usados em threads produzem o mesmo que em sequência"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        esperadas = [filho.gerar_multiplas(200) for filho in GeradorEgera(semente=11).derivar(4)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            obtidas = list(executor.map(lambda filho: filho.gerar_multiplas(200),
+                                        GeradorEgera(semente=11).derivar(4)))
+        assert obtidas == esperadas
+
+
+class TestPesosSilabas:
+    """Testes para o sorteio de sílabas com pesos"""
+    
+    def test_pesos_padrao(self):
+        """Testa que as sílabas preferidas padrão têm peso maior"""
+        inventario = GeradorEgera().inventario
+        medias = dict(zip(inventario.tabelas[1], inventario.pesos_silabas[1]))
+        finais = dict(zip(inventario.tabelas[2], inventario.pesos_silabas[2]))
+        assert medias['ma'] == 3 and medias['tu'] == 1
+        assert finais['ca'] == finais['ga'] == 2 and finais['la'] == 1
+    
+    def test_frequencias_seguem_os_pesos(self):
+        """Testa que as frequências observadas acompanham os pesos"""
+        from collections import Counter
+        gerador = GeradorEgera(
+            silabas_tonicas=['pró'],
+            silabas_medias=['tu'],
+            silabas_finais=['la', 'ta', 'ca', 'ga'],
+            pesos_finais={'la': 1, 'ta': 2, 'ca': 0, 'ga': 5},
+            semente=3,
+        )
+        contagem = Counter(palavra[-2:] for palavra in gerador.gerar_multiplas(8000))
+        assert 'ca' not in contagem
+        for silaba, peso in (('la', 1), ('ta', 2), ('ga', 5)):
+            assert abs(contagem[silaba] / 8000 - peso / 8) < 0.02
+    
+    def test_tabela_alias_sem_desvio(self):
+        """Testa que a tabela de alias reproduz exatamente os pesos"""
+        from gerador import _TabelaAlias
+        pesos = [1, 7, 0, 2, 10]
+        tabela = _TabelaAlias('abcde', pesos)
+        n = len(pesos)
+        massa = [0.0] * n
+        for i in range(n):
+            massa[i] += tabela.probabilidades[i] / n
+            massa[tabela.aliases[i]] += (1 - tabela.probabilidades[i]) / n
+        for obtida, peso in zip(massa, pesos):
+            assert obtida == pytest.approx(peso / sum(pesos))
+    
+    def test_pesos_nao_mudam_as_palavras_possiveis(self):
+        """Testa que os pesos afetam só o sorteio, não o léxico"""
+        uniforme = GeradorEgera(silabas_medias=['tu', 'ma'])
+        ponderado = GeradorEgera(silabas_medias=['tu', 'ma'], pesos_medias={'ma': 10})
+        assert ponderado.calcular_palavras_unicas() == uniforme.calcular_palavras_unicas()
+        assert ponderado.palavra_por_indice(5) == uniforme.palavra_por_indice(5)
+    
+    def test_peso_pela_grafia_acentuada(self):
+        """Testa que as tônicas aceitam pesos pela grafia original ou acentuada"""
+        por_original = GeradorEgera(silabas_tonicas=['ca', 'pro'], pesos_tonicas={'ca': 4})
+        por_acentuada = GeradorEgera(silabas_tonicas=['ca', 'pro'], pesos_tonicas={'cá': 4})
+        assert por_original.inventario.pesos_silabas[0] == (4.0, 1.0)
+        assert por_acentuada.inventario.pesos_silabas[0] == (4.0, 1.0)
+    
+    @pytest.mark.parametrize('pesos', [{'la': -1}, {'xx': 2}, {'la': 0, 'ta': 0}])
+    def test_pesos_invalidos(self, pesos):
+        """Testa que pesos negativos, desconhecidos ou todos zero são rejeitados"""
+        with pytest.raises(ValueError):
+            GeradorEgera(silabas_finais=['la', 'ta'], pesos_finais=pesos)
+    
+    def test_trocar_silabas_mantem_pesos_das_outras_posicoes(self):
+        """Testa que trocar uma posição só zera os pesos dela"""
+        gerador = GeradorEgera()
+        gerador.silabas_finais = ['la', 'ta']
+        assert gerador.inventario.pesos_silabas[2] == (1.0, 1.0)
+        medias = dict(zip(gerador.inventario.tabelas[1], gerador.inventario.pesos_silabas[1]))
+        assert medias['ma'] == 3
+
+
+class TestConsultaPalavras:
+    """Testes para a consulta de palavras por restrições de forma"""
+    
+    @pytest.mark.parametrize('restricoes', [
+        {'sufixo': 'nha'},
+        {'prefixo': 'str', 'tamanho_max': 8},
+        {'padrao': 'pró??la'},
+        {'tamanho_min': 10},
+        {'prefixo': 'pá', 'sufixo': 'a', 'tamanho_min': 7, 'tamanho_max': 7},
+    ])
+    def test_consulta_igual_ao_filtro(self, restricoes):
+        """Testa que a consulta coincide com filtrar todas as palavras"""
+        gerador = GeradorEgera()
+        consulta = gerador.consultar(**restricoes)
+        esperadas = [palavra for palavra in gerador.inventario if consulta.aceita(palavra)]
+        assert list(consulta) == esperadas
+        assert consulta.contar() == len(esperadas)
+    
+    @pytest.mark.parametrize('tonicas, medias, finais', [
+        (['bá', 'bál'], ['lha', 'ha', 'a'], ['la', 'hala']),
+        (['cá', 'cáb'], ['b', 'bb', 'ba'], ['a', 'ba', 'aba', 'bab']),
+    ])
+    def test_consulta_com_cortes_ambiguos(self, tonicas, medias, finais):
+        """Testa que palavras com várias decomposições contam uma única vez"""
+        gerador = GeradorEgera(tonicas, medias, finais)
+        for restricoes in ({'sufixo': 'a'}, {'tamanho_max': 6}, {'padrao': '???a??'}):
+            consulta = gerador.consultar(**restricoes)
+            esperadas = [palavra for palavra in gerador.inventario if consulta.aceita(palavra)]
+            assert list(consulta) == esperadas
+            assert consulta.contar() == len(esperadas)
+            assert set(consulta.sortear(200)) <= set(esperadas)
+    
+    def test_sorteio_uniforme_com_cortes_ambiguos(self):
+        """Testa que uma palavra com várias decomposições não é sorteada com mais frequência"""
+        from collections import Counter
+        gerador = GeradorEgera(['cá', 'cáb'], ['b', 'bb', 'ba'], ['a', 'ba', 'aba', 'bab'], semente=5)
+        consulta = gerador.consultar(sufixo='a')
+        contagem = Counter(consulta.sortear(8000))
+        esperado = 8000 / consulta.contar()
+        assert set(contagem) == set(consulta)
+        assert all(abs(vezes - esperado) < esperado * 0.5 for vezes in contagem.values())
+    
+    def test_sorteio_uniforme(self):
+        """Testa que o sorteio cobre as palavras da consulta por igual"""
+        from collections import Counter
+        gerador = GeradorEgera(semente=4)
+        consulta = gerador.consultar(prefixo='pró', sufixo='nha')
+        contagem = Counter(consulta.sortear(6000))
+        assert set(contagem) == set(consulta)
+        esperado = 6000 / consulta.contar()
+        assert all(abs(vezes - esperado) < esperado * 0.5 for vezes in contagem.values())
+    
+    def test_sorteio_reprodutivel(self):
+        """Testa que o sorteio usa o gerador aleatório da instância"""
+        primeiro = GeradorEgera(semente=8).consultar(sufixo='la').sortear(20)
+        assert primeiro == GeradorEgera(semente=8).consultar(sufixo='la').sortear(20)
+    
+    def test_consulta_vazia(self):
+        """Testa uma consulta sem palavras"""
+        consulta = GeradorEgera().consultar(prefixo='xyz')
+        assert consulta.contar() == 0
+        assert list(consulta) == []
+        with pytest.raises(ValueError):
+            consulta.sortear()
+    
+    def test_consulta_em_espaco_grande(self):
+        """Testa que a contagem não depende do tamanho do espaço completo"""
+        gerador = GeradorEgera(num_silabas=6)
+        consulta = gerador.consultar(prefixo='scrá', sufixo='nha', tamanho_max=16)
+        assert consulta.contar() == 639009
+        assert all(consulta.aceita(palavra) and gerador.contem(palavra)
+                   for palavra in consulta.sortear(50))
+
+
+class TestLinhaDeComando:
+    """Testes para a linha de comando não interativa"""
+    
+    def test_saida_padrao_reprodutivel(self, capsys):
+        """Testa que --count e --seed reproduzem gerar_multiplas"""
+        from gerador import main
+        assert main(['--count', '25', '--seed', '4']) == 0
+        assert capsys.readouterr().out.splitlines() == GeradorEgera(semente=4).gerar_multiplas(25)
+    
+    def test_unicas_sem_repeticao(self, capsys):
+        """Testa que --unique produz as mesmas palavras de gerar_multiplas(unicas=True)"""
+        from gerador import main
+        assert main(['-n', '500', '-u', '-s', '9']) == 0
+        palavras = capsys.readouterr().out.splitlines()
+        assert palavras == GeradorEgera(semente=9).gerar_multiplas(500, unicas=True)
+        assert len(set(palavras)) == 500
+    
+    def test_arquivo_em_blocos(self, tmp_path, monkeypatch):
+        """Testa a gravação em arquivo com mais palavras que um bloco"""
+        import gerador as modulo
+        monkeypatch.setattr(modulo, 'TAMANHO_BLOCO_SAIDA', 100)
+        caminho = tmp_path / 'apelidos.csv'
+        assert modulo.main(['-n', '250', '-s', '1', '-o', str(caminho)]) == 0
+        linhas = caminho.read_text(encoding='utf-8').splitlines()
+        assert linhas[0] == 'palavra'
+        assert linhas[1:] == GeradorEgera(semente=1).gerar_multiplas(250)
+    
+    def test_formato_explicito(self, capsys):
+        """Testa --format jsonl na saída padrão"""
+        import json
+        from gerador import main
+        assert main(['-n', '3', '-s', '2', '--format', 'jsonl']) == 0
+        registros = [json.loads(linha) for linha in capsys.readouterr().out.splitlines()]
+        assert [registro['palavra'] for registro in registros] == GeradorEgera(semente=2).gerar_multiplas(3)
+    
+    @pytest.mark.parametrize('argumentos', [
+        ['-n', '-1'],
+        ['-n', '30000', '--unique'],
+        ['-n', '5', '-o', 'apelidos.xml'],
+    ])
+    def test_argumentos_invalidos(self, argumentos, capsys):
+        """Testa que argumentos inválidos encerram com erro de uso"""
+        from gerador import main
+        with pytest.raises(SystemExit) as erro:
+            main(argumentos)
+        assert erro.value.code == 2
@@ -0,0 +1,77 @@
+"""
+Testes unitários para o motor de geração em lote
+"""
+import numpy as np
+import pytest
+
+from gerador import GeradorEgera
+from gerador_lote import GeradorLote
+
+
+class TestGeradorLote:
+    """Testes para a classe GeradorLote"""
+    
+    @pytest.fixture
+    def lote(self):
+        """Fixture que retorna um GeradorLote com semente fixa"""
+        return GeradorLote(semente=42)
+    
+    def test_gerar_quantidade_correta(self, lote):
+        """Testa que o lote tem a quantidade solicitada de palavras"""
+        resultado = lote.gerar(1000)
+        assert len(resultado) == 1000
+        assert resultado.codigos.shape == (1000, 3)
+        assert len(resultado.palavras()) == 1000
+    
+    def test_codigos_compactos(self, lote):
+        """Testa que os códigos usam o menor tipo inteiro suficiente"""
+        assert lote.gerar(10).codigos.dtype == np.uint8
+    
+    @pytest.mark.parametrize('tamanho, tipo', [(256, np.uint8), (257, np.uint16), (70_000, np.uint32)])
+    def test_tipo_dos_codigos_pelo_tamanho_da_tabela(self, tamanho, tipo):
+        """Testa que tabelas com mais de 65535 sílabas não estouram o tipo dos códigos"""
+        finais = [f'l{i}a' for i in range(tamanho)]
+        gerador = GeradorEgera(silabas_tonicas=['pró'], silabas_medias=['tu'], silabas_finais=finais)
+        resultado = GeradorLote(gerador, semente=1).gerar(2000)
+        assert resultado.codigos.dtype == tipo
+        assert int(resultado.codigos[:, 2].max()) >= 255
+        assert set(resultado.palavras()) <= {'prótu' + final for final in finais}
+    
+    def test_palavras_pertencem_ao_gerador(self, lote):
+        """Testa que as palavras do lote podem ser geradas pelo GeradorEgera"""
+        todas = set(GeradorEgera().gerar_todas_palavras_possiveis())
+        palavras = lote.gerar_palavras(5000)
+        assert set(palavras) <= todas
+    
+    def test_acesso_individual_igual_a_conversao(self, lote):
+        """Testa que o acesso por posição coincide com a conversão em lote"""
+        resultado = lote.gerar(50)
+        palavras = resultado.palavras()
+        for posicao in range(50):
+            assert resultado[posicao] == palavras[posicao]
+    
+    def test_semente_reprodutivel(self):
+        """Testa que a mesma semente produz o mesmo lote"""
+        assert GeradorLote(semente=7).gerar_palavras(100) == GeradorLote(semente=7).gerar_palavras(100)
+    
+    def test_gerar_blocos(self, lote):
+        """Testa que gerar_blocos respeita o tamanho máximo e o total"""
+        blocos = list(lote.gerar_blocos(2500, tamanho_bloco=1000))
+        assert [len(bloco) for bloco in blocos] == [1000, 1000, 500]
+    
+    def test_lote_vazio(self, lote):
+        """Testa que um lote vazio não gera palavras"""
+        assert lote.gerar_palavras(0) == []
+    
+    def test_frequencias_seguem_os_pesos(self):
+        """Testa que o lote sorteia as sílabas de acordo com os pesos"""
+        gerador = GeradorEgera(
+            silabas_tonicas=['pró'],
+            silabas_medias=['tu'],
+            silabas_finais=['la', 'ta', 'ca'],
+            pesos_finais={'la': 1, 'ta': 3, 'ca': 0},
+        )
+        codigos = GeradorLote(gerador, semente=1).gerar(40_000).codigos[:, 2]
+        frequencias = np.bincount(codigos, minlength=3) / len(codigos)
+        assert frequencias[2] == 0
+        assert frequencias[:2] == pytest.approx([0.25, 0.75], abs=0.01)
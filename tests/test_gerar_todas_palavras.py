@@ -0,0 +1,167 @@
+"""
+Testes para a exportação em fluxo do script gerar_todas_palavras
+"""
+import gzip
+import json
+
+import pytest
+
+from gerador import GeradorEgera
+from gerar_todas_palavras import exportar_palavras, formato_do_arquivo
+
+
+class TestExportacao:
+    """Testes para a exportação das palavras em arquivos"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    def test_iterar_palavras_unicas_cobre_todas(self, gerador):
+        """Testa que o iterador percorre todas as palavras únicas"""
+        palavras = list(gerador.iterar_palavras_unicas())
+        assert len(palavras) == len(set(palavras))
+        assert set(palavras) == set(gerador.gerar_todas_palavras_possiveis())
+    
+    def test_iterar_palavras_unicas_embaralhado_com_semente(self, gerador):
+        """Testa que o embaralhamento com semente é reprodutível e completo"""
+        primeira = list(gerador.iterar_palavras_unicas(embaralhar=True, semente=3))
+        segunda = list(gerador.iterar_palavras_unicas(embaralhar=True, semente=3))
+        assert primeira == segunda
+        assert primeira != list(gerador.iterar_palavras_unicas())
+        assert set(primeira) == set(gerador.gerar_todas_palavras_possiveis())
+    
+    def test_exportar_varios_formatos_em_uma_passagem(self, gerador, tmp_path):
+        """Testa que todos os formatos recebem as mesmas palavras"""
+        caminhos = [str(tmp_path / nome) for nome in
+                    ('p.txt', 'p.csv', 'p.jsonl', 'p.txt.gz')]
+        palavras = list(gerador.iterar_palavras_unicas(embaralhar=True, semente=1))
+        
+        total = exportar_palavras(iter(palavras), caminhos, tamanho_bloco=1000)
+        assert total == len(palavras)
+        
+        with open(caminhos[0], encoding='utf-8') as f:
+            assert f.read().splitlines() == palavras
+        with open(caminhos[1], encoding='utf-8') as f:
+            linhas = f.read().splitlines()
+            assert linhas[0] == 'palavra'
+            assert linhas[1:] == palavras
+        with open(caminhos[2], encoding='utf-8') as f:
+            assert [json.loads(linha)['palavra'] for linha in f] == palavras
+        with gzip.open(caminhos[3], 'rt', encoding='utf-8') as f:
+            assert f.read().splitlines() == palavras
+    
+    def test_formato_desconhecido(self):
+        """Testa que extensões desconhecidas geram ValueError"""
+        assert formato_do_arquivo('lexico.jsonl.gz') == 'jsonl'
+        with pytest.raises(ValueError):
+            formato_do_arquivo('lexico.xml')
+    
+    def test_exportar_ordenado_paralelo_identico_ao_sequencial(self, tmp_path):
+        """Testa que a exportação em processos gera os mesmos bytes da sequencial"""
+        from gerar_todas_palavras import exportar_ordenado
+        
+        gerador = GeradorEgera(
+            silabas_tonicas=['bá', 'bál', 'pró', 'fí'],
+            silabas_medias=['lha', 'ha', 'tu', 'ma', 'ma'],
+            silabas_finais=['la', 'ta', 'ca'],
+            num_silabas=4,
+        )
+        sequencial = tmp_path / 'sequencial.txt'
+        paralelo = tmp_path / 'paralelo.txt'
+        
+        total = exportar_ordenado(gerador, [str(sequencial)], processos=1)
+        assert exportar_ordenado(gerador, [str(paralelo)], processos=2) == total
+        
+        assert total == gerador.calcular_palavras_unicas()
+        assert paralelo.read_bytes() == sequencial.read_bytes()
+        palavras = sequencial.read_text(encoding='utf-8').splitlines()
+        assert palavras == sorted(set(palavras))
+    
+    def test_exportar_ordenado_em_todos_os_formatos(self, tmp_path):
+        """Testa que os trechos concatenados formam arquivos válidos em cada formato"""
+        from gerar_todas_palavras import _agrupar_tonicas, exportar_ordenado
+        
+        assert _agrupar_tonicas(['pró', 'bál', 'fí', 'bá', 'bálu']) == [['bá', 'bál', 'bálu'], ['fí'], ['pró']]
+        
+        gerador = GeradorEgera(
+            silabas_tonicas=['bá', 'bál', 'pró', 'fí'],
+            silabas_medias=['lha', 'ha', 'tu'],
+            silabas_finais=['la', 'ta'],
+        )
+        caminhos = [str(tmp_path / nome) for nome in ('o.txt', 'o.csv.gz', 'o.jsonl')]
+        total = exportar_ordenado(gerador, caminhos, processos=2)
+        esperadas = sorted(set(gerador.gerar_todas_palavras_possiveis()))
+        assert total == len(esperadas)
+        
+        with open(caminhos[0], encoding='utf-8') as f:
+            assert f.read().splitlines() == esperadas
+        with gzip.open(caminhos[1], 'rt', encoding='utf-8') as f:
+            assert f.read().splitlines() == ['palavra'] + esperadas
+        with open(caminhos[2], encoding='utf-8') as f:
+            assert [json.loads(linha)['palavra'] for linha in f] == esperadas
+    
+    def test_exportar_ordenado_rejeita_processos_invalidos(self, tmp_path):
+        """Testa que zero ou menos processos geram ValueError"""
+        from gerar_todas_palavras import exportar_ordenado
+        
+        for processos in (0, -2):
+            with pytest.raises(ValueError):
+                exportar_ordenado(GeradorEgera(), [str(tmp_path / 'lexico.txt')], processos=processos)
+    
+    def test_main_rejeita_processos_invalidos(self):
+        """Testa que --processos 0 é um erro de linha de comando"""
+        from gerar_todas_palavras import main
+        
+        with pytest.raises(SystemExit) as saida:
+            main(['--ordenado', '--processos', '0'])
+        assert saida.value.code == 2
+    
+    def test_main_ordenado_regrava_o_lexico_binario(self, tmp_path, monkeypatch):
+        """Testa que --ordenado não deixa para trás um léxico binário de outra exportação"""
+        from gerar_todas_palavras import main
+        from lexico import LexicoBinario, escrever_lexico_binario
+        
+        monkeypatch.chdir(tmp_path)
+        antigo = GeradorEgera(['bá'], ['tu'], ['la'])
+        escrever_lexico_binario('palavras_completas.bin', antigo.inventario, list(antigo.inventario))
+        
+        main(['--ordenado', '--processos', '1'])
+        palavras = (tmp_path / 'palavras_completas.txt').read_text(encoding='utf-8').splitlines()
+        assert palavras == sorted(palavras)
+        with LexicoBinario('palavras_completas.bin') as lexico:
+            assert list(lexico) == palavras
+    
+    def test_derivados_acompanham_o_cache(self, tmp_path):
+        """Testa que o CSV e o léxico binário recebem só a diferença ao acrescentar sílabas"""
+        import csv
+        from cache_lexico import CacheLexico
+        from gerar_todas_palavras import atualizar_derivados
+        from lexico import LexicoBinario
+        
+        txt, arquivo_csv, arquivo_bin = (str(tmp_path / nome) for nome in ('l.txt', 'l.csv', 'l.bin'))
+        cache = CacheLexico(txt)
+        
+        def sincronizar(gerador):
+            atualizacao = cache.sincronizar(gerador, semente=1)
+            regravados = atualizar_derivados(atualizacao, cache, gerador.inventario, arquivo_csv, arquivo_bin)
+            esperadas = list(cache.palavras())
+            with open(arquivo_csv, encoding='utf-8', newline='') as arquivo:
+                assert [linha[0] for linha in csv.reader(arquivo)] == ['palavra'] + esperadas
+            with LexicoBinario(arquivo_bin) as lexico:
+                assert list(lexico) == esperadas
+                assert all(palavra in lexico for palavra in esperadas)
+            return regravados
+        
+        assert sincronizar(GeradorEgera(['pró', 'bá'], ['ha', 'tu'], ['la'])) is True
+        assert sincronizar(GeradorEgera(['pró', 'bá'], ['ha', 'tu'], ['la'])) is False
+        marca = tmp_path / 'l.bin'
+        antes = marca.read_bytes()
+        assert sincronizar(GeradorEgera(['pró', 'bá', 'bál'], ['ha', 'tu', 'lha'], ['la', 'ta'])) is False
+        # Os registros anteriores ficam intactos no início do arquivo
+        depois = marca.read_bytes()
+        cabecalho, registros = 28, 4 * 3
+        assert depois[cabecalho:cabecalho + registros] == antes[cabecalho:cabecalho + registros]
+        # Remoções regravam os derivados a partir do TXT
+        assert sincronizar(GeradorEgera(['pró', 'bál'], ['ha', 'tu', 'lha'], ['la', 'ta'])) is True
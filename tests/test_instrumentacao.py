@@ -0,0 +1,98 @@
+"""
+Testes unitários para a instrumentação do gerador
+"""
+import json
+import pickle
+
+import pytest
+
+from gerador import GeradorEgera
+from instrumentacao import Instrumentacao
+
+
+class TestInstrumentacao:
+    """Testes para a classe Instrumentacao"""
+    
+    @pytest.fixture
+    def instrumentacao(self):
+        """Fixture que retorna uma Instrumentacao vazia"""
+        return Instrumentacao()
+    
+    def test_conta_chamadas_e_palavras(self, instrumentacao):
+        """Testa as chamadas, as palavras e os tempos medidos"""
+        gerador = instrumentacao.instrumentar(GeradorEgera(semente=1))
+        gerador.gerar_palavra()
+        gerador.gerar_multiplas(20)
+        gerador.adicionar_acento('ca')
+        gerador.gerar_todas_palavras_possiveis()
+        resumo = instrumentacao.resumo()
+        assert resumo['tempos']['gerar_multiplas']['chamadas'] == 1
+        # As chamadas internas de gerar_multiplas também são medidas...
+        assert resumo['tempos']['gerar_palavra']['chamadas'] == 21
+        assert resumo['tempos']['adicionar_acento']['chamadas'] == 1
+        assert resumo['tempos']['gerar_todas_palavras_possiveis']['total_us'] > 0
+        # ...mas as palavras são contadas só uma vez
+        assert resumo['palavras_geradas'] == 21
+    
+    def test_duplicatas(self, instrumentacao):
+        """Testa a contagem de palavras repetidas"""
+        gerador = instrumentacao.instrumentar(GeradorEgera(
+            silabas_tonicas=['pró'], silabas_medias=['tu'], silabas_finais=['la', 'ta']
+        ))
+        gerador.gerar_multiplas(10)
+        assert instrumentacao.palavras_geradas == 10
+        assert instrumentacao.duplicatas == 8
+        gerador.gerar_multiplas(2, unicas=True)
+        assert instrumentacao.duplicatas == 10
+    
+    def test_sem_contar_duplicatas(self):
+        """Testa que as palavras podem ser contadas sem guardá-las"""
+        instrumentacao = Instrumentacao(contar_duplicatas=False)
+        gerador = instrumentacao.instrumentar(GeradorEgera(silabas_tonicas=['pró'], silabas_medias=['tu'],
+                                                           silabas_finais=['la']))
+        gerador.gerar_multiplas(5)
+        assert instrumentacao.palavras_geradas == 5
+        assert instrumentacao.duplicatas == 0
+    
+    def test_rejeicoes(self, instrumentacao):
+        """Testa a contagem das palavras rejeitadas na validação"""
+        gerador = instrumentacao.instrumentar(GeradorEgera())
+        assert gerador.validar_proparoxitona('prótula')
+        assert not gerador.validar_proparoxitona('casa')
+        gerador.validar_lote(['prótula', 'casa', 'mesa', ''])
+        assert instrumentacao.rejeicoes == 3
+    
+    def test_remover_e_derivar(self, instrumentacao):
+        """Testa que filhos herdam a instrumentação e que ela pode ser removida"""
+        gerador = instrumentacao.instrumentar(GeradorEgera(semente=2))
+        filho = gerador.derivar(1)[0]
+        filho.gerar_palavra()
+        assert instrumentacao.palavras_geradas == 1
+        instrumentacao.remover(gerador)
+        assert type(gerador) is GeradorEgera
+        gerador.gerar_palavra()
+        assert instrumentacao.palavras_geradas == 1
+        pickle.dumps(gerador)
+        with pytest.raises(ValueError):
+            Instrumentacao().instrumentar(filho)
+    
+    def test_nao_altera_resultados(self, instrumentacao):
+        """Testa que a instrumentação não muda as palavras geradas"""
+        esperadas = GeradorEgera(semente=3).gerar_multiplas(50)
+        gerador = instrumentacao.instrumentar(GeradorEgera(semente=3))
+        assert gerador.gerar_multiplas(50) == esperadas
+        assert isinstance(gerador, GeradorEgera)
+    
+    def test_pontos_livres_exportar_e_zerar(self, instrumentacao, tmp_path):
+        """Testa contadores e cronômetros livres, a exportação e o texto"""
+        instrumentacao.contar('requisicoes', 2)
+        with instrumentacao.cronometrar('bloco'):
+            pass
+        caminho = tmp_path / 'metricas.json'
+        instrumentacao.exportar(str(caminho))
+        dados = json.loads(caminho.read_text(encoding='utf-8'))
+        assert dados['contadores'] == {'requisicoes': 2}
+        assert dados['tempos']['bloco']['chamadas'] == 1
+        assert 'requisicoes' in instrumentacao.texto()
+        instrumentacao.zerar()
+        assert instrumentacao.resumo()['tempos'] == {}
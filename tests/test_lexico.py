@@ -0,0 +1,217 @@
+"""
+Testes para o formato binário do léxico
+"""
+import pytest
+
+from gerador import GeradorEgera
+from lexico import LexicoBinario, LexicoCompacto, anexar_lexico_binario, escrever_lexico_binario
+
+
+class TestLexicoBinario:
+    """Testes para a gravação e leitura do léxico binário"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    @pytest.fixture
+    def palavras(self, gerador):
+        """Fixture com todas as palavras únicas em ordem embaralhada"""
+        return list(gerador.iterar_palavras_unicas(embaralhar=True, semente=5))
+    
+    @pytest.fixture
+    def caminho(self, gerador, palavras, tmp_path):
+        """Fixture que grava o léxico binário e retorna o caminho"""
+        caminho = str(tmp_path / 'lexico.bin')
+        escrever_lexico_binario(caminho, gerador.inventario, palavras)
+        return caminho
+    
+    def test_tamanho_compacto(self, caminho, palavras):
+        """Testa que cada palavra ocupa um registro de 3 bytes"""
+        import os
+        assert os.path.getsize(caminho) < len(palavras) * 3 + 1024
+    
+    def test_leitura_preserva_ordem(self, caminho, palavras):
+        """Testa que a iteração devolve as palavras na ordem gravada"""
+        with LexicoBinario(caminho) as lexico:
+            assert len(lexico) == len(palavras)
+            assert list(lexico) == palavras
+    
+    def test_acesso_aleatorio_e_fatias(self, caminho, palavras):
+        """Testa indexação, índices negativos e fatias"""
+        with LexicoBinario(caminho) as lexico:
+            for posicao in (0, 1, 1000, len(palavras) - 1, -1, -500):
+                assert lexico[posicao] == palavras[posicao]
+            assert lexico[10:20] == palavras[10:20]
+            assert lexico[5:100:7] == palavras[5:100:7]
+            with pytest.raises(IndexError):
+                lexico[len(palavras)]
+    
+    def test_codigos_apontam_para_tabelas(self, caminho, gerador):
+        """Testa que os códigos gravados referenciam as tabelas do cabeçalho"""
+        with LexicoBinario(caminho) as lexico:
+            assert lexico.tabelas == gerador.inventario.tabelas
+            codigos = lexico.codigos(0)
+            assert ''.join(t[i] for t, i in zip(lexico.tabelas, codigos)) == lexico[0]
+    
+    def test_palavra_invalida_na_gravacao(self, gerador, tmp_path):
+        """Testa que gravar uma palavra que não pode ser gerada falha"""
+        with pytest.raises(ValueError):
+            escrever_lexico_binario(str(tmp_path / 'x.bin'), gerador.inventario, ['casa'])
+    
+    def test_arquivo_invalido(self, tmp_path):
+        """Testa que arquivos em outro formato são rejeitados"""
+        caminho = tmp_path / 'lixo.bin'
+        caminho.write_bytes(b'nao e um lexico binario' * 4)
+        with pytest.raises(ValueError):
+            LexicoBinario(str(caminho))
+    
+    def test_arquivo_vazio_ou_truncado(self, caminho, tmp_path):
+        """Testa que arquivos vazios ou cortados geram ValueError de formato"""
+        vazio = tmp_path / 'vazio.bin'
+        vazio.write_bytes(b'')
+        cortado = tmp_path / 'cortado.bin'
+        with open(caminho, 'rb') as f:
+            cortado.write_bytes(f.read(1000))
+        for arquivo in (vazio, cortado):
+            with pytest.raises(ValueError, match='curto|truncado'):
+                LexicoBinario(str(arquivo))
+    
+    def test_fechar_com_iteracao_em_andamento(self, caminho, palavras):
+        """Testa que um iterador suspenso não impede fechar o léxico"""
+        with LexicoBinario(caminho) as lexico:
+            iterador = iter(lexico)
+            assert next(iterador) == palavras[0]
+        assert lexico._mapa.closed
+        
+        # Dentro do `with`, a exceção original não é trocada por outra
+        with pytest.raises(KeyError):
+            with LexicoBinario(caminho) as lexico:
+                iterador = iter(lexico)
+                next(iterador)
+                raise KeyError('original')
+    
+    def test_tabelas_largas(self, tmp_path):
+        """Testa índices de 4 bytes e sílabas com mais de 255 bytes"""
+        from gerador import compilar_inventario
+        
+        longa = 'lá' * 200
+        medias = tuple(f'm{numero:05d}' for numero in range(70_000))
+        inventario = compilar_inventario((longa, 'bá'), medias, ('la',))
+        palavras = [longa + 'm69999la', 'bám00000la', 'bám65536la']
+        caminho = str(tmp_path / 'largo.bin')
+        escrever_lexico_binario(caminho, inventario, palavras)
+        with LexicoBinario(caminho) as lexico:
+            assert list(lexico) == palavras
+            assert lexico.tabelas == inventario.tabelas
+            assert lexico.codigos(0) == (0, 69_999, 0)
+    
+    def test_silaba_longa_demais(self):
+        """Testa que sílabas além do limite do formato geram ValueError"""
+        from lexico import _codificar_tabelas
+        
+        with pytest.raises(ValueError, match='longa demais'):
+            _codificar_tabelas((('bá',), ('x' * 70_000,), ('la',)))
+    
+    def test_anexar_com_silabas_novas(self, tmp_path):
+        """Testa que palavras anexadas com sílabas novas não alteram os registros anteriores"""
+        antes = GeradorEgera(['bá', 'bál', 'cá'], ['ha', 'tu'], ['la'])
+        depois = GeradorEgera(['bá', 'bál', 'cá', 'fí'], ['ha', 'tu', 'lha'], ['la', 'ta'])
+        anteriores = list(antes.inventario)
+        novas = sorted(set(depois.inventario) - set(anteriores))
+        caminho = str(tmp_path / 'lexico.bin')
+        escrever_lexico_binario(caminho, antes.inventario, anteriores)
+        
+        assert anexar_lexico_binario(caminho, depois.inventario, novas) == len(anteriores) + len(novas)
+        with LexicoBinario(caminho) as lexico:
+            assert list(lexico) == anteriores + novas
+            assert lexico.tabelas[1] == ('ha', 'tu', 'lha')
+            # 'bálhala' foi gravada como 'bál' + 'ha', que deixou de ser a
+            # decomposição canônica com 'lha', e continua encontrada
+            assert all(palavra in lexico for palavra in anteriores + novas)
+            assert 'fítuca' not in lexico
+    
+    def test_anexar_exige_mesmo_numero_de_silabas(self, caminho):
+        """Testa que anexar com outro número de posições gera ValueError"""
+        with pytest.raises(ValueError):
+            anexar_lexico_binario(caminho, GeradorEgera(num_silabas=4).inventario, [])
+
+
+class TestLexicoCompacto:
+    """Testes para o léxico compacto em memória"""
+    
+    @pytest.fixture
+    def gerador(self):
+        """Fixture que retorna uma instância de GeradorEgera"""
+        return GeradorEgera()
+    
+    @pytest.fixture
+    def compacto(self, gerador):
+        """Fixture com o léxico compacto de todas as palavras"""
+        return gerador.gerar_todas_palavras_possiveis(compacto=True)
+    
+    def test_mesmas_palavras_da_lista(self, gerador, compacto):
+        """Testa que o léxico compacto tem as mesmas palavras da lista"""
+        assert isinstance(compacto, LexicoCompacto)
+        assert list(compacto) == gerador.gerar_todas_palavras_possiveis()
+    
+    def test_ocupa_poucos_bytes(self, compacto):
+        """Testa que cada palavra ocupa um byte por sílaba"""
+        assert compacto.tamanho_em_bytes() == len(compacto) * 3
+    
+    def test_tabelas_com_mais_de_65536_silabas(self):
+        """Testa que os códigos usam quatro bytes quando dois não bastam"""
+        from gerador import compilar_inventario
+        
+        medias = tuple(f'm{numero:05d}' for numero in range(70_000))
+        inventario = compilar_inventario(('bá',), medias, ('la',))
+        palavras = ['bám00000la', 'bám65535la', 'bám69999la']
+        compacto = LexicoCompacto.de_palavras(inventario, palavras)
+        assert list(compacto) == palavras
+        assert compacto.codigos(2) == (0, 69_999, 0)
+        assert compacto.tamanho_em_bytes() == len(palavras) * 3 * 4
+    
+    def test_indexacao_e_fatias(self, gerador, compacto):
+        """Testa indexação, índices negativos e fatias"""
+        palavras = gerador.gerar_todas_palavras_possiveis()
+        assert compacto[0] == palavras[0]
+        assert compacto[-1] == palavras[-1]
+        assert compacto[100:110] == palavras[100:110]
+        assert compacto[::1000] == palavras[::1000]
+        with pytest.raises(IndexError):
+            compacto[len(palavras)]
+    
+    def test_pertinencia(self, compacto):
+        """Testa __contains__ com palavras presentes e ausentes"""
+        assert compacto[500] in compacto
+        assert 'casa' not in compacto
+        assert 42 not in compacto
+    
+    def test_base_exige_codigos(self):
+        """Testa que um léxico sem `codigos` e `_iterar_codigos` não pode ser criado"""
+        from lexico import _LexicoCodificado
+
+        class Incompleto(_LexicoCodificado):
+            def __len__(self):
+                return 0
+
+        with pytest.raises(TypeError):
+            Incompleto()
+    
+    def test_pertinencia_em_subconjunto(self, gerador):
+        """Testa que palavras formáveis fora do léxico não são encontradas"""
+        palavras = gerador.gerar_multiplas(50, unicas=True)
+        compacto = LexicoCompacto.de_palavras(gerador.inventario, palavras[:25])
+        assert list(compacto) == palavras[:25]
+        assert all(palavra in compacto for palavra in palavras[:25])
+        assert not any(palavra in compacto for palavra in palavras[25:])
+    
+    def test_lexico_binario_tambem_suporta_pertinencia(self, gerador, tmp_path):
+        """Testa __contains__ no léxico mapeado em memória"""
+        palavras = gerador.gerar_multiplas(30, unicas=True)
+        caminho = str(tmp_path / 'parcial.bin')
+        escrever_lexico_binario(caminho, gerador.inventario, palavras[:10])
+        with LexicoBinario(caminho) as lexico:
+            assert palavras[3] in lexico
+            assert palavras[20] not in lexico
@@ -0,0 +1,214 @@
+"""
+Testes unitários para o servidor HTTP, com um cliente local
+"""
+import asyncio
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pytest
+
+import servidor as modulo
+from gerador import GeradorEgera
+from servidor import ServidorEgera
+
+
+@pytest.fixture(scope='module')
+def endereco():
+    """Fixture que executa o servidor em outra thread e retorna (host, porta)"""
+    laco = asyncio.new_event_loop()
+    instancia = ServidorEgera(GeradorEgera(semente=7), capacidade_reserva=256)
+    pronto = threading.Event()
+
+    def executar():
+        asyncio.set_event_loop(laco)
+        laco.run_until_complete(instancia.iniciar('127.0.0.1', 0))
+        pronto.set()
+        laco.run_forever()
+
+    thread = threading.Thread(target=executar, daemon=True)
+    thread.start()
+    pronto.wait(10)
+    yield '127.0.0.1', instancia.porta
+    asyncio.run_coroutine_threadsafe(instancia.encerrar(), laco).result(10)
+    laco.call_soon_threadsafe(laco.stop)
+    thread.join(10)
+    laco.close()
+
+
+def _pedir(endereco, caminho, metodo='GET', corpo=None, conexao=None):
+    conexao = conexao or http.client.HTTPConnection(*endereco, timeout=10)
+    conexao.request(metodo, caminho, body=corpo)
+    resposta = conexao.getresponse()
+    return resposta, json.loads(resposta.read().decode('utf-8'))
+
+
+class TestServidorEgera:
+    """Testes para as rotas de ServidorEgera"""
+
+    def test_palavras(self, endereco):
+        """Testa o sorteio de palavras com repetição"""
+        resposta, dados = _pedir(endereco, '/palavras?quantidade=50')
+        assert resposta.status == 200
+        assert resposta.getheader('Content-Length') is not None
+        gerador = GeradorEgera()
+        assert len(dados['palavras']) == 50
+        assert all(gerador.contem(palavra) for palavra in dados['palavras'])
+        assert len(_pedir(endereco, '/palavras')[1]['palavras']) == 1
+
+    def test_unicas_sem_repeticao(self, endereco):
+        """Testa que lotes pequenos consecutivos não repetem palavras"""
+        lotes = [_pedir(endereco, '/unicas?quantidade=1000')[1]['palavras'] for _ in range(5)]
+        palavras = [palavra for lote in lotes for palavra in lote]
+        assert len(palavras) == len(set(palavras)) == 5000
+
+    def test_unicas_com_semente_e_reproduzivel(self, endereco):
+        """Testa que a mesma semente produz o mesmo lote"""
+        primeiro = _pedir(endereco, '/unicas?quantidade=20&semente=3')[1]
+        segundo = _pedir(endereco, '/unicas?quantidade=20&semente=3')[1]
+        assert primeiro == segundo
+        assert len(set(primeiro['palavras'])) == 20
+
+    def test_lote_grande_em_fluxo(self, endereco):
+        """Testa que lotes grandes são enviados em blocos e sem repetições"""
+        gerador = GeradorEgera()
+        total = gerador.calcular_palavras_unicas()
+        resposta, dados = _pedir(endereco, f'/unicas?quantidade={total}')
+        assert resposta.status == 200
+        assert resposta.getheader('Transfer-Encoding') == 'chunked'
+        assert sorted(dados['palavras']) == sorted(gerador.gerar_todas_palavras_possiveis())
+        resposta, dados = _pedir(endereco, '/palavras?quantidade=20000')
+        assert resposta.getheader('Transfer-Encoding') == 'chunked'
+        assert len(dados['palavras']) == 20000
+
+    def test_quantidade_invalida(self, endereco):
+        """Testa os erros de parâmetros"""
+        gerador = GeradorEgera()
+        excesso = gerador.calcular_palavras_unicas() + 1
+        for caminho in ('/palavras?quantidade=abc', '/palavras?quantidade=-1',
+                        f'/unicas?quantidade={excesso}', '/validar', '/consulta'):
+            resposta, dados = _pedir(endereco, caminho)
+            assert resposta.status == 400
+            assert 'erro' in dados
+
+    def test_validar(self, endereco):
+        """Testa a validação de uma palavra e de um lote"""
+        _, dados = _pedir(endereco, '/validar?palavra=' + quote('prótula'))
+        assert dados == {'palavra': 'prótula', 'valida': True, 'gerada': True}
+        _, dados = _pedir(endereco, '/validar?palavra=casa')
+        assert dados['valida'] is False and dados['gerada'] is False
+        corpo = 'prótula\ncasa\n\nfíbrala\n'.encode('utf-8')
+        resposta, dados = _pedir(endereco, '/validar', 'POST', corpo)
+        assert resposta.status == 200
+        assert dados == {'total': 3, 'validas': 2, 'invalidas': [{'linha': 2, 'palavra': 'casa'}]}
+
+    def test_consulta(self, endereco):
+        """Testa a consulta por palavra e por índice"""
+        gerador = GeradorEgera()
+        _, dados = _pedir(endereco, '/consulta?palavra=' + quote('prótula'))
+        assert dados['existe'] is True
+        assert dados['decomposicoes'] == [['pró', 'tu', 'la']]
+        _, por_indice = _pedir(endereco, f"/consulta?indice={dados['indice']}")
+        assert por_indice == {'indice': dados['indice'], 'palavra': 'prótula'}
+        _, dados = _pedir(endereco, '/consulta?palavra=casa')
+        assert dados == {'palavra': 'casa', 'existe': False, 'indice': None, 'decomposicoes': []}
+        resposta, _ = _pedir(endereco, f'/consulta?indice={gerador.calcular_palavras_unicas()}')
+        assert resposta.status == 404
+
+    def test_rota_e_metodo_desconhecidos(self, endereco):
+        """Testa as respostas 404 e 405"""
+        assert _pedir(endereco, '/nada')[0].status == 404
+        resposta, _ = _pedir(endereco, '/palavras', 'POST', b'')
+        assert resposta.status == 405
+        assert resposta.getheader('Allow') == 'GET'
+
+    def test_content_length_negativo(self, endereco):
+        """Testa que um Content-Length negativo é rejeitado com 400"""
+        import socket
+        with socket.create_connection(endereco, timeout=10) as conexao:
+            conexao.sendall(b'POST /validar HTTP/1.1\r\nContent-Length: -5\r\n\r\n')
+            resposta = b''
+            while True:
+                dados = conexao.recv(65536)
+                if not dados:
+                    break
+                resposta += dados
+        cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+        assert cabecalho.split()[1] == b'400'
+        assert 'erro' in json.loads(corpo)
+
+    def test_fluxo_nao_bloqueia_outros_clientes(self, endereco):
+        """Testa que outra requisição é atendida enquanto um lote grande é enviado"""
+        import time
+        termino = {}
+
+        def lote_grande():
+            conexao = http.client.HTTPConnection(*endereco, timeout=60)
+            conexao.request('GET', '/palavras?quantidade=1000000')
+            resposta = conexao.getresponse()
+            while resposta.read(1 << 16):
+                pass
+            termino['fluxo'] = time.perf_counter()
+            conexao.close()
+
+        thread = threading.Thread(target=lote_grande)
+        thread.start()
+        time.sleep(0.2)
+        resposta, _ = _pedir(endereco, '/estado')
+        termino['estado'] = time.perf_counter()
+        thread.join(60)
+        assert resposta.status == 200
+        assert termino['estado'] < termino['fluxo']
+
+    def test_conexao_persistente(self, endereco):
+        """Testa várias requisições, inclusive em fluxo, na mesma conexão"""
+        conexao = http.client.HTTPConnection(*endereco, timeout=10)
+        for caminho in ('/palavras?quantidade=3', '/unicas?quantidade=15000', '/estado', '/nada'):
+            _pedir(endereco, caminho, conexao=conexao)
+        _, dados = _pedir(endereco, '/estado', conexao=conexao)
+        assert dados['palavras_unicas'] == GeradorEgera().calcular_palavras_unicas()
+        assert set(dados['reservas']) == {'palavras', 'unicas'}
+        conexao.close()
+
+    def test_clientes_concorrentes(self, endereco):
+        """Testa muitos clientes ao mesmo tempo"""
+        def cliente(_):
+            conexao = http.client.HTTPConnection(*endereco, timeout=10)
+            lotes = [_pedir(endereco, '/palavras?quantidade=100', conexao=conexao)[1] for _ in range(5)]
+            conexao.close()
+            return sum(len(lote['palavras']) for lote in lotes)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            assert list(executor.map(cliente, range(32))) == [500] * 32
+
+    def test_metricas(self):
+        """Testa a rota /metricas com e sem instrumentação"""
+        from instrumentacao import Instrumentacao
+
+        async def pedir(instancia, caminho):
+            await instancia.iniciar('127.0.0.1', 0)
+            try:
+                leitor, escritor = await asyncio.open_connection('127.0.0.1', instancia.porta)
+                escritor.write(f'GET {caminho} HTTP/1.1\r\nConnection: close\r\n\r\n'.encode('ascii'))
+                resposta = await leitor.read()
+                escritor.close()
+            finally:
+                await instancia.encerrar()
+            cabecalho, _, corpo = resposta.partition(b'\r\n\r\n')
+            return int(cabecalho.split()[1]), json.loads(corpo)
+
+        status, _ = asyncio.run(pedir(ServidorEgera(), '/metricas'))
+        assert status == 404
+        instrumentacao = Instrumentacao()
+        status, dados = asyncio.run(pedir(ServidorEgera(instrumentacao=instrumentacao), '/metricas'))
+        assert status == 200
+        assert dados['palavras_geradas'] > 0
+        assert 'gerar_multiplas' in dados['tempos']
+
+    def test_main_ajuda(self, capsys):
+        """Testa que a linha de comando é montada corretamente"""
+        with pytest.raises(SystemExit) as saida:
+            modulo.main(['--help'])
+        assert saida.value.code == 0
+        assert '--port' in capsys.readouterr().out
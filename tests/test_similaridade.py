@@ -0,0 +1,106 @@
+"""
+Testes unitários para a busca por similaridade
+"""
+import random
+
+import pytest
+
+from gerador import GeradorEgera
+from similaridade import CUSTO_ACENTO, IndiceSimilaridade, distancia, remover_acentos
+
+
+@pytest.fixture(scope='module')
+def indice():
+    """Fixture que indexa o léxico completo do gerador padrão"""
+    return IndiceSimilaridade.de_gerador()
+
+
+class TestDistancia:
+    """Testes para a distância de edição com acentos"""
+    
+    def test_remover_acentos(self):
+        """Testa a normalização sem acentos e em minúsculas"""
+        assert remover_acentos('Égera') == 'egera'
+        assert remover_acentos('fóçana') == 'focana'
+    
+    @pytest.mark.parametrize('palavra, outra, esperada', [
+        ('égera', 'égera', 0),
+        ('égera', 'egera', CUSTO_ACENTO),
+        ('égera', 'ágera', 1),
+        ('égera', 'égero', 1),
+        ('égera', 'égra', 1),
+        ('pécora', 'pécoras', 1),
+        ('', 'cípora', 6),
+        ('ÉGERA', 'égera', 0),
+    ])
+    def test_distancia(self, palavra, outra, esperada):
+        """Testa os custos de troca, inserção e remoção"""
+        assert distancia(palavra, outra) == esperada
+        assert distancia(outra, palavra) == esperada
+
+
+class TestIndiceSimilaridade:
+    """Testes para o índice de palavras mais próximas"""
+    
+    @pytest.mark.parametrize('alvo', ['égera', 'pécora', 'xyz'])
+    def test_igual_a_busca_exaustiva(self, indice, alvo):
+        """Testa que o resultado coincide com comparar o alvo com todo o léxico"""
+        palavras = list(indice.palavras)
+        esperados = sorted((distancia(alvo, palavra), i) for i, palavra in enumerate(palavras))[:10]
+        obtidos = indice.mais_proximas(alvo, 10)
+        assert [(v.palavra, v.distancia) for v in obtidos] == [
+            (palavras[i], d) for d, i in esperados
+        ]
+    
+    def test_palavra_do_lexico_e_a_mais_proxima(self, indice):
+        """Testa que uma palavra do léxico é a mais próxima de si mesma"""
+        assert indice.mais_proximas('strámanha', 1)[0] == ('strámanha', 0)
+    
+    def test_acentos_aproximam(self, indice):
+        """Testa que a diferença só de acento custa menos que uma troca de letra"""
+        vizinho = indice.mais_proximas('pratula', 1)[0]
+        assert vizinho == ('prátula', CUSTO_ACENTO)
+    
+    def test_lexico_aleatorio(self):
+        """Testa a busca em léxicos pequenos, com repetições e prefixos comuns"""
+        aleatorio = random.Random(5)
+        for _ in range(30):
+            palavras = [
+                ''.join(aleatorio.choice('aábé') for _ in range(aleatorio.randint(0, 5)))
+                for _ in range(aleatorio.randint(1, 40))
+            ]
+            indice = IndiceSimilaridade(palavras)
+            alvo = ''.join(aleatorio.choice('abée') for _ in range(aleatorio.randint(0, 5)))
+            k = aleatorio.randint(1, 8)
+            esperados = sorted((distancia(alvo, palavra), i) for i, palavra in enumerate(palavras))[:k]
+            assert [(v.palavra, v.distancia) for v in indice.mais_proximas(alvo, k)] == [
+                (palavras[i], d) for d, i in esperados
+            ]
+    
+    def test_distancia_maxima(self, indice):
+        """Testa que o limite de distância corta os resultados e encerra alvos distantes"""
+        import time
+        
+        palavras = list(indice.palavras)
+        distancias = [(distancia('égera', palavra), i) for i, palavra in enumerate(palavras)]
+        esperados = sorted(par for par in distancias if par[0] <= 2)[:50]
+        obtidos = indice.mais_proximas('égera', 50, distancia_maxima=2)
+        assert [(v.palavra, v.distancia) for v in obtidos] == [(palavras[i], d) for d, i in esperados]
+        
+        inicio = time.perf_counter()
+        assert indice.mais_proximas('qqqqqqqqqqqq', 10, distancia_maxima=3) == []
+        # Sem o limite, esta consulta varre boa parte do léxico (centenas de ms)
+        assert time.perf_counter() - inicio < 0.05
+    
+    def test_k_maior_que_o_lexico(self):
+        """Testa que k maior que o léxico retorna todas as palavras"""
+        indice = IndiceSimilaridade(['pécora', 'égera'])
+        assert [v.palavra for v in indice.mais_proximas('égera', 5)] == ['égera', 'pécora']
+        assert indice.mais_proximas('égera', 0) == []
+    
+    def test_indice_de_gerador_personalizado(self):
+        """Testa a indexação de um gerador com outras sílabas"""
+        gerador = GeradorEgera(silabas_tonicas=['pé'], silabas_medias=['co'], silabas_finais=['ra', 'la'])
+        indice = IndiceSimilaridade.de_gerador(gerador)
+        assert len(indice) == 2
+        assert indice.mais_proximas('pécora', 1)[0] == ('pécora', 0)
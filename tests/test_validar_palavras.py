@@ -0,0 +1,66 @@
+"""
+Testes para o script de validação em lote
+"""
+import io
+import sys
+
+from validar_palavras import main
+
+
+class TestValidarPalavras:
+    """Testes para a linha de comando de validação"""
+    
+    def test_arquivo_valido(self, tmp_path, capsys):
+        """Testa que um arquivo só com palavras válidas retorna 0"""
+        arquivo = tmp_path / 'validas.txt'
+        arquivo.write_text('prótula\nfíbrala\n', encoding='utf-8')
+        
+        assert main([str(arquivo)]) == 0
+        assert '2 palavras, 2 válidas, 0 inválidas' in capsys.readouterr().out
+    
+    def test_arquivo_com_invalidas(self, tmp_path, capsys):
+        """Testa que linhas inválidas são listadas com o número da linha"""
+        arquivo = tmp_path / 'misturadas.txt'
+        arquivo.write_text('prótula\ncasa\nfíbrala\ncá\n', encoding='utf-8')
+        
+        assert main([str(arquivo), '--max-invalidas', '1']) == 1
+        saida = capsys.readouterr().out
+        assert f'{arquivo}:2: casa' in saida
+        assert f'{arquivo}:4:' not in saida
+        assert '4 palavras, 2 válidas, 2 inválidas' in saida
+    
+    def test_arquivo_ausente_ou_ilegivel(self, tmp_path, capsys):
+        """Testa que arquivos que não podem ser lidos geram uma linha no stderr e código 2"""
+        valido = tmp_path / 'validas.txt'
+        valido.write_text('prótula\n', encoding='utf-8')
+        binario = tmp_path / 'latin1.txt'
+        binario.write_bytes('prótula\n'.encode('latin-1'))
+        ausente = tmp_path / 'nao_existe.txt'
+        
+        assert main([str(ausente), str(binario), str(tmp_path), str(valido)]) == 2
+        capturado = capsys.readouterr()
+        erros = capturado.err.splitlines()
+        assert len(erros) == 3
+        assert erros[0].endswith(f'{ausente}: No such file or directory')
+        assert f'{binario}:' in erros[1] and f'{tmp_path}:' in erros[2]
+        # Os arquivos legíveis continuam sendo validados
+        assert f'{valido}: 1 palavras, 1 válidas, 0 inválidas' in capturado.out
+    
+    def test_entrada_padrao(self, monkeypatch, capsys):
+        """Testa a leitura da entrada padrão em UTF-8, sem fechá-la"""
+        entrada = io.TextIOWrapper(io.BytesIO('prótula\ncasa\n'.encode('utf-8')), encoding='latin-1')
+        monkeypatch.setattr(sys, 'stdin', entrada)
+        
+        assert main(['-']) == 1
+        saida = capsys.readouterr().out
+        assert '-:2: casa' in saida
+        assert '2 palavras, 1 válidas, 1 inválidas' in saida
+        assert not entrada.closed
+    
+    def test_quieto_com_muitas_invalidas(self, tmp_path, capsys):
+        """Testa que o modo quieto informa as contagens sem listar as linhas"""
+        arquivo = tmp_path / 'invalidas.txt'
+        arquivo.write_text('casa\n' * 1000 + 'prótula\n', encoding='utf-8')
+        
+        assert main([str(arquivo), '--quieto']) == 1
+        assert capsys.readouterr().out == f'{arquivo}: 1,001 palavras, 1 válidas, 1,000 inválidas\n'
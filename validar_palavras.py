@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para validar listas de palavras em lote.
+
+Lê um ou mais arquivos com uma palavra por linha (ou a entrada padrão,
+com '-') em uma única passagem e informa quantas palavras são
+proparoxítonas válidas, listando as linhas inválidas.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from gerador import GeradorEgera
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Função principal do script.
+
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv[1:])
+
+    Returns:
+        0 se todas as palavras forem válidas, 1 se alguma for inválida e 2
+        se algum arquivo não puder ser lido
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('arquivos', nargs='+', help="arquivos a validar ('-' para a entrada padrão)")
+    parser.add_argument('--max-invalidas', type=int, default=None,
+                        help='número máximo de linhas inválidas exibidas por arquivo')
+    parser.add_argument('--quieto', action='store_true',
+                        help='exibe apenas o resumo, sem as linhas inválidas')
+    args = parser.parse_args(argv)
+    if args.max_invalidas is not None and args.max_invalidas < 0:
+        parser.error("--max-invalidas deve ser um número não negativo")
+
+    gerador = GeradorEgera()
+    saida = sys.stdout
+    todas_validas = True
+    falhou = False
+
+    # Só as linhas que serão exibidas são guardadas
+    max_invalidas = 0 if args.quieto else args.max_invalidas
+
+    for caminho in args.arquivos:
+        if caminho == '-':
+            # Reconfigura a própria entrada padrão em vez de envolvê-la: um
+            # TextIOWrapper sobre sys.stdin.buffer a fecharia ao ser coletado
+            entrada = sys.stdin
+            if hasattr(entrada, 'reconfigure'):
+                entrada.reconfigure(encoding='utf-8')
+            resultado = gerador.validar_lote(entrada, max_invalidas)
+        else:
+            try:
+                resultado = gerador.validar_arquivo(caminho, max_invalidas=max_invalidas)
+            except (OSError, UnicodeDecodeError) as erro:
+                # Os demais arquivos ainda são validados
+                motivo = erro.strerror if isinstance(erro, OSError) and erro.strerror else erro
+                print(f"{parser.prog}: {caminho}: {motivo}", file=sys.stderr)
+                falhou = True
+                continue
+
+        num_invalidas = resultado.total - resultado.validas
+        todas_validas = todas_validas and not num_invalidas
+        saida.write(''.join(f"{caminho}:{numero}: {palavra}\n" for numero, palavra in resultado.invalidas))
+        saida.write(
+            f"{caminho}: {resultado.total:,} palavras, {resultado.validas:,} válidas, "
+            f"{num_invalidas:,} inválidas\n"
+        )
+
+    if falhou:
+        return 2
+    return 0 if todas_validas else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())